@@ -1,44 +1,118 @@
+import argparse
+import bisect
+import fcntl
+import gzip
+import hashlib
 import json
 import os
 import re
+import socket
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
 import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
 
 import requests
-from prometheus_client import Gauge, start_http_server
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Gauge, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily, Metric
+from prometheus_client.parser import text_string_to_metric_families
+from prometheus_client.utils import floatToGoString
 
 try:
     from lihzahrd import World
 except Exception:
     World = None
 
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+try:
+    import yaml
+except Exception:
+    yaml = None
+
 API_BASE = os.getenv("TERRARIA_API_URL", "").rstrip("/")
 API_TOKEN = os.getenv("TERRARIA_API_TOKEN", "")
 SCRAPE_INTERVAL = int(os.getenv("SCRAPE_INTERVAL", "15"))
+WORLD_PARSE_INTERVAL = int(os.getenv("WORLD_PARSE_INTERVAL", "300"))
 EXPORTER_PORT = int(os.getenv("EXPORTER_PORT", "9150"))
 WORLD_FILE_PATH = os.getenv("WORLD_FILE_PATH", "")
 SERVER_CONFIG_PATH = os.getenv("SERVER_CONFIG_PATH", "/config/serverconfig.txt")
 TSHOCK_CONFIG_PATH = os.getenv("TSHOCK_CONFIG_PATH", "/config/config.json")
 CHEST_ITEM_SERIES_LIMIT = int(os.getenv("CHEST_ITEM_SERIES_LIMIT", "500"))
+SNAPSHOT_TOP_ITEMS = int(os.getenv("SNAPSHOT_TOP_ITEMS", "25"))
+PLAYER_DETAIL_CONCURRENCY = max(1, int(os.getenv("PLAYER_DETAIL_CONCURRENCY", "2")))
+PLAYER_DETAIL_MAX_PER_CYCLE = max(0, int(os.getenv("PLAYER_DETAIL_MAX_PER_CYCLE", "4")))
+PLAYER_DETAIL_TTL = float(os.getenv("PLAYER_DETAIL_TTL", "60"))
+ENABLE_TILE_ANALYTICS = os.getenv("ENABLE_TILE_ANALYTICS", "true").strip().lower() in {"1", "true", "yes", "on"}
+TILE_TOP_BLOCKS = max(0, int(os.getenv("TILE_TOP_BLOCKS", "20")))
+TILE_STORE_DIR = os.getenv("TILE_STORE_DIR", "").strip()
+TILE_REGION_MAX_TILES = max(1, int(os.getenv("TILE_REGION_MAX_TILES", str(1024 * 1024))))
+ENABLE_PLAYER_HEATMAP = os.getenv("ENABLE_PLAYER_HEATMAP", "true").strip().lower() in {"1", "true", "yes", "on"}
+HEATMAP_CELL_TILES = max(1, int(os.getenv("HEATMAP_CELL_TILES", "16")))
+try:
+    HEATMAP_WORLD_SIZE = tuple(int(part) for part in os.getenv("HEATMAP_WORLD_SIZE", "8400x2400").lower().split("x", 1))
+    if len(HEATMAP_WORLD_SIZE) != 2 or min(HEATMAP_WORLD_SIZE) <= 0:
+        raise ValueError(HEATMAP_WORLD_SIZE)
+except ValueError:
+    print(f"[exporter] HEATMAP_WORLD_SIZE={os.getenv('HEATMAP_WORLD_SIZE')!r} is not WIDTHxHEIGHT; using 8400x2400", file=sys.stderr)
+    HEATMAP_WORLD_SIZE = (8400, 2400)
+HEATMAP_HALF_LIFE_HOURS = float(os.getenv("HEATMAP_HALF_LIFE_HOURS", "72"))
+HEATMAP_DIR = os.getenv("HEATMAP_DIR", "").strip()
+HEATMAP_PERSIST_INTERVAL = float(os.getenv("HEATMAP_PERSIST_INTERVAL", "300"))
+CHEST_SEARCH_LIMIT = max(1, int(os.getenv("CHEST_SEARCH_LIMIT", "20")))
+HISTORY_DIR = os.getenv("HISTORY_DIR", "").strip()
+HISTORY_RAW_DAYS = float(os.getenv("HISTORY_RAW_DAYS", "7"))
+HISTORY_HOURLY_DAYS = float(os.getenv("HISTORY_HOURLY_DAYS", "90"))
 
 K8S_NAMESPACE = os.getenv("K8S_NAMESPACE", "terraria")
 K8S_TERRARIA_LABEL_SELECTOR = os.getenv("K8S_TERRARIA_LABEL_SELECTOR", "app=terraria-server")
 K8S_TERRARIA_CONTAINER = os.getenv("K8S_TERRARIA_CONTAINER", "terraria")
 K8S_LOG_TAIL_LINES = int(os.getenv("K8S_LOG_TAIL_LINES", "2000"))
 ENABLE_LOG_PLAYER_TRACKER = os.getenv("ENABLE_LOG_PLAYER_TRACKER", "true").strip().lower() in {"1", "true", "yes", "on"}
+LOG_PAIRING_TTL = float(os.getenv("LOG_PAIRING_TTL", "300"))
+LOG_PAIRING_MAX_PENDING = max(1, int(os.getenv("LOG_PAIRING_MAX_PENDING", "256")))
+LOG_JOIN_PENDING_TTL = float(os.getenv("LOG_JOIN_PENDING_TTL", "60"))
+LOG_RULES_PATH = os.getenv("LOG_RULES_PATH", "").strip()
+LOG_RULE_SERIES_LIMIT = max(1, int(os.getenv("LOG_RULE_SERIES_LIMIT", "200")))
 try:
     DEFAULT_MAX_PLAYERS = float(os.getenv("DEFAULT_MAX_PLAYERS", "8"))
 except ValueError:
     DEFAULT_MAX_PLAYERS = 8.0
 
+TERRARIA_TARGETS = os.getenv("TERRARIA_TARGETS", "").strip()
+SHARD_MEMBERSHIP_DIR = os.getenv("SHARD_MEMBERSHIP_DIR", "").strip()
+SHARD_REPLICA_ID = os.getenv("SHARD_REPLICA_ID", "").strip() or socket.gethostname()
+SHARD_LEASE_SECONDS = float(os.getenv("SHARD_LEASE_SECONDS", "45"))
+SHARD_VNODES = max(1, int(os.getenv("SHARD_VNODES", "64")))
+
+# Cheap runtime gauges live in the default registry; high-cardinality world series get their own
+# registry so they can be refreshed and scraped on a much slower cadence.
+RUNTIME_REGISTRY = REGISTRY
+WORLD_REGISTRY = CollectorRegistry(auto_describe=True)
+
 source_up = Gauge("terraria_exporter_source_up", "1 se API de gameplay respondeu")
-world_parser_up = Gauge("terraria_world_parser_up", "1 se parser do arquivo .wld respondeu")
+world_parser_up = Gauge("terraria_world_parser_up", "1 se parser do arquivo .wld respondeu", registry=WORLD_REGISTRY)
 world_runtime_up = Gauge("terraria_world_runtime_up", "1 se runtime do mundo veio de API/log em tempo real")
 log_tracker_up = Gauge("terraria_log_tracker_up", "1 se fallback de logs Kubernetes funcionou")
 world_parser_unsupported = Gauge(
     "terraria_world_parser_unsupported_version",
     "1 se versao .wld atual nao e suportada pelo parser instalado",
+    registry=WORLD_REGISTRY,
 )
 log_connection_attempts_window = Gauge(
     "terraria_log_connection_attempts_window",
@@ -64,13 +138,36 @@ world_time_runtime = Gauge("terraria_world_time_runtime", "Tempo do mundo (runti
 world_snapshot_age_seconds = Gauge("terraria_world_snapshot_age_seconds", "Idade do arquivo .wld em segundos")
 world_snapshot_mtime = Gauge("terraria_world_snapshot_mtime_seconds", "mtime do arquivo .wld (epoch seconds)")
 
-world_chests = Gauge("terraria_world_chests_total", "Quantidade de baus no mundo (snapshot)")
-world_houses = Gauge("terraria_world_houses_total", "Quantidade de casas conhecidas no mundo (snapshot)")
-world_housed_npcs = Gauge("terraria_world_housed_npcs_total", "Quantidade de NPCs com casa (snapshot)")
-world_housed_npc = Gauge("terraria_world_housed_npc", "NPC alojado (snapshot)", ["npc"])
+world_chests = Gauge("terraria_world_chests_total", "Quantidade de baus no mundo (snapshot)", registry=WORLD_REGISTRY)
+world_houses = Gauge("terraria_world_houses_total", "Quantidade de casas conhecidas no mundo (snapshot)", registry=WORLD_REGISTRY)
+world_housed_npcs = Gauge("terraria_world_housed_npcs_total", "Quantidade de NPCs com casa (snapshot)", registry=WORLD_REGISTRY)
+world_housed_npc = Gauge("terraria_world_housed_npc", "NPC alojado (snapshot)", ["npc"], registry=WORLD_REGISTRY)
+
+chest_item_count = Gauge("terraria_chest_item_count", "Quantidade de item por bau", ["chest", "item"], registry=WORLD_REGISTRY)
+chest_item_count_by_item = Gauge(
+    "terraria_chest_item_count_by_item",
+    "Quantidade total de item em todos os baus",
+    ["item"],
+    registry=WORLD_REGISTRY,
+)
 
-chest_item_count = Gauge("terraria_chest_item_count", "Quantidade de item por bau", ["chest", "item"])
-chest_item_count_by_item = Gauge("terraria_chest_item_count_by_item", "Quantidade total de item em todos os baus", ["item"])
+world_tiles = Gauge(
+    "terraria_world_tiles",
+    "Quantidade de tiles por categoria (bioma, minerio, liquido) no arquivo .wld",
+    ["kind"],
+    registry=WORLD_REGISTRY,
+)
+world_block_tiles = Gauge(
+    "terraria_world_block_tiles",
+    "Quantidade de tiles dos blocos mais comuns no arquivo .wld",
+    ["block"],
+    registry=WORLD_REGISTRY,
+)
+world_tiles_analysis_seconds = Gauge(
+    "terraria_world_tiles_analysis_seconds",
+    "Duracao da ultima analise de tiles do arquivo .wld",
+    registry=WORLD_REGISTRY,
+)
 
 player_health = Gauge("terraria_player_health", "Vida do jogador", ["player"])
 player_mana = Gauge("terraria_player_mana", "Mana do jogador", ["player"])
@@ -87,8 +184,26 @@ LEAVE_PATTERNS = [
     re.compile(r"(?P<player>[A-Za-z0-9_ ]{2,32}) has left", re.IGNORECASE),
     re.compile(r"(?P<player>[A-Za-z0-9_ ]{2,32}) left the game", re.IGNORECASE),
 ]
-CONNECTION_PATTERN = re.compile(r"(?:\d{1,3}\.){3}\d{1,3}:\d+\s+is connecting", re.IGNORECASE)
+CONNECTION_PATTERN = re.compile(r"(?P<address>(?:\d{1,3}\.){3}\d{1,3}:\d+)\s+is connecting", re.IGNORECASE)
+# A whole IPv4 host, so 10.0.0.1 is not found inside 10.0.0.12.
+HOST_PATTERN = re.compile(r"(?<![\d.])(?:\d{1,3}\.){3}\d{1,3}(?!\.?\d)")
 WORLD_SAVE_PATTERN = re.compile(r"backing up world file", re.IGNORECASE)
+WORLD_SAVED_PATTERN = re.compile(r"world saved", re.IGNORECASE)
+LOG_TIMESTAMP_PATTERN = re.compile(r"(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(\.\d+)?Z ")
+JOIN_LATENCY_BUCKETS = [0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0]
+WORLD_SAVE_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0]
+# World flags the log fallback reports without any rules file; they share the compiled matcher with LOG_RULES_PATH.
+LOG_STATE_RULES: List[Dict[str, Any]] = [
+    {"trigger": "blood moon is rising", "state": "blood_moon", "value": 1},
+    {"trigger": "blood moon is over", "state": "blood_moon", "value": 0},
+    {"trigger": "blood moon has ended", "state": "blood_moon", "value": 0},
+    {"trigger": "solar eclipse is happening", "state": "eclipse", "value": 1},
+    {"trigger": "eclipse has begun", "state": "eclipse", "value": 1},
+    {"trigger": "solar eclipse has ended", "state": "eclipse", "value": 0},
+    {"trigger": "eclipse is over", "state": "eclipse", "value": 0},
+    {"trigger": "night has fallen", "state": "daytime", "value": 0},
+    {"trigger": "day has dawned", "state": "daytime", "value": 1},
+]
 
 
 def _as_bool(value: Any) -> int:
@@ -127,16 +242,137 @@ def _find_first(data: Any, keys: List[str]) -> Optional[Any]:
     return None
 
 
-def _request(paths: List[str]) -> Optional[Any]:
-    if not API_BASE:
+class InputRecorder:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.entries: List[Dict[str, Any]] = []
+        self.world_bytes: Optional[bytes] = None
+        self.tracker: Dict[str, float] = {}
+
+    def record(self, kind: str, key: str, payload: Any, started: float, elapsed: float) -> None:
+        with self.lock:
+            self.entries.append(
+                {
+                    "seq": len(self.entries),
+                    "kind": kind,
+                    "key": key,
+                    "offset": round(started - self.started, 6),
+                    "elapsed": round(elapsed, 6),
+                    "payload": payload,
+                }
+            )
+
+    def save(self, path: str, cycle_seconds: float) -> None:
+        manifest = {
+            "format": "terraria-exporter-capture",
+            "version": 1,
+            "captured_at": self.started,
+            "cycle_seconds": round(cycle_seconds, 6),
+            "world_file": os.path.basename(_target().world_file) if self.world_bytes is not None else None,
+            "entries": len(self.entries),
+            "tracker": self.tracker,
+        }
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+            archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+            archive.writestr("inputs.jsonl", "\n".join(json.dumps(entry, separators=(",", ":")) for entry in self.entries))
+            if self.world_bytes is not None:
+                archive.writestr("world.wld", self.world_bytes)
+
+
+class InputReplay:
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        self.speed = speed
+        self.lock = threading.Lock()
+        self.entries: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self.world_path: Optional[str] = None
+        with zipfile.ZipFile(path) as archive:
+            self.manifest = json.loads(archive.read("manifest.json"))
+            for raw in archive.read("inputs.jsonl").decode("utf-8").splitlines():
+                if raw.strip():
+                    entry = json.loads(raw)
+                    self.entries.setdefault((entry["kind"], entry["key"]), []).append(entry)
+            if "world.wld" in archive.namelist():
+                handle, self.world_path = tempfile.mkstemp(prefix="terraria-replay-", suffix=".wld")
+                with os.fdopen(handle, "wb") as target:
+                    target.write(archive.read("world.wld"))
+        self.cursor: Dict[Tuple[str, str], int] = {}
+
+    def now(self) -> float:
+        return float(self.manifest.get("captured_at") or time.time())
+
+    def has(self, kind: str) -> bool:
+        return any(entry_kind == kind for entry_kind, _ in self.entries)
+
+    def lookup(self, kind: str, key: str) -> Any:
+        with self.lock:
+            recorded = self.entries.get((kind, key))
+            if not recorded:
+                return None
+            # Repeated calls walk the recorded sequence and then keep returning the last answer.
+            index = self.cursor.get((kind, key), 0)
+            self.cursor[(kind, key)] = index + 1
+            entry = recorded[min(index, len(recorded) - 1)]
+        if self.speed > 0:
+            time.sleep(entry["elapsed"] / self.speed)
+        return entry["payload"]
+
+    def rewind(self) -> None:
+        with self.lock:
+            self.cursor.clear()
+
+    def restore(self, tracker: "KubernetesLogTracker") -> None:
+        # Captures made before the tracker state was recorded counted the whole tail, like new ones.
+        state = self.manifest.get("tracker") or {}
+        tracker.started_at = float(state.get("started_at", 0.0))
+        tracker.watermark = float(state.get("watermark", 0.0))
+
+
+_recorder: Optional[InputRecorder] = None
+_replay: Optional[InputReplay] = None
+
+
+def _recorded(kind: str, key: str, fetch: Callable[[], Any]) -> Any:
+    if _replay is not None:
+        return _replay.lookup(kind, key)
+    if _recorder is None:
+        return fetch()
+    started = time.time()
+    payload = fetch()
+    _recorder.record(kind, key, payload, started, time.time() - started)
+    return payload
+
+
+def _now() -> float:
+    return _replay.now() if _replay is not None else time.time()
+
+
+def _read_text_file(path: str) -> Optional[str]:
+    def read() -> Optional[str]:
+        candidate = Path(path)
+        if not candidate.exists() or not candidate.is_file():
+            return None
+        return candidate.read_text(encoding="utf-8", errors="ignore")
+
+    return _recorded("file", path, read)
+
+
+def _request(paths: List[str], extra_params: Optional[Dict[str, str]] = None) -> Optional[Any]:
+    key = json.dumps([paths, extra_params or {}], sort_keys=True)
+    return _recorded("tshock", key, lambda: _request_live(paths, extra_params))
+
+
+def _request_live(paths: List[str], extra_params: Optional[Dict[str, str]] = None) -> Optional[Any]:
+    target = _target()
+    if not target.api_url:
         return None
 
-    params = {}
-    if API_TOKEN:
-        params["token"] = API_TOKEN
+    params = dict(extra_params or {})
+    if target.api_token:
+        params["token"] = target.api_token
 
     for path in paths:
-        url = f"{API_BASE}{path}"
+        url = f"{target.api_url}{path}"
         try:
             response = requests.get(url, params=params, timeout=6)
             if response.status_code != 200:
@@ -185,12 +421,56 @@ def _safe_float(value: Any) -> Optional[float]:
     return None
 
 
-def _read_max_players_from_config() -> Optional[float]:
-    path = Path(SERVER_CONFIG_PATH)
-    if not path.exists() or not path.is_file():
+def _player_name(player: Dict[str, Any]) -> str:
+    return str(player.get("name") or player.get("nickname") or player.get("playerName") or player.get("username") or "unknown")
+
+
+def _player_position(player: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    # TShock reports "x,y" in tile coordinates; other builds use a dict or separate keys.
+    position = player.get("position")
+    if isinstance(position, str) and "," in position:
+        parts = position.split(",", 1)
+    elif isinstance(position, dict):
+        parts = [position.get("x", position.get("X")), position.get("y", position.get("Y"))]
+    else:
+        parts = [player.get("tileX", player.get("x")), player.get("tileY", player.get("y"))]
+    try:
+        x, y = int(float(str(parts[0]).strip())), int(float(str(parts[1]).strip()))
+    except (TypeError, ValueError):
         return None
+    return (x, y) if x >= 0 and y >= 0 else None
+
+
+def _player_inventory(player: Dict[str, Any]) -> List[Dict[str, Any]]:
+    inventory = player.get("inventory")
+    if isinstance(inventory, dict):
+        inventory = inventory.get("inventory", inventory.get("items"))
+    if inventory is None and isinstance(player.get("items"), dict):
+        inventory = player["items"].get("inventory")
+
+    if isinstance(inventory, list):
+        return [i for i in inventory if isinstance(i, dict)]
+
+    # TShock /v2/players/read returns the inventory as "Name:stack, Name:stack".
+    parsed: List[Dict[str, Any]] = []
+    if isinstance(inventory, str):
+        for entry in inventory.split(","):
+            name, sep, amount = entry.strip().rpartition(":")
+            if not sep or not name:
+                continue
+            try:
+                parsed.append({"name": name, "stack": float(amount)})
+            except ValueError:
+                continue
+    return parsed
+
+
+def _read_max_players_from_config() -> Optional[float]:
     try:
-        for raw in path.read_text(encoding="utf-8", errors="ignore").splitlines():
+        content = _read_text_file(SERVER_CONFIG_PATH)
+        if content is None:
+            return None
+        for raw in content.splitlines():
             line = raw.strip()
             if not line or line.startswith("#"):
                 continue
@@ -207,12 +487,11 @@ def _read_max_players_from_config() -> Optional[float]:
 
 
 def _read_max_players_from_tshock_config() -> Optional[float]:
-    path = Path(TSHOCK_CONFIG_PATH)
-    if not path.exists() or not path.is_file():
-        return None
-
     try:
-        payload = json.loads(path.read_text(encoding="utf-8", errors="ignore"))
+        content = _read_text_file(TSHOCK_CONFIG_PATH)
+        if content is None:
+            return None
+        payload = json.loads(content)
     except Exception:
         return None
 
@@ -229,14 +508,15 @@ def _read_max_players_from_tshock_config() -> Optional[float]:
     return None
 
 
-def _reset_metrics() -> None:
+def _reset_runtime_metrics() -> None:
     source_up.set(0)
-    world_parser_up.set(0)
     world_runtime_up.set(0)
     log_tracker_up.set(0)
-    world_parser_unsupported.set(0)
     log_connection_attempts_window.set(0)
     log_world_saves_window.set(0)
+    join_latency.clear()
+    world_save_duration.clear()
+    log_rule_metrics.clear()
 
     players_online.set(0)
     players_online_api.set(0)
@@ -253,6 +533,17 @@ def _reset_metrics() -> None:
     world_snapshot_age_seconds.set(0)
     world_snapshot_mtime.set(0)
 
+    player_health.clear()
+    player_mana.clear()
+    player_deaths.clear()
+    player_items.clear()
+    monster_count.clear()
+
+
+def _reset_world_metrics() -> None:
+    world_parser_up.set(0)
+    world_parser_unsupported.set(0)
+
     world_chests.set(0)
     world_houses.set(0)
     world_housed_npcs.set(0)
@@ -260,11 +551,15 @@ def _reset_metrics() -> None:
 
     chest_item_count.clear()
     chest_item_count_by_item.clear()
-    player_health.clear()
-    player_mana.clear()
-    player_deaths.clear()
-    player_items.clear()
-    monster_count.clear()
+
+    world_tiles.clear()
+    world_block_tiles.clear()
+    world_tiles_analysis_seconds.set(0)
+
+
+def _reset_metrics() -> None:
+    _reset_runtime_metrics()
+    _reset_world_metrics()
 
 
 def _sanitize_log_message(msg: str) -> str:
@@ -272,6 +567,24 @@ def _sanitize_log_message(msg: str) -> str:
     return clean
 
 
+_log_second_cache: Dict[str, float] = {}
+
+
+def _split_log_timestamp(line: str) -> Tuple[Optional[float], str]:
+    # Kubernetes prefixes each line with RFC3339Nano when timestamps=true; fractions are trimmed, so parse numerically.
+    match = LOG_TIMESTAMP_PATTERN.match(line)
+    if not match:
+        return None, line
+    second = match.group(1)
+    stamp = _log_second_cache.get(second)
+    if stamp is None:
+        if len(_log_second_cache) > 4096:
+            _log_second_cache.clear()
+        stamp = _log_second_cache[second] = datetime.fromisoformat(second).replace(tzinfo=timezone.utc).timestamp()
+    fraction = match.group(2)
+    return (stamp + float(fraction) if fraction else stamp), line[match.end():]
+
+
 def _extract_player(regex_list: List[re.Pattern], line: str) -> Optional[str]:
     for pattern in regex_list:
         match = pattern.search(line)
@@ -287,14 +600,276 @@ def _extract_player(regex_list: List[re.Pattern], line: str) -> Optional[str]:
     return None
 
 
-class KubernetesLogTracker:
+class LogHistogram:
+    """Cumulative bucket counts owned by one tracker, so every target keeps its own distribution."""
+
+    def __init__(self, buckets: List[float]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+class LoadedHistogram:
+    """Exposes whichever LogHistogram the current cycle loaded, like a gauge that is reset and set again."""
+
+    def __init__(self, name: str, documentation: str, registry: CollectorRegistry = RUNTIME_REGISTRY) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.state: Optional[LogHistogram] = None
+        registry.register(self)
+
+    def load(self, state: LogHistogram) -> None:
+        self.state = state
+
+    def clear(self) -> None:
+        self.state = None
+
+    def describe(self) -> List[Metric]:
+        return [HistogramMetricFamily(self.name, self.documentation)]
+
+    def collect(self) -> List[Metric]:
+        state = self.state
+        if state is None:
+            return []
+        buckets: List[Tuple[str, float]] = []
+        cumulative = 0
+        for bound, count in zip(state.buckets + [float("inf")], state.counts):
+            cumulative += count
+            buckets.append((floatToGoString(bound), cumulative))
+        return [HistogramMetricFamily(self.name, self.documentation, buckets=buckets, sum_value=state.total)]
+
+
+join_latency = LoadedHistogram(
+    "terraria_join_latency_seconds",
+    "Tempo entre 'is connecting' e 'has joined' nos logs do servidor",
+)
+world_save_duration = LoadedHistogram(
+    "terraria_world_save_duration_seconds",
+    "Tempo entre 'Backing up world file' e 'World saved' nos logs do servidor",
+)
+
+
+class LogRule:
+    """One declared log event: a literal trigger, an optional capture pattern and the metric it drives."""
+
+    TYPES = {"counter": {"inc"}, "gauge": {"set", "reset"}}
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        self.trigger = str(spec.get("trigger") or "").lower()
+        self.name = str(spec.get("name") or self.trigger)
+        if not self.trigger:
+            raise ValueError(f"log rule {self.name!r} has no trigger")
+        pattern = spec.get("pattern")
+        self.pattern = re.compile(str(pattern), re.IGNORECASE) if pattern else None
+        groups = set(self.pattern.groupindex) if self.pattern else set()
+        self.state = spec.get("state")
+        self.metric = str(spec.get("metric") or "")
+        self.type = str(spec.get("type") or "counter")
+        self.action = str(spec.get("action") or ("inc" if self.type == "counter" else "set"))
+        self.value = spec.get("value", 1)
+        self.labels = [str(label) for label in spec.get("labels") or []]
+        self.help = str(spec.get("help") or f"Eventos de log da regra {self.name}")
+
+        if self.state:
+            return
+        # Families that do not start with terraria_ are dropped by the per-target capture and the replay exposition.
+        if not self.metric.startswith("terraria_"):
+            raise ValueError(f"log rule {self.name!r} needs a metric named terraria_*")
+        if self.action not in self.TYPES.get(self.type, set()):
+            raise ValueError(f"log rule {self.name!r}: {self.type} metrics do not support action {self.action!r}")
+        missing = [label for label in self.labels if label not in groups]
+        if isinstance(self.value, str) and self.value not in groups:
+            missing.append(self.value)
+        if missing:
+            raise ValueError(f"log rule {self.name!r} references groups missing from its pattern: {', '.join(missing)}")
+
+    def amount(self, match: Optional[re.Match]) -> Optional[float]:
+        if not isinstance(self.value, str):
+            return float(self.value)
+        try:
+            return float(match.group(self.value)) if match else None
+        except (TypeError, ValueError):
+            return None
+
+
+def _trigger_trie(triggers: List[str]) -> str:
+    root: Dict[str, Any] = {}
+    for trigger in triggers:
+        node = root
+        for char in trigger:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Optional continuations are greedy, so the longest trigger wins where two start at the same offset.
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(root)
+
+
+class LogRuleSet:
+    """All triggers compiled into one alternation, so a log line costs a single scan however many rules exist."""
+
+    def __init__(self, specs: List[Dict[str, Any]]) -> None:
+        self.by_trigger: Dict[str, List[LogRule]] = {}
+        self.metrics: Dict[str, Tuple[str, str, List[str]]] = {}
+        for spec in specs:
+            rule = LogRule(spec)
+            self.by_trigger.setdefault(rule.trigger, []).append(rule)
+            if rule.state or rule.action == "reset":
+                continue
+            kind, _, labels = self.metrics.setdefault(rule.metric, (rule.type, rule.help, rule.labels))
+            if kind != rule.type or sorted(labels) != sorted(rule.labels):
+                raise ValueError(f"log rule {rule.name!r} redeclares {rule.metric} with another type or label set")
+            rule.labels = labels
+        for rules in self.by_trigger.values():
+            for rule in rules:
+                if rule.action == "reset" and rule.metric not in self.metrics:
+                    raise ValueError(f"log rule {rule.name!r} resets {rule.metric}, which no other rule sets")
+        # A flat alternation makes re try every trigger at every offset; folding them into a prefix trie keeps
+        # the per-line cost roughly flat as rules are added.
+        trie = _trigger_trie(list(self.by_trigger))
+        self.matcher = re.compile(trie) if trie else None
+        # Only lines that hit anything pay for the zero-width pass that also reports overlapping triggers.
+        self.overlapping = re.compile(f"(?=({trie}))") if trie else None
+
+    def matches(self, lowered: str) -> List[LogRule]:
+        first = self.matcher.search(lowered) if self.matcher is not None else None
+        if first is None:
+            return []
+        hits: List[LogRule] = []
+        for match in self.overlapping.finditer(lowered, first.start()):
+            hits.extend(self.by_trigger[match.group(1)])
+        return hits
+
+
+def load_log_rules(path: str) -> List[Dict[str, Any]]:
+    if not path:
+        return []
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix.lower() in {".yaml", ".yml"}:
+        if yaml is None:
+            raise ValueError(f"{path} is YAML but PyYAML is not installed; use JSON instead")
+        payload = yaml.safe_load(text)
+    else:
+        payload = json.loads(text)
+    rules = payload.get("rules") if isinstance(payload, dict) else payload
+    if not isinstance(rules, list) or not all(isinstance(rule, dict) for rule in rules):
+        raise ValueError(f"{path} must hold a list of rules")
+    return rules
+
+
+class LogRuleSeries:
+    """Series the rule metrics accumulated for one tracker, so every target keeps its own counters."""
+
     def __init__(self) -> None:
+        self.values: Dict[str, Dict[Tuple[str, ...], float]] = {}
+
+    def apply(self, rule: LogRule, match: Optional[re.Match], count: bool) -> None:
+        series = self.values.setdefault(rule.metric, {})
+        if rule.action == "reset":
+            series.clear()
+            return
+        if rule.type == "counter" and not count:
+            return
+        amount = rule.amount(match)
+        if amount is None:
+            return
+        key = tuple(str(match.group(label) or "").strip()[:64] if match else "" for label in rule.labels)
+        if key not in series and len(series) >= LOG_RULE_SERIES_LIMIT:
+            return
+        if rule.type == "counter":
+            series[key] = series.get(key, 0.0) + amount
+        else:
+            series[key] = amount
+
+    def reset_gauges(self, rules: LogRuleSet) -> None:
+        for metric, (kind, _, _) in rules.metrics.items():
+            if kind == "gauge":
+                self.values.pop(metric, None)
+
+
+class LoadedLogRules:
+    """Exposes the rule metrics of whichever tracker the current cycle loaded, like LoadedHistogram."""
+
+    def __init__(self, rules: LogRuleSet, registry: CollectorRegistry = RUNTIME_REGISTRY) -> None:
+        self.rules = rules
+        self.state: Optional[LogRuleSeries] = None
+        registry.register(self)
+
+    def load(self, state: LogRuleSeries) -> None:
+        self.state = state
+
+    def clear(self) -> None:
+        self.state = None
+
+    def _families(self, state: Optional[LogRuleSeries]) -> List[Metric]:
+        families: List[Metric] = []
+        for metric, (kind, documentation, labels) in self.rules.metrics.items():
+            family_type = CounterMetricFamily if kind == "counter" else GaugeMetricFamily
+            family = family_type(metric, documentation, labels=labels)
+            for key, value in (state.values.get(metric, {}) if state else {}).items():
+                family.add_metric(list(key), value)
+            families.append(family)
+        return families
+
+    def describe(self) -> List[Metric]:
+        return self._families(None)
+
+    def collect(self) -> List[Metric]:
+        state = self.state
+        if state is None:
+            return []
+        return self._families(state)
+
+
+def _build_log_rules() -> Tuple[LogRuleSet, LoadedLogRules]:
+    try:
+        rules = LogRuleSet(LOG_STATE_RULES + load_log_rules(LOG_RULES_PATH))
+        return rules, LoadedLogRules(rules)
+    except Exception as exc:
+        # A bad rules file (unreadable, malformed or clashing with a built-in metric) only costs the custom
+        # events; the built-in world flags keep working.
+        print(f"[exporter] ignoring log rules from {LOG_RULES_PATH}: {exc}", file=sys.stderr)
+        rules = LogRuleSet(LOG_STATE_RULES)
+        return rules, LoadedLogRules(rules)
+
+
+LOG_RULES, log_rule_metrics = _build_log_rules()
+
+
+class KubernetesLogTracker:
+    def __init__(self, label_selector: Optional[str] = None) -> None:
+        self.label_selector = label_selector or K8S_TERRARIA_LABEL_SELECTOR
         self.token_path = Path("/var/run/secrets/kubernetes.io/serviceaccount/token")
         self.ca_path = Path("/var/run/secrets/kubernetes.io/serviceaccount/ca.crt")
         self.host = os.getenv("KUBERNETES_SERVICE_HOST", "")
         self.port = os.getenv("KUBERNETES_SERVICE_PORT", "443")
+        self.base_url = f"https://{self.host}:{self.port}"
+        self.verify: Any = str(self.ca_path)
+        # Every cycle re-reads the same tail, so pairing only looks at lines newer than the watermark.
+        # Events that finish before the tracker started only prime the pending state.
+        self.started_at = _now()
+        self.pod: Optional[str] = None
+        self.watermark = 0.0
+        self.watermark_lines: set = set()
+        self.pending_connections: "OrderedDict[str, float]" = OrderedDict()
+        self.pending_save: Optional[float] = None
+        self.join_latency = LogHistogram(JOIN_LATENCY_BUCKETS)
+        self.save_duration = LogHistogram(WORLD_SAVE_BUCKETS)
+        self.rule_series = LogRuleSeries()
 
     def _enabled(self) -> bool:
+        if _replay is not None:
+            return _replay.has("kube")
         return (
             ENABLE_LOG_PLAYER_TRACKER
             and bool(self.host)
@@ -307,17 +882,21 @@ class KubernetesLogTracker:
         return {"Authorization": f"Bearer {token}"}
 
     def _request(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        key = json.dumps([path, params or {}], sort_keys=True)
+        return _recorded("kube", key, lambda: self._request_live(path, params))
+
+    def _request_live(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
         if not self._enabled():
             return None
 
-        url = f"https://{self.host}:{self.port}{path}"
+        url = f"{self.base_url}{path}"
         try:
             response = requests.get(
                 url,
                 params=params,
                 headers=self._headers(),
                 timeout=6,
-                verify=str(self.ca_path),
+                verify=self.verify,
             )
             if response.status_code != 200:
                 return None
@@ -330,7 +909,7 @@ class KubernetesLogTracker:
     def _pick_running_pod(self) -> Optional[str]:
         payload = self._request(
             f"/api/v1/namespaces/{K8S_NAMESPACE}/pods",
-            {"labelSelector": K8S_TERRARIA_LABEL_SELECTOR},
+            {"labelSelector": self.label_selector},
         )
         if not isinstance(payload, dict):
             return None
@@ -359,10 +938,51 @@ class KubernetesLogTracker:
             {
                 "container": K8S_TERRARIA_CONTAINER,
                 "tailLines": str(K8S_LOG_TAIL_LINES),
-                "timestamps": "false",
+                "timestamps": "true",
             },
         )
 
+    def _is_new(self, stamp: float, line: str) -> bool:
+        if stamp < self.watermark or (stamp == self.watermark and line in self.watermark_lines):
+            return False
+        if stamp > self.watermark:
+            self.watermark = stamp
+            self.watermark_lines = set()
+        self.watermark_lines.add(line)
+        return True
+
+    def _pair(self, stamp: float, line: str, connection: Optional[re.Match], joined: bool, save_started: bool) -> None:
+        # Pings and failed logins connect without ever joining, so connections expire much sooner than saves.
+        join_cutoff = stamp - min(LOG_JOIN_PENDING_TTL, LOG_PAIRING_TTL)
+        pending = self.pending_connections
+        while pending and next(iter(pending.values())) < join_cutoff:
+            pending.popitem(last=False)
+        if self.pending_save is not None and self.pending_save < stamp - LOG_PAIRING_TTL:
+            self.pending_save = None
+
+        if connection:
+            address = connection.group("address")
+            pending.pop(address, None)
+            pending[address] = stamp
+            while len(pending) > LOG_PAIRING_MAX_PENDING:
+                pending.popitem(last=False)
+        if joined and pending:
+            # Join lines rarely carry the address. The latest connection is the likeliest match; an older one
+            # still waiting is more often a connect that never joined and would inflate the latency.
+            hosts = set(HOST_PATTERN.findall(line))
+            address = next((item for item in reversed(pending) if item.rsplit(":", 1)[0] in hosts), None) or next(reversed(pending))
+            started = pending.pop(address)
+            if stamp >= self.started_at:
+                self.join_latency.observe(stamp - started)
+
+        if save_started:
+            if self.pending_save is None:
+                self.pending_save = stamp
+        elif self.pending_save is not None and WORLD_SAVED_PATTERN.search(line):
+            if stamp >= self.started_at:
+                self.save_duration.observe(stamp - self.pending_save)
+            self.pending_save = None
+
     def parse(self) -> Dict[str, Any]:
         result: Dict[str, Any] = {
             "ok": False,
@@ -383,71 +1003,505 @@ class KubernetesLogTracker:
         if not pod_name:
             return result
         result["pod"] = pod_name
+        if pod_name != self.pod:
+            self.pod = pod_name
+            self.pending_connections.clear()
+            self.pending_save = None
+            self.rule_series.reset_gauges(LOG_RULES)
 
         raw_logs = self._fetch_logs(pod_name)
         if not isinstance(raw_logs, str):
             return result
 
         online: Dict[str, str] = {}
-        blood_moon: Optional[int] = None
-        eclipse: Optional[int] = None
-        daytime: Optional[int] = None
+        states: Dict[str, Any] = {}
         connection_attempts = 0
         world_saves = 0
 
         for raw_line in raw_logs.splitlines():
+            stamp, raw_line = _split_log_timestamp(raw_line)
             line = _sanitize_log_message(raw_line)
             if not line:
                 continue
             lowered = line.lower()
 
-            if CONNECTION_PATTERN.search(line):
+            connection = CONNECTION_PATTERN.search(line)
+            if connection:
                 connection_attempts += 1
-            if WORLD_SAVE_PATTERN.search(lowered):
+            save_started = WORLD_SAVE_PATTERN.search(lowered) is not None
+            if save_started:
                 world_saves += 1
 
             join_player = _extract_player(JOIN_PATTERNS, line)
             if join_player:
                 online[join_player.lower()] = join_player
 
+            new = stamp is not None and self._is_new(stamp, line)
+            if new:
+                self._pair(stamp, line, connection, join_player is not None, save_started)
+
             leave_player = _extract_player(LEAVE_PATTERNS, line)
             if leave_player:
                 online.pop(leave_player.lower(), None)
 
-            if "blood moon is rising" in lowered:
-                blood_moon = 1
-            elif "blood moon is over" in lowered or "blood moon has ended" in lowered:
-                blood_moon = 0
-
-            if "solar eclipse is happening" in lowered or "eclipse has begun" in lowered:
-                eclipse = 1
-            elif "solar eclipse has ended" in lowered or "eclipse is over" in lowered:
-                eclipse = 0
-
-            if "night has fallen" in lowered:
-                daytime = 0
-            elif "day has dawned" in lowered:
-                daytime = 1
+            for rule in LOG_RULES.matches(lowered):
+                match = rule.pattern.search(line) if rule.pattern else None
+                if rule.pattern and not match:
+                    continue
+                if rule.state:
+                    # World flags describe the whole tail, so they ignore the watermark.
+                    states[rule.state] = rule.value
+                elif new:
+                    self.rule_series.apply(rule, match, stamp >= self.started_at)
 
         result["ok"] = True
         result["players_online"] = len(online)
         result["players"] = sorted(online.values())
-        result["blood_moon"] = blood_moon
-        result["eclipse"] = eclipse
-        result["daytime"] = daytime
+        result["blood_moon"] = states.get("blood_moon")
+        result["eclipse"] = states.get("eclipse")
+        result["daytime"] = states.get("daytime")
         result["connection_attempts"] = connection_attempts
         result["world_saves"] = world_saves
         return result
 
 
-def _update_from_api() -> Dict[str, Any]:
+class PlayerDetailFetcher:
+    def __init__(self) -> None:
+        self.cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Players whose detail was fetched again since their position was last taken for the heatmap.
+        self.fresh: set = set()
+        self.pool = ThreadPoolExecutor(max_workers=PLAYER_DETAIL_CONCURRENCY, thread_name_prefix="player-detail")
+
+    def _fetch(self, target: "ScrapeTarget", name: str) -> Optional[Dict[str, Any]]:
+        _active.target = target
+        try:
+            payload = _request(["/v2/players/read", "/v3/players/read"], {"player": name})
+        finally:
+            _active.target = None
+        if isinstance(payload, dict) and str(payload.get("status", "200")) == "200":
+            return payload
+        return None
+
+    def details(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        online = set(names)
+        for name in list(self.cache):
+            if name not in online:
+                self.cache.pop(name, None)
+                self.fresh.discard(name)
+
+        # Refresh only the stalest entries this cycle; the rest wait for the next ones.
+        stale = [name for name in names if now - self.cache.get(name, (0.0, {}))[0] >= PLAYER_DETAIL_TTL]
+        stale.sort(key=lambda name: self.cache.get(name, (0.0, {}))[0])
+        batch = stale[:PLAYER_DETAIL_MAX_PER_CYCLE]
+
+        target = _target()
+        for name, detail in zip(batch, self.pool.map(lambda player: self._fetch(target, player), batch)):
+            if detail is None:
+                # Keep serving the old detail (if any) and retry only after another TTL.
+                detail = self.cache.get(name, (0.0, {}))[1]
+            else:
+                self.fresh.add(name)
+            self.cache[name] = (now, detail)
+
+        return {name: self.cache[name][1] for name in names if self.cache.get(name, (0.0, {}))[1]}
+
+    def take_fresh(self, name: str) -> bool:
+        """True once per successful refresh, so a cached position is sampled at most once."""
+        if name not in self.fresh:
+            return False
+        self.fresh.discard(name)
+        return True
+
+
+class ChestIndex:
+    """Inverted index item -> {chest: (x, y, quantity)}, patched per chest as the world changes."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.chests: Dict[str, Dict[str, Any]] = {}
+        self.postings: Dict[str, Dict[str, Tuple[Optional[int], Optional[int], float]]] = {}
+        # Sorted (key, item) pairs; every word start of a name is a key so "bar" finds "Hallowed Bar".
+        self.keys: List[Tuple[str, str]] = []
+        self.ranked: Dict[str, Dict[str, Any]] = {}
+        self.updated_at = 0.0
+
+    @staticmethod
+    def _item_keys(item: str) -> List[Tuple[str, str]]:
+        words = item.lower().split()
+        return [(" ".join(words[index:]), item) for index in range(len(words))] or [(item.lower(), item)]
+
+    def _remove(self, chest_id: str, items: Dict[str, float]) -> None:
+        for item in items:
+            posting = self.postings.get(item)
+            if posting is None:
+                continue
+            posting.pop(chest_id, None)
+            self.ranked.pop(item, None)
+            if not posting:
+                del self.postings[item]
+                for key in self._item_keys(item):
+                    index = bisect.bisect_left(self.keys, key)
+                    if index < len(self.keys) and self.keys[index] == key:
+                        del self.keys[index]
+
+    def _add(self, chest_id: str, chest: Dict[str, Any]) -> None:
+        for item, quantity in chest["items"].items():
+            posting = self.postings.get(item)
+            if posting is None:
+                posting = self.postings[item] = {}
+                for key in self._item_keys(item):
+                    bisect.insort(self.keys, key)
+            posting[chest_id] = (chest.get("x"), chest.get("y"), quantity)
+            self.ranked.pop(item, None)
+
+    def update(self, chests: Dict[str, Dict[str, Any]]) -> int:
+        """Apply a full chest listing, touching only chests that were added, removed or changed."""
+        changed = 0
+        with self.lock:
+            for chest_id in [chest_id for chest_id in self.chests if chest_id not in chests]:
+                self._remove(chest_id, self.chests.pop(chest_id)["items"])
+                changed += 1
+            for chest_id, chest in chests.items():
+                previous = self.chests.get(chest_id)
+                if previous == chest:
+                    continue
+                if previous is not None:
+                    self._remove(chest_id, previous["items"])
+                self._add(chest_id, chest)
+                self.chests[chest_id] = chest
+                changed += 1
+            if changed:
+                self.updated_at = _now()
+        return changed
+
+    def search(self, query: str, limit: int, chest_limit: int) -> List[Dict[str, Any]]:
+        prefix = " ".join(query.lower().split())
+        results: List[Dict[str, Any]] = []
+        with self.lock:
+            seen = set()
+            index = bisect.bisect_left(self.keys, (prefix, ""))
+            while index < len(self.keys) and len(results) < limit and self.keys[index][0].startswith(prefix):
+                item = self.keys[index][1]
+                index += 1
+                if item in seen:
+                    continue
+                seen.add(item)
+                ranked = self.ranked.get(item)
+                if ranked is None:
+                    # Ranking and total are cached per item until one of its chests changes.
+                    chests = sorted(
+                        (
+                            {"chest": chest_id, "x": x, "y": y, "quantity": quantity}
+                            for chest_id, (x, y, quantity) in self.postings[item].items()
+                        ),
+                        key=lambda entry: entry["quantity"],
+                        reverse=True,
+                    )
+                    ranked = self.ranked[item] = {"total": sum(entry["quantity"] for entry in chests), "chests": chests}
+                results.append(
+                    {
+                        "item": item,
+                        "total": ranked["total"],
+                        "chest_count": len(ranked["chests"]),
+                        "chests": ranked["chests"][:chest_limit],
+                    }
+                )
+        return results
+
+
+def _chest_position(chest: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+    x, y = chest.get("x", chest.get("X")), chest.get("y", chest.get("Y"))
+    if (x is None or y is None) and isinstance(chest.get("position"), dict):
+        x, y = chest["position"].get("x"), chest["position"].get("y")
+    return (int(x), int(y)) if isinstance(x, (int, float)) and isinstance(y, (int, float)) else (None, None)
+
+
+class HistoryStore:
+    """SQLite change log of chest, item and player inventory quantities, downsampled as it ages."""
+
+    SERIES = {
+        # table: (series column, value column)
+        "chest_history": ("chest", "quantity"),
+        "item_history": ("item", "total"),
+        "player_history": ("player", "quantity"),
+    }
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chest_history (ts REAL, chest TEXT, item TEXT, quantity REAL);
+            CREATE INDEX IF NOT EXISTS chest_history_series ON chest_history (chest, ts);
+            CREATE TABLE IF NOT EXISTS item_history (ts REAL, item TEXT, total REAL);
+            CREATE INDEX IF NOT EXISTS item_history_series ON item_history (item, ts);
+            CREATE TABLE IF NOT EXISTS player_history (ts REAL, player TEXT, item TEXT, quantity REAL);
+            CREATE INDEX IF NOT EXISTS player_history_series ON player_history (player, ts);
+            """
+        )
+        self.compacted = 0.0
+        # Rebuild "last known value" per series so deltas continue across restarts.
+        self.last: Dict[str, Dict[Tuple[str, ...], float]] = {}
+        for table, (series, value) in self.SERIES.items():
+            columns = f"{series}, item" if table != "item_history" else series
+            rows = self.db.execute(
+                f"SELECT {columns}, {value} FROM {table} WHERE rowid IN (SELECT MAX(rowid) FROM {table} GROUP BY {columns})"
+            )
+            self.last[table] = {tuple(row[:-1]): row[-1] for row in rows if row[-1]}
+
+    def _deltas(self, table: str, current: Dict[Tuple[str, ...], float], scope: Optional[set] = None) -> List[Tuple[Any, ...]]:
+        previous = self.last[table]
+        rows = [key + (value,) for key, value in current.items() if previous.get(key) != value]
+        # Series that disappeared are closed with a zero; scope limits that to e.g. online players.
+        rows += [key + (0.0,) for key in previous if key not in current and (scope is None or key[0] in scope)]
+        for row in rows:
+            if row[-1]:
+                previous[row[:-1]] = row[-1]
+            else:
+                previous.pop(row[:-1], None)
+        return rows
+
+    def record(self, now: float, chests: Dict[str, Dict[str, Any]], inventories: Dict[str, Dict[str, float]]) -> int:
+        chest_values = {(chest_id, item): qty for chest_id, chest in chests.items() for item, qty in chest["items"].items()}
+        totals: Dict[Tuple[str, ...], float] = {}
+        for (_, item), qty in chest_values.items():
+            totals[(item,)] = totals.get((item,), 0.0) + qty
+        player_values = {(player, item): qty for player, items in inventories.items() for item, qty in items.items()}
+
+        written = 0
+        with self.lock:
+            for table, current, scope in (
+                ("chest_history", chest_values if chests else {}, None if chests else set()),
+                ("item_history", totals if chests else {}, None if chests else set()),
+                ("player_history", player_values, set(inventories)),
+            ):
+                rows = self._deltas(table, current, scope)
+                if rows:
+                    marks = ", ".join("?" * (len(rows[0]) + 1))
+                    self.db.executemany(f"INSERT INTO {table} VALUES ({marks})", [(now,) + row for row in rows])
+                    written += len(rows)
+            self.db.commit()
+            if now - self.compacted >= 3600:
+                self._compact(now)
+                self.compacted = now
+        return written
+
+    def _compact(self, now: float) -> None:
+        # Keep the last change per hour after HISTORY_RAW_DAYS and per day after HISTORY_HOURLY_DAYS.
+        for table, (series, _) in self.SERIES.items():
+            columns = f"{series}, item" if table != "item_history" else series
+            for age_days, bucket in ((HISTORY_RAW_DAYS, 3600), (HISTORY_HOURLY_DAYS, 86400)):
+                cutoff = now - age_days * 86400
+                self.db.execute(
+                    f"DELETE FROM {table} WHERE ts < ? AND rowid NOT IN "
+                    f"(SELECT MAX(rowid) FROM {table} WHERE ts < ? GROUP BY {columns}, CAST(ts / {bucket} AS INTEGER))",
+                    (cutoff, cutoff),
+                )
+        self.db.commit()
+
+    def item(self, name: str, since: float) -> List[List[float]]:
+        with self.lock:
+            rows = self.db.execute("SELECT ts, total FROM item_history WHERE item = ? AND ts >= ? ORDER BY ts", (name, since))
+            return [[ts, total] for ts, total in rows]
+
+    def breakdown(self, table: str, key: str, since: float) -> Dict[str, List[List[float]]]:
+        series = self.SERIES[table][0]
+        result: Dict[str, List[List[float]]] = {}
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT item, ts, quantity FROM {table} WHERE {series} = ? AND ts >= ? ORDER BY ts", (key, since)
+            )
+            for item, ts, quantity in rows:
+                result.setdefault(item, []).append([ts, quantity])
+        return result
+
+
+class ScrapeTarget:
+    def __init__(
+        self,
+        name: str,
+        api_url: Optional[str] = None,
+        api_token: Optional[str] = None,
+        world_file: Optional[str] = None,
+        label_selector: Optional[str] = None,
+    ) -> None:
+        # None means "follow the module-level setting", which keeps the single-server setup unchanged.
+        self.name = name
+        self._api_url = api_url.rstrip("/") if api_url is not None else None
+        self._api_token = api_token
+        self._world_file = world_file
+        self.tracker = KubernetesLogTracker(label_selector)
+        self.player_details = PlayerDetailFetcher()
+        self.world_state: Dict[str, Any] = {"key": None, "summary": None, "unsupported": False}
+        self.families: Dict[str, List[Metric]] = {}
+        self.tile_store: Optional[TileStore] = None
+        if TILE_STORE_DIR and np is not None:
+            self.tile_store = tile_stores.setdefault(name, TileStore(Path(TILE_STORE_DIR) / name))
+        self.chest_index = chest_indexes.setdefault(name, ChestIndex())
+        self.inventories: Dict[str, Dict[str, float]] = {}
+        self.history: Optional[HistoryStore] = None
+        if HISTORY_DIR:
+            self.history = histories.setdefault(name, HistoryStore(Path(HISTORY_DIR) / f"{name}.sqlite"))
+        self.heatmap: Optional[PositionHeatmap] = None
+        if ENABLE_PLAYER_HEATMAP and np is not None:
+            path = Path(HEATMAP_DIR) / f"{name}.npz" if HEATMAP_DIR else None
+            self.heatmap = heatmaps.setdefault(name, PositionHeatmap(path))
+
+    @property
+    def api_url(self) -> str:
+        return self._api_url if self._api_url is not None else API_BASE
+
+    @property
+    def api_token(self) -> str:
+        return self._api_token if self._api_token is not None else API_TOKEN
+
+    @property
+    def world_file(self) -> str:
+        return self._world_file if self._world_file is not None else WORLD_FILE_PATH
+
+
+_active = threading.local()
+_default_target: Optional[ScrapeTarget] = None
+_default_target_lock = threading.Lock()
+
+
+def _target() -> ScrapeTarget:
+    global _default_target
+    active = getattr(_active, "target", None)
+    if active is not None:
+        return active
+    if _default_target is None:
+        # The runtime loop and the world thread can both get here first at startup.
+        with _default_target_lock:
+            if _default_target is None:
+                _default_target = ScrapeTarget("default")
+    return _default_target
+
+
+def _load_targets() -> List[ScrapeTarget]:
+    raw = TERRARIA_TARGETS
+    if not raw:
+        return []
+    if raw.startswith("@"):
+        raw = Path(raw[1:]).read_text(encoding="utf-8")
+
+    targets: List[ScrapeTarget] = []
+    for entry in json.loads(raw):
+        if not isinstance(entry, dict) or not entry.get("name"):
+            continue
+        targets.append(
+            ScrapeTarget(
+                str(entry["name"]),
+                api_url=str(entry.get("api_url", "")),
+                api_token=entry.get("api_token"),
+                world_file=str(entry.get("world_file", "")),
+                label_selector=entry.get("label_selector"),
+            )
+        )
+    return targets
+
+
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+def assign_targets(target_names: List[str], members: List[str], vnodes: int = SHARD_VNODES) -> Dict[str, str]:
+    if not members:
+        return {}
+    ring = sorted((_ring_hash(f"{member}#{index}"), member) for member in set(members) for index in range(vnodes))
+    points = [point for point, _ in ring]
+    return {name: ring[bisect.bisect(points, _ring_hash(name)) % len(ring)][1] for name in target_names}
+
+
+class ShardCoordinator:
+    def __init__(self, directory: str, replica_id: str) -> None:
+        self.replica_id = replica_id
+        self.members_dir = Path(directory) / "members"
+        self.locks_dir = Path(directory) / "locks"
+        self.members_dir.mkdir(parents=True, exist_ok=True)
+        self.locks_dir.mkdir(parents=True, exist_ok=True)
+        self.locks: Dict[str, int] = {}
+        self.heartbeat_lock = threading.Lock()
+
+    def heartbeat(self) -> None:
+        member_file = self.members_dir / f"{self.replica_id}.json"
+        with self.heartbeat_lock:
+            tmp_file = member_file.with_suffix(".tmp")
+            owned = sorted(list(self.locks))
+            tmp_file.write_text(json.dumps({"replica": self.replica_id, "heartbeat_at": time.time(), "owned": owned}))
+            os.replace(tmp_file, member_file)
+
+    def start_heartbeat(self) -> None:
+        # A scrape cycle slower than the lease must not make peers think this replica died, so the lease
+        # is renewed on its own timer instead of once per cycle.
+        def loop() -> None:
+            while True:
+                try:
+                    self.heartbeat()
+                except OSError as exc:
+                    print(f"[exporter] shard heartbeat failed: {exc}", file=sys.stderr)
+                time.sleep(max(1.0, SHARD_LEASE_SECONDS / 3))
+
+        threading.Thread(target=loop, name="shard-heartbeat", daemon=True).start()
+
+    def members(self) -> List[str]:
+        now = time.time()
+        alive = {self.replica_id}
+        for member_file in self.members_dir.glob("*.json"):
+            try:
+                payload = json.loads(member_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            heartbeat_at = float(payload.get("heartbeat_at", 0))
+            if now - heartbeat_at <= SHARD_LEASE_SECONDS:
+                alive.add(str(payload.get("replica") or member_file.stem))
+            elif now - heartbeat_at > SHARD_LEASE_SECONDS * 20:
+                member_file.unlink(missing_ok=True)
+        return sorted(alive)
+
+    def _acquire(self, name: str) -> bool:
+        if name in self.locks:
+            return True
+        fd = os.open(self.locks_dir / f"{name}.lock", os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self.locks[name] = fd
+        return True
+
+    def _release(self, name: str) -> None:
+        fd = self.locks.pop(name, None)
+        if fd is None:
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def owned(self, targets: List[ScrapeTarget]) -> List[ScrapeTarget]:
+        self.heartbeat()
+        assignment = assign_targets([target.name for target in targets], self.members())
+        owned: List[ScrapeTarget] = []
+        for target in targets:
+            if assignment.get(target.name) != self.replica_id:
+                self._release(target.name)
+                continue
+            # The lock keeps a target single-polled while the previous owner has not yet noticed the new ring.
+            if self._acquire(target.name):
+                owned.append(target)
+        return owned
+
+
+def _update_from_api(player_details: Optional[PlayerDetailFetcher] = None) -> Dict[str, Any]:
     status = _request(["/status", "/v2/server/status", "/v3/server/status", "/v2/status"])
     players = _request(["/players", "/v2/players/list", "/v3/players/list", "/v2/players"])
     world = _request(["/world", "/v2/world/status", "/v3/world/status", "/v2/world"])
     monsters = _request(["/monsters", "/v2/monsters/list", "/v3/monsters/list", "/v2/npcs/list"])
-    chests = _request(["/v2/world/chests", "/v3/world/chests", "/chests"])
-    houses = _request(["/v2/world/houses", "/v3/world/houses", "/houses"])
-    housed_npcs = _request(["/v2/world/housednpcs", "/v3/world/housednpcs", "/v2/npcs/housed", "/housednpcs"])
 
     response: Dict[str, Any] = {
         "api_up": False,
@@ -456,7 +1510,7 @@ def _update_from_api() -> Dict[str, Any]:
         "runtime_world_up": False,
     }
 
-    if all(v is None for v in [status, players, world, monsters, chests, houses, housed_npcs]):
+    if all(v is None for v in [status, players, world, monsters]):
         return response
 
     response["api_up"] = True
@@ -467,9 +1521,6 @@ def _update_from_api() -> Dict[str, Any]:
         "players": players if players is not None else {},
         "world": world if world is not None else {},
         "monsters": monsters if monsters is not None else {},
-        "chests": chests if chests is not None else {},
-        "houses": houses if houses is not None else {},
-        "housed_npcs": housed_npcs if housed_npcs is not None else {},
     }
 
     online = _safe_float(_find_first(merged, ["onlineplayers", "playersonline", "playercount", "online"]))
@@ -515,8 +1566,22 @@ def _update_from_api() -> Dict[str, Any]:
         players_online.set(online_from_list)
         response["players_online"] = online_from_list
 
-    for player in parsed_players:
-        name = str(player.get("name") or player.get("playerName") or player.get("username") or "unknown")
+    details: Dict[str, Dict[str, Any]] = {}
+    if player_details is not None and parsed_players:
+        details = player_details.details([_player_name(p) for p in parsed_players])
+
+    positions: List[Tuple[int, int]] = []
+    inventories: Dict[str, Dict[str, float]] = {}
+    for listed in parsed_players:
+        name = _player_name(listed)
+        player = {**details.get(name, {}), **{k: v for k, v in listed.items() if v not in (None, "", [])}}
+        # The list is read every cycle, but a detail can be PLAYER_DETAIL_TTL old; sampling it each cycle
+        # would count one stale position several times.
+        position = _player_position(listed)
+        if position is None and name in details and player_details is not None and player_details.take_fresh(name):
+            position = _player_position(details[name])
+        if position is not None:
+            positions.append(position)
         life = _safe_float(player.get("health", player.get("life", player.get("hp", 0))))
         mana = _safe_float(player.get("mana", player.get("mp", 0)))
         deaths = _safe_float(player.get("deaths", player.get("deathCount", 0)))
@@ -528,15 +1593,21 @@ def _update_from_api() -> Dict[str, Any]:
         if deaths is not None:
             player_deaths.labels(player=name).set(deaths)
 
-        inventory = player.get("inventory", [])
-        if isinstance(inventory, list):
-            for item in inventory:
-                if not isinstance(item, dict):
-                    continue
-                item_name = _item_name(item)
-                amount = _item_amount(item)
-                if amount > 0:
-                    player_items.labels(player=name, item=item_name).set(amount)
+        player_totals: Dict[str, float] = {}
+        for item in _player_inventory(player):
+            item_name = _item_name(item)
+            amount = _item_amount(item)
+            if amount > 0:
+                player_totals[item_name] = player_totals.get(item_name, 0.0) + amount
+        for item_name, amount in player_totals.items():
+            player_items.labels(player=name, item=item_name).set(amount)
+        if name in details:
+            inventories[name] = player_totals
+
+    if players is not None:
+        _target().inventories = inventories
+    if _target().heatmap is not None and players is not None:
+        _target().heatmap.sample(positions, _now())
 
     parsed_monsters = _extract_dict_list(monsters, ["monsters", "npcs", "activeMonsters", "activeNPCs", "data"])
     bucket: Dict[str, int] = {}
@@ -546,14 +1617,36 @@ def _update_from_api() -> Dict[str, Any]:
     for mname, count in bucket.items():
         monster_count.labels(monster=mname).set(float(count))
 
+    if runtime_points > 0:
+        world_runtime_up.set(1)
+        response["runtime_world_up"] = True
+
+    return response
+
+
+def _chest_key(x: Optional[int], y: Optional[int], fallback: str) -> str:
+    # A chest's tile position is stable, unlike its slot in the listing, which shifts whenever one is removed.
+    return f"{x},{y}" if x is not None and y is not None else fallback
+
+
+def _update_world_from_api() -> Dict[str, Any]:
+    chests = _request(["/v2/world/chests", "/v3/world/chests", "/chests"])
+    houses = _request(["/v2/world/houses", "/v3/world/houses", "/houses"])
+    housed_npcs = _request(["/v2/world/housednpcs", "/v3/world/housednpcs", "/v2/npcs/housed", "/housednpcs"])
+
+    response: Dict[str, Any] = {"api_up": any(v is not None for v in [chests, houses, housed_npcs])}
+
     parsed_chests = _extract_dict_list(chests, ["chests", "data", "list"])
     if parsed_chests:
         world_chests.set(float(len(parsed_chests)))
         totals: Dict[str, float] = {}
         chest_pairs: List[Tuple[str, str, float]] = []
 
+        contents: Dict[str, Dict[str, Any]] = {}
         for chest in parsed_chests:
-            chest_id = str(chest.get("id") or chest.get("index") or chest.get("name") or "unknown")
+            x, y = _chest_position(chest)
+            chest_id = _chest_key(x, y, str(chest.get("id") or chest.get("index") or chest.get("name") or "unknown"))
+            entry = contents.setdefault(chest_id, {"x": x, "y": y, "items": {}})
             for item in _chest_items(chest):
                 item_name = _item_name(item)
                 amount = _item_amount(item)
@@ -561,6 +1654,8 @@ def _update_from_api() -> Dict[str, Any]:
                     continue
                 chest_pairs.append((chest_id, item_name, amount))
                 totals[item_name] = totals.get(item_name, 0.0) + amount
+                entry["items"][item_name] = entry["items"].get(item_name, 0.0) + amount
+        response["chests"] = contents
 
         chest_pairs.sort(key=lambda x: x[2], reverse=True)
         for chest_id, item_name, amount in chest_pairs[:CHEST_ITEM_SERIES_LIMIT]:
@@ -579,49 +1674,62 @@ def _update_from_api() -> Dict[str, Any]:
             nname = _normalize_name(npc.get("name") or npc.get("npcName") or npc.get("type") or "unknown")
             world_housed_npc.labels(npc=nname).set(1)
 
-    if runtime_points > 0:
-        world_runtime_up.set(1)
-        response["runtime_world_up"] = True
-
     return response
 
 
-def _update_from_world_file() -> Dict[str, Any]:
-    response: Dict[str, Any] = {"snapshot_up": False}
-    if World is None or not WORLD_FILE_PATH:
-        return response
+def _world_file_stat() -> Optional[Tuple[float, int]]:
+    world_file = _target().world_file
+    if not world_file:
+        return None
 
-    world_file = Path(WORLD_FILE_PATH)
-    if not world_file.exists() or not world_file.is_file():
-        return response
+    def stat_live() -> Optional[List[Any]]:
+        try:
+            stat = os.stat(world_file)
+        except OSError:
+            return None
+        return [stat.st_mtime, stat.st_size] if stat.st_size > 0 else None
 
-    try:
-        stat = world_file.stat()
-        world_snapshot_mtime.set(float(stat.st_mtime))
-        world_snapshot_age_seconds.set(max(0.0, time.time() - float(stat.st_mtime)))
-    except Exception:
-        pass
+    stat = _recorded("stat", world_file, stat_live)
+    return (float(stat[0]), int(stat[1])) if stat else None
 
-    try:
-        world = World.create_from_file(str(world_file))
-    except NotImplementedError:
-        world_parser_unsupported.set(1)
-        return response
-    except Exception:
-        return response
 
-    world_parser_up.set(1)
-    response["snapshot_up"] = True
+def read_wld_size(path: str) -> Tuple[int, int]:
+    with open(path, "rb") as handle:
+        data = handle.read(64 * 1024)
+        try:
+            header = read_wld_header(data)
+        except struct.error:
+            # A header longer than the first read (a very long world name) is fetched in full.
+            header = read_wld_header(data + handle.read())
+    return header["width"], header["height"]
+
+
+def _world_source_path() -> str:
+    path = _target().world_file
+    if _replay is not None:
+        if not _replay.world_path:
+            raise FileNotFoundError("capture has no world file")
+        return _replay.world_path
+    if _recorder is not None and _recorder.world_bytes is None:
+        _recorder.world_bytes = Path(path).read_bytes()
+    return path
 
-    world_hardmode.set(1 if bool(getattr(world, "is_hardmode", False)) else 0)
 
+def _load_world() -> Any:
+    return World.create_from_file(_world_source_path())
+
+
+def _summarize_world(world: Any) -> Dict[str, Any]:
     chests = list(getattr(world, "chests", []) or [])
-    world_chests.set(float(len(chests)))
 
     item_totals: Dict[str, float] = {}
     chest_pairs: List[Tuple[str, str, float]] = []
+    chest_contents: Dict[str, Dict[str, Any]] = {}
     for index, chest in enumerate(chests):
-        chest_label = str(index)
+        position = getattr(chest, "position", None)
+        x, y = getattr(position, "x", None), getattr(position, "y", None)
+        chest_label = _chest_key(x, y, str(index))
+        entry = chest_contents[chest_label] = {"x": x, "y": y, "items": {}}
         contents = list(getattr(chest, "contents", []) or [])
         for stack in contents:
             if stack is None:
@@ -635,39 +1743,701 @@ def _update_from_world_file() -> Dict[str, Any]:
 
             chest_pairs.append((chest_label, item_name, quantity))
             item_totals[item_name] = item_totals.get(item_name, 0.0) + quantity
+            entry["items"][item_name] = entry["items"].get(item_name, 0.0) + quantity
 
     chest_pairs.sort(key=lambda x: x[2], reverse=True)
-    for chest_label, item_name, quantity in chest_pairs[:CHEST_ITEM_SERIES_LIMIT]:
-        chest_item_count.labels(chest=chest_label, item=item_name).set(quantity)
-
-    for item_name, total in item_totals.items():
-        chest_item_count_by_item.labels(item=item_name).set(total)
 
     rooms = list(getattr(world, "rooms", []) or [])
-    world_houses.set(float(len(rooms)))
-
-    housed_count = 0
+    housed_npcs: List[str] = []
     npcs = list(getattr(world, "npcs", []) or [])
     for npc in npcs:
         if getattr(npc, "home", None) is None:
             continue
-        housed_count += 1
-        npc_name = str(getattr(npc, "name", "") or _normalize_name(getattr(getattr(npc, "type", None), "name", "unknown")))
-        world_housed_npc.labels(npc=npc_name).set(1)
+        housed_npcs.append(str(getattr(npc, "name", "") or _normalize_name(getattr(getattr(npc, "type", None), "name", "unknown"))))
 
+    housed_count = len(housed_npcs)
     if housed_count == 0 and rooms:
         for room in rooms:
             room_npc = getattr(room, "npc", None)
-            room_npc_name = _normalize_name(getattr(room_npc, "name", room_npc))
-            world_housed_npc.labels(npc=room_npc_name).set(1)
+            housed_npcs.append(_normalize_name(getattr(room_npc, "name", room_npc)))
         housed_count = len(rooms)
 
-    world_housed_npcs.set(float(housed_count))
+    return {
+        "hardmode": 1 if bool(getattr(world, "is_hardmode", False)) else 0,
+        "chests": len(chests),
+        "chest_pairs": chest_pairs[:CHEST_ITEM_SERIES_LIMIT],
+        "chest_contents": chest_contents,
+        "item_totals": item_totals,
+        "houses": len(rooms),
+        "housed_npcs": housed_npcs,
+        "housed_count": housed_count,
+    }
+
+
+# Tile ids from Terraria's TileID table; only the ones the tile analytics report on.
+TILE_KINDS: Dict[str, Tuple[int, ...]] = {
+    "corruption": (23, 24, 25, 32, 112, 163, 398, 400, 661),
+    "crimson": (199, 200, 201, 203, 205, 234, 352, 399, 401, 662),
+    "hallow": (109, 110, 113, 115, 116, 117, 164, 402, 403),
+    "ore_copper": (7,),
+    "ore_tin": (166,),
+    "ore_iron": (6,),
+    "ore_lead": (167,),
+    "ore_silver": (9,),
+    "ore_tungsten": (168,),
+    "ore_gold": (8,),
+    "ore_platinum": (169,),
+    "ore_demonite": (22,),
+    "ore_crimtane": (204,),
+    "ore_meteorite": (37,),
+    "ore_hellstone": (58,),
+    "ore_cobalt": (107,),
+    "ore_palladium": (221,),
+    "ore_mythril": (108,),
+    "ore_orichalcum": (222,),
+    "ore_adamantite": (111,),
+    "ore_titanium": (223,),
+    "ore_chlorophyte": (211,),
+    "ore_luminite": (408,),
+}
+TILE_NAMES: Dict[int, str] = {
+    0: "dirt", 1: "stone", 2: "grass", 3: "plants", 5: "trees", 6: "iron_ore", 7: "copper_ore", 8: "gold_ore",
+    9: "silver_ore", 19: "platforms", 21: "chests", 22: "demonite_ore", 23: "corrupt_grass", 25: "ebonstone",
+    30: "wood", 37: "meteorite", 40: "clay", 41: "blue_dungeon_brick", 43: "green_dungeon_brick",
+    44: "pink_dungeon_brick", 53: "sand", 56: "obsidian", 57: "ash", 58: "hellstone", 59: "mud",
+    60: "jungle_grass", 70: "mushroom_grass", 107: "cobalt_ore", 108: "mythril_ore", 109: "hallowed_grass",
+    111: "adamantite_ore", 112: "ebonsand", 116: "pearlsand", 117: "pearlstone", 147: "snow", 161: "ice",
+    163: "purple_ice", 164: "pink_ice", 166: "tin_ore", 167: "lead_ore", 168: "tungsten_ore", 169: "platinum_ore",
+    189: "cloud", 191: "living_wood", 192: "leaves", 199: "crimson_grass", 200: "red_ice", 202: "sunplate",
+    203: "crimstone", 204: "crimtane_ore", 211: "chlorophyte_ore", 221: "palladium_ore", 222: "orichalcum_ore",
+    223: "titanium_ore", 225: "hive", 226: "lihzahrd_brick", 234: "crimsand", 367: "marble", 368: "granite",
+    396: "sandstone", 397: "hardened_sand", 398: "corrupt_hardened_sand", 399: "crimson_hardened_sand",
+    400: "corrupt_sandstone", 401: "crimson_sandstone", 402: "hallow_hardened_sand", 403: "hallow_sandstone",
+    408: "luminite_ore",
+}
+LIQUID_NAMES = ("none", "water", "lava", "honey", "shimmer")
+NO_TILE = 0xFFFF
+TILE_CHUNK = 256
+TILE_ATTRIBUTES = {"types": "<u2", "walls": "<u2", "liquids": "u1"}
+# Longest tile record: three flag bytes, coating, 16-bit tile, frame, paint, wall, wall paint, liquid,
+# wall high byte and a 16-bit run length.
+TILE_RECORD_MAX = 17
+TILE_DECODE_BLOCK = 4096
+TILE_DECODE_CHUNK = 1 << 16
+
+
+class _WldCursor:
+    def __init__(self, data: bytes, pos: int = 0) -> None:
+        self.data = data
+        self.pos = pos
+
+    def unpack(self, fmt: str) -> Tuple[Any, ...]:
+        values = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return values
+
+    def byte(self) -> int:
+        return self.unpack("<B")[0]
+
+    def boolean(self) -> bool:
+        return self.unpack("<?")[0]
+
+    def int32(self) -> int:
+        return self.unpack("<i")[0]
+
+    def string(self) -> str:
+        # .NET BinaryWriter strings carry a 7-bit encoded length prefix.
+        length = 0
+        shift = 0
+        while True:
+            part = self.byte()
+            length |= (part & 0x7F) << shift
+            shift += 7
+            if not part & 0x80:
+                break
+        value = self.data[self.pos : self.pos + length].decode("utf-8", errors="replace")
+        self.pos += length
+        return value
+
+
+def read_wld_header(data: bytes) -> Dict[str, Any]:
+    cursor = _WldCursor(data)
+    version = cursor.int32()
+    if version < 140:
+        raise NotImplementedError(f"unsupported .wld version {version}")
+    magic = cursor.unpack("<7sB")
+    if magic[0] != b"relogic":
+        raise ValueError("not a Terraria world file")
+    cursor.unpack("<IQ")  # revision, favorite flags
+    sections = list(cursor.unpack(f"<{cursor.unpack('<h')[0]}i"))
+
+    important: List[bool] = []
+    bits = 0
+    for index in range(cursor.unpack("<h")[0]):
+        if index % 8 == 0:
+            bits = cursor.byte()
+        important.append(bool(bits & (1 << (index % 8))))
+
+    cursor.pos = sections[0]
+    name = cursor.string()
+    seed = ""
+    if version >= 179:
+        seed = str(cursor.int32()) if version == 179 else cursor.string()
+        cursor.unpack("<Q")  # generator version
+    if version >= 181:
+        cursor.pos += 16  # unique id
+    cursor.unpack("<5i")  # world id and pixel bounds
+    height, width = cursor.unpack("<2i")
+
+    game_mode = 0
+    if version >= 209:
+        game_mode = cursor.int32()
+        cursor.pos += sum(1 for flag_version in (222, 227, 238, 239, 241, 249, 266, 267) if version >= flag_version)
+    else:
+        if version >= 112 and cursor.boolean():
+            game_mode = 1
+        if version == 208 and cursor.boolean():
+            game_mode = 2
+    if version >= 141:
+        cursor.unpack("<q")  # creation time
+    cursor.byte()  # moon type
+    cursor.unpack("<7i7i3i2i")  # tree/cave styles, ice/jungle/hell styles, spawn
+    cursor.unpack("<3d")  # surface, rock layer, time
+    cursor.unpack("<?i??2i")  # day time, moon phase, blood moon, eclipse, dungeon
+    crimson = cursor.boolean()
+    cursor.pos += 10 + (1 if version >= 118 else 0) + 7  # boss and NPC progression flags
+    cursor.unpack("<??Bi")  # shadow orbs, meteor, orb count, altar count
+    hardmode = cursor.boolean()
+
+    return {
+        "version": version,
+        "name": name,
+        "seed": seed,
+        "width": width,
+        "height": height,
+        "game_mode": game_mode,
+        "crimson": crimson,
+        "hardmode": hardmode,
+        "sections": sections,
+        "important": important,
+    }
+
+
+def _tile_layout(buf: Any, lo: int, hi: int, important: Any, layout: Dict[str, Any]) -> None:
+    """Where each field would sit if a tile record started at every offset in [lo, hi)."""
+    # Reads are shifted slices, never gathers; has4 implies has3 implies has2, so uint8 deltas pick the
+    # byte at the tile offset (wraparound cancels out).
+    b = [buf[lo + k : hi + k] for k in range(6)]
+    flags1 = b[0]
+    has2 = flags1 & 1
+    has3 = b[1] & has2
+    flags3 = b[2] * has3
+    steps = (has2, has3, flags3 & 1)
+    tile_at = 1 + has2 + has3 + steps[2]
+    active = (flags1 >> 1) & 1
+    wide = (flags1 >> 5) & active
+    low = b[1] + sum((b[k + 2] - b[k + 1]) * step for k, step in enumerate(steps))
+    high = b[2] + sum((b[k + 3] - b[k + 2]) * step for k, step in enumerate(steps))
+    tile = low.astype(np.uint16) | (high * wide).astype(np.uint16) << 8
+    wall_at = tile_at + active + wide + ((important[tile] & active) << 2) + ((flags3 >> 3) & active)
+    has_wall = (flags1 >> 2) & 1
+    has_liquid = ((flags1 >> 3) | (flags1 >> 4)) & 1
+    count_at = wall_at + has_wall + ((flags3 >> 4) & has_wall) + has_liquid + ((flags3 >> 6) & 1)
+    layout["flags3"][lo:hi] = flags3
+    layout["tile_at"][lo:hi] = tile_at
+    layout["wall_at"][lo:hi] = wall_at
+    layout["count_at"][lo:hi] = count_at
+    layout["length"][lo:hi] = count_at + np.minimum(flags1 >> 6, 2)
+
+
+def _tile_fields(buf: Any, layout: Dict[str, Any], pos: Any, types: Any, walls: Any, liquids: Any, runs: Any) -> None:
+    flags1 = buf[pos]
+    flags3 = layout["flags3"][pos]
+    at = pos + layout["tile_at"][pos]
+    types[:] = buf[at]
+    types |= (buf[at + 1] * ((flags1 >> 5) & 1)).astype(np.uint16) << 8
+    types[(flags1 & 2) == 0] = NO_TILE
+    at = pos + layout["wall_at"][pos]
+    walls[:] = buf[at] * ((flags1 >> 2) & 1)
+    at = pos + layout["count_at"][pos]
+    walls |= (buf[at - 1] * ((flags3 >> 6) & 1)).astype(np.uint16) << 8
+    liquids[:] = (flags1 >> 3) & 3
+    liquids[(liquids != 0) & ((flags3 & 0x80) != 0)] = 4
+    repeat = flags1 >> 6
+    runs[:] = buf[at] * (repeat >= 1)
+    runs |= (buf[at + 1] * (repeat >= 2)).astype(np.uint32) << 8
+    runs += 1
+
+
+def read_wld_tiles(data: bytes, header: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Decode the tile section into run-length columns (one entry per stored tile run)."""
+    header = header or read_wld_header(data)
+    width = header["width"]
+    height = header["height"]
+    sections = header["sections"]
+    start = sections[1]
+    end = sections[2] if len(sections) > 2 and sections[2] > start else len(data)
+    size = max(0, min(end, len(data)) - start)
+    padded = size + 2 * TILE_RECORD_MAX
+    buf = np.zeros(padded, dtype=np.uint8)
+    buf[:size] = np.frombuffer(data, dtype=np.uint8, count=size, offset=start)
+    important = np.zeros(NO_TILE + 1, dtype=np.uint8)
+    important[: len(header["important"])] = header["important"]
+
+    # Small chunks keep the uint8 temporaries in cache.
+    layout = {name: np.empty(padded, dtype=np.uint8) for name in ("flags3", "tile_at", "wall_at", "count_at", "length")}
+    for lo in range(0, size, TILE_DECODE_CHUNK):
+        _tile_layout(buf, lo, min(size, lo + TILE_DECODE_CHUNK), important, layout)
+    lengths = layout["length"]
+
+    # Records form a single chain. The section is cut into blocks, and each block is walked in lockstep from
+    # every offset a record could straddle into it; chaining the block exits then picks the real entries.
+    lows = np.arange(0, size, TILE_DECODE_BLOCK, dtype=np.int64)
+    highs = np.minimum(lows + TILE_DECODE_BLOCK, size)
+    walkers = (lows[:, None] + np.arange(TILE_RECORD_MAX)).ravel()
+    limits = np.repeat(highs, TILE_RECORD_MAX)
+    for _ in range(TILE_RECORD_MAX):
+        walkers += lengths[walkers] * (walkers < limits)
+    # Most entries of a block land on the same record within a few steps and share the rest of the walk.
+    keys, shared = np.unique(np.repeat(np.arange(len(lows)), TILE_RECORD_MAX) * padded + walkers, return_inverse=True)
+    walkers = keys % padded
+    limits = highs[keys // padded]
+    while True:
+        moving = walkers < limits
+        if not moving.any():
+            break
+        walkers += lengths[walkers] * moving
+    exits = (walkers - limits)[shared].reshape(len(lows), TILE_RECORD_MAX).tolist()
+    entries = [0] * len(lows)
+    for index in range(1, len(lows)):
+        entries[index] = exits[index - 1][entries[index - 1]]
+
+    # A walker that reached its limit sits on the next block's first record, so marking it again is harmless.
+    starts = np.zeros(padded, dtype=bool)
+    walkers = lows + np.array(entries, dtype=np.int64)
+    while True:
+        moving = walkers < highs
+        if not moving.any():
+            break
+        starts[walkers] = True
+        walkers += lengths[walkers] * moving
+    pos = np.flatnonzero(starts[:size])
+    del starts, lengths
+
+    count = len(pos)
+    types = np.empty(count, dtype=np.uint16)
+    walls = np.empty(count, dtype=np.uint16)
+    liquids = np.empty(count, dtype=np.uint8)
+    runs = np.empty(count, dtype=np.uint32)
+    for lo in range(0, count, TILE_DECODE_CHUNK):
+        hi = min(count, lo + TILE_DECODE_CHUNK)
+        _tile_fields(buf, layout, pos[lo:hi], types[lo:hi], walls[lo:hi], liquids[lo:hi], runs[lo:hi])
+
+    # The section end is only a bound; the grid ends after exactly width * height tiles.
+    total = np.cumsum(runs, dtype=np.int64)
+    kept = int(np.searchsorted(total, width * height)) + 1
+    if kept > count or total[kept - 1] != width * height:
+        raise ValueError("tile section does not match the world size")
+    return {
+        "width": width,
+        "height": height,
+        "types": types[:kept],
+        "walls": walls[:kept],
+        "liquids": liquids[:kept],
+        "runs": runs[:kept],
+    }
+
+
+def analyze_tiles(tiles: Dict[str, Any]) -> Dict[str, Any]:
+    runs = tiles["runs"].astype(np.int64)
+    types = tiles["types"]
+    active = types != NO_TILE
+    # Histograms are weighted by run length, so the grid itself is never expanded.
+    blocks = np.bincount(types[active], weights=runs[active], minlength=NO_TILE).astype(np.int64)
+    liquids = np.bincount(tiles["liquids"], weights=runs, minlength=len(LIQUID_NAMES)).astype(np.int64)
+
+    kinds = {kind: int(blocks[list(ids)].sum()) for kind, ids in TILE_KINDS.items()}
+    kinds["solid"] = int(blocks.sum())
+    kinds["empty"] = int(tiles["width"]) * int(tiles["height"]) - kinds["solid"]
+    kinds["wall"] = int(runs[tiles["walls"] != 0].sum())
+    for index, liquid in enumerate(LIQUID_NAMES[1:], start=1):
+        kinds[f"liquid_{liquid}"] = int(liquids[index])
+
+    top = np.argsort(blocks)[::-1][:TILE_TOP_BLOCKS]
+    return {
+        "kinds": kinds,
+        "blocks": [(TILE_NAMES.get(int(tile), f"tile_{int(tile)}"), int(blocks[tile])) for tile in top if blocks[tile] > 0],
+    }
+
+
+class TileStore:
+    """Columnar copy of the last world save: one memory-mapped .npy per attribute, chunk-major."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.lock = threading.Lock()
+        self.generation: Optional[str] = None
+        self.manifest: Dict[str, Any] = {}
+        self.arrays: Dict[str, Any] = {}
+
+    def is_current(self, key: Any) -> bool:
+        loaded = self.load()
+        return loaded is not None and loaded[0].get("key") == [key[1], key[2]]
+
+    def write(self, tiles: Dict[str, Any], key: Any) -> None:
+        width, height = tiles["width"], tiles["height"]
+        size = TILE_CHUNK
+        chunks_x, chunks_y = -(-width // size), -(-height // size)
+        generation = f"{time.time_ns():x}"
+        staging = self.root / f".staging-{generation}"
+        staging.mkdir(parents=True)
+
+        outputs = {}
+        for attr, dtype in TILE_ATTRIBUTES.items():
+            # Runs are stored column by column, so repeating them rebuilds the x-major grid.
+            grid = np.repeat(tiles[attr], tiles["runs"]).reshape(width, height)
+            out = np.lib.format.open_memmap(staging / f"{attr}.npy", mode="w+", dtype=dtype, shape=(chunks_x, chunks_y, size, size))
+            for cx in range(chunks_x):
+                strip = grid[cx * size : (cx + 1) * size]
+                for cy in range(chunks_y):
+                    block = strip[:, cy * size : (cy + 1) * size]
+                    out[cx, cy, : block.shape[0], : block.shape[1]] = block
+            outputs[attr] = out
+            del grid
+
+        hashes = []
+        for cx in range(chunks_x):
+            column = []
+            for cy in range(chunks_y):
+                digest = hashlib.blake2b(digest_size=8)
+                for out in outputs.values():
+                    digest.update(out[cx, cy])
+                column.append(digest.hexdigest())
+            hashes.append(column)
+        for out in outputs.values():
+            out.flush()
+        outputs.clear()
+
+        manifest = {
+            "generation": generation,
+            "key": [key[1], key[2]],
+            "width": width,
+            "height": height,
+            "chunk": size,
+            "chunks_x": chunks_x,
+            "chunks_y": chunks_y,
+            "attributes": TILE_ATTRIBUTES,
+            "hashes": hashes,
+        }
+        (staging / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+        os.rename(staging, self.root / generation)
+        pointer = self.root / ".current.tmp"
+        pointer.write_text(generation, encoding="utf-8")
+        os.replace(pointer, self.root / "current")
+
+        # Keep the previous generation for readers that resolved it just before the swap.
+        generations = sorted(path.name for path in self.root.iterdir() if path.is_dir() and not path.name.startswith("."))
+        for old in generations[:-2]:
+            for item in (self.root / old).iterdir():
+                item.unlink()
+            (self.root / old).rmdir()
+
+    def load(self) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        try:
+            generation = (self.root / "current").read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        with self.lock:
+            if generation != self.generation:
+                folder = self.root / generation
+                manifest = json.loads((folder / "manifest.json").read_text(encoding="utf-8"))
+                self.arrays = {attr: np.load(folder / f"{attr}.npy", mmap_mode="r") for attr in manifest["attributes"]}
+                self.manifest = manifest
+                self.generation = generation
+            return self.manifest, self.arrays
+
+    def region(self, x: int, y: int, w: int, h: int, attrs: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Return {attr: (w, h) array} for a rectangle clipped to the world, or None when nothing is stored."""
+        loaded = self.load()
+        if loaded is None:
+            return None
+        manifest, arrays = loaded
+        size = manifest["chunk"]
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(manifest["width"], x + w), min(manifest["height"], y + h)
+        if x1 <= x0 or y1 <= y0:
+            return {attr: arrays[attr][0, 0, :0, :0] for attr in attrs or arrays}
+
+        result = {}
+        for attr in attrs or list(arrays):
+            source = arrays[attr]
+            if x0 // size == (x1 - 1) // size and y0 // size == (y1 - 1) // size:
+                # Inside one chunk the answer is a view straight into the mapped file.
+                result[attr] = source[x0 // size, y0 // size, x0 % size : x0 % size + x1 - x0, y0 % size : y0 % size + y1 - y0]
+                continue
+            out = np.empty((x1 - x0, y1 - y0), dtype=source.dtype)
+            for cx in range(x0 // size, (x1 - 1) // size + 1):
+                for cy in range(y0 // size, (y1 - 1) // size + 1):
+                    left, top = max(x0, cx * size), max(y0, cy * size)
+                    right, bottom = min(x1, (cx + 1) * size), min(y1, (cy + 1) * size)
+                    out[left - x0 : right - x0, top - y0 : bottom - y0] = source[
+                        cx, cy, left - cx * size : right - cx * size, top - cy * size : bottom - cy * size
+                    ]
+            result[attr] = out
+        return result
+
+
+tile_stores: Dict[str, TileStore] = {}
+
+
+class PositionHeatmap:
+    """Time-decayed player samples per HEATMAP_CELL_TILES square, on a grid sized from the .wld header."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.world: Tuple[int, int] = HEATMAP_WORLD_SIZE
+        self.grid = self._empty(self.world)
+        self.updated = 0.0
+        self.saved = 0.0
+        self.samples = 0
+        if path is not None:
+            try:
+                with np.load(path) as stored:
+                    world = tuple(int(v) for v in stored["world"]) if "world" in stored.files else HEATMAP_WORLD_SIZE
+                    if stored["grid"].shape == self._empty(world).shape and int(stored["cell"]) == HEATMAP_CELL_TILES:
+                        self.world = world
+                        self.grid = stored["grid"].astype(np.float64)
+                        self.updated = float(stored["updated"])
+                        self.samples = int(stored["samples"])
+            except (OSError, KeyError, ValueError):
+                pass
+
+    @staticmethod
+    def _empty(world: Tuple[int, int]) -> Any:
+        width, height = world
+        return np.zeros((-(-width // HEATMAP_CELL_TILES), -(-height // HEATMAP_CELL_TILES)), dtype=np.float64)
+
+    def resize(self, width: int, height: int, now: float) -> None:
+        # Cells of another world say nothing about this one, so a new size starts an empty grid.
+        if (width, height) == self.world:
+            return
+        with self.lock:
+            previous, self.world = self.world, (width, height)
+            self.grid = self._empty(self.world)
+            self.updated = 0.0
+            self.samples = 0
+        print(f"[exporter] world size changed from {previous[0]}x{previous[1]} to {width}x{height}; heatmap reset", file=sys.stderr)
+        if self.path is not None:
+            self.save(now)
+
+    def sample(self, positions: List[Tuple[int, int]], now: float) -> None:
+        with self.lock:
+            if self.updated:
+                self.grid *= 0.5 ** (max(0.0, now - self.updated) / (HEATMAP_HALF_LIFE_HOURS * 3600.0))
+            self.updated = now
+            if positions:
+                cells = np.array(positions, dtype=np.int64) // HEATMAP_CELL_TILES
+                cx = np.clip(cells[:, 0], 0, self.grid.shape[0] - 1)
+                cy = np.clip(cells[:, 1], 0, self.grid.shape[1] - 1)
+                np.add.at(self.grid, (cx, cy), 1.0)
+                self.samples += len(positions)
+        if self.path is not None and now - self.saved >= HEATMAP_PERSIST_INTERVAL:
+            self.save(now)
+
+    def save(self, now: float) -> None:
+        with self.lock:
+            grid = self.grid.astype(np.float32)
+            updated, samples, world = self.updated, self.samples, self.world
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as handle:
+            np.savez(handle, grid=grid, cell=HEATMAP_CELL_TILES, world=world, updated=updated, samples=samples)
+        os.replace(tmp, self.path)
+        self.saved = now
+
+    def document(self) -> Dict[str, Any]:
+        with self.lock:
+            grid = self.grid.copy()
+            updated, samples, world = self.updated, self.samples, self.world
+        peak = float(grid.max()) if grid.size else 0.0
+        # Sparse [x, y, weight] cells; anything under 0.1% of the peak is noise after decay.
+        cx, cy = np.nonzero(grid > peak * 1e-3) if peak > 0 else (np.array([], dtype=int), np.array([], dtype=int))
+        return {
+            "cell_tiles": HEATMAP_CELL_TILES,
+            "world_width": world[0],
+            "world_height": world[1],
+            "columns": grid.shape[0],
+            "rows": grid.shape[1],
+            "half_life_hours": HEATMAP_HALF_LIFE_HOURS,
+            "updated_at": updated,
+            "samples": samples,
+            "peak": round(peak, 4),
+            "cells": [[int(x), int(y), round(float(grid[x, y]), 4)] for x, y in zip(cx, cy)],
+        }
+
+    def image(self) -> bytes:
+        with self.lock:
+            grid = self.grid.copy()
+        peak = float(grid.max()) if grid.size else 0.0
+        level = np.sqrt(grid / peak) if peak > 0 else grid
+        index = (level * 255).astype(np.uint8).T
+        ramp = np.arange(256, dtype=np.float64) / 255
+        # Transparent -> red -> yellow -> white, so the PNG can be laid over the world map.
+        lut = np.stack(
+            [np.clip(ramp * 3, 0, 1), np.clip(ramp * 3 - 1, 0, 1), np.clip(ramp * 3 - 2, 0, 1), np.sqrt(ramp)], axis=1
+        )
+        return _encode_png((lut[index] * 255).astype(np.uint8))
+
+
+def _encode_png(rgba: Any) -> bytes:
+    height, width = rgba.shape[:2]
+    rows = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    rows[:, 1:] = rgba.reshape(height, width * 4)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)) + chunk(b"IEND", b"")
+
+
+heatmaps: Dict[str, PositionHeatmap] = {}
+chest_indexes: Dict[str, ChestIndex] = {}
+histories: Dict[str, HistoryStore] = {}
+
+
+def _for_server(items: Dict[str, Any], server: str) -> Any:
+    if not server and len(items) == 1:
+        return next(iter(items.values()))
+    return items.get(server or "default")
+
+
+class TileAnalytics:
+    def __init__(self) -> None:
+        # One worker: a new save queues behind the current pass and stale passes are skipped.
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tile-analytics")
+
+    @staticmethod
+    def enabled() -> bool:
+        return np is not None and (ENABLE_TILE_ANALYTICS or bool(TILE_STORE_DIR))
+
+    def _run(self, state: Dict[str, Any], path: str, key: Any, store: Optional[TileStore]) -> None:
+        if state["key"] != key:
+            return
+        started = time.perf_counter()
+        try:
+            tiles = read_wld_tiles(Path(path).read_bytes())
+            if ENABLE_TILE_ANALYTICS:
+                result = analyze_tiles(tiles)
+                result.update({"key": key, "seconds": time.perf_counter() - started})
+                state["tiles"] = result
+            if store is not None and not store.is_current(key):
+                store.write(tiles, key)
+        except Exception as exc:
+            print(f"[exporter] tile analytics failed for {path}: {exc}", file=sys.stderr)
+
+    def submit(self, state: Dict[str, Any], path: str, key: Any, store: Optional[TileStore] = None) -> None:
+        if not self.enabled():
+            return
+        if _replay is not None or _recorder is not None:
+            # Capture and replay stay deterministic by analysing inline.
+            self._run(state, path, key, store)
+            return
+        self.pool.submit(self._run, state, path, key, store)
+
+
+tile_analytics = TileAnalytics()
+
+
+def _apply_tile_analytics(state: Dict[str, Any]) -> None:
+    tiles = state.get("tiles")
+    if not tiles:
+        return
+    for kind, count in tiles["kinds"].items():
+        world_tiles.labels(kind=kind).set(count)
+    for block, count in tiles["blocks"]:
+        world_block_tiles.labels(block=block).set(count)
+    world_tiles_analysis_seconds.set(tiles["seconds"])
+
+
+def _update_from_world_file() -> Dict[str, Any]:
+    response: Dict[str, Any] = {"snapshot_up": False, "changed": False}
+    if World is None and not tile_analytics.enabled() and _target().heatmap is None:
+        return response
+
+    stat = _world_file_stat()
+    if stat is None:
+        return response
+
+    # The .wld only changes on world saves; reuse the last summary until mtime/size move.
+    state = _target().world_state
+    key = (_target().world_file, stat[0], stat[1])
+    if key != state["key"]:
+        summary: Optional[Dict[str, Any]] = None
+        unsupported = False
+        if World is not None:
+            try:
+                summary = _summarize_world(_load_world())
+            except NotImplementedError:
+                unsupported = True
+            except Exception:
+                pass
+        state.update({"key": key, "summary": summary, "unsupported": unsupported})
+        response["changed"] = True
+        heatmap = _target().heatmap
+        if heatmap is not None:
+            try:
+                heatmap.resize(*read_wld_size(_world_source_path()), _now())
+            except (OSError, struct.error, ValueError, NotImplementedError) as exc:
+                print(f"[exporter] heatmap keeps {heatmap.world[0]}x{heatmap.world[1]}; world header unreadable: {exc}", file=sys.stderr)
+        try:
+            tile_analytics.submit(state, _world_source_path(), key, _target().tile_store)
+        except OSError:
+            pass
+
+    _apply_tile_analytics(state)
+
+    if state["unsupported"]:
+        world_parser_unsupported.set(1)
+
+    summary = state["summary"]
+    if summary is None:
+        return response
+
+    world_parser_up.set(1)
+    response["snapshot_up"] = True
+
+    world_chests.set(float(summary["chests"]))
+    for chest_label, item_name, quantity in summary["chest_pairs"]:
+        chest_item_count.labels(chest=chest_label, item=item_name).set(quantity)
+    for item_name, total in summary["item_totals"].items():
+        chest_item_count_by_item.labels(item=item_name).set(total)
+
+    world_houses.set(float(summary["houses"]))
+    for npc_name in summary["housed_npcs"]:
+        world_housed_npc.labels(npc=npc_name).set(1)
+    world_housed_npcs.set(float(summary["housed_count"]))
     return response
 
 
+def _apply_world_file_runtime() -> None:
+    stat = _world_file_stat()
+    if stat is not None:
+        world_snapshot_mtime.set(stat[0])
+        world_snapshot_age_seconds.set(max(0.0, _now() - stat[0]))
+
+    summary = _target().world_state["summary"]
+    if summary is not None:
+        world_hardmode.set(summary["hardmode"])
+
+
 def _apply_log_fallback(tracker: KubernetesLogTracker, api_data: Dict[str, Any]) -> None:
     result = tracker.parse()
+    if tracker.watermark:
+        join_latency.load(tracker.join_latency)
+        world_save_duration.load(tracker.save_duration)
+        log_rule_metrics.load(tracker.rule_series)
     if not result.get("ok"):
         return
 
@@ -699,19 +2469,19 @@ def _apply_log_fallback(tracker: KubernetesLogTracker, api_data: Dict[str, Any])
         world_runtime_up.set(1)
 
 
-def scrape_once(tracker: KubernetesLogTracker) -> None:
-    _reset_metrics()
+def scrape_runtime(tracker: KubernetesLogTracker, player_details: Optional[PlayerDetailFetcher] = None) -> None:
+    _reset_runtime_metrics()
 
     api_data: Dict[str, Any] = {}
     try:
-        api_data = _update_from_api()
+        api_data = _update_from_api(player_details)
     except Exception:
         source_up.set(0)
 
     try:
-        _update_from_world_file()
+        _apply_world_file_runtime()
     except Exception:
-        world_parser_up.set(0)
+        pass
 
     if (api_data or {}).get("players_max") is None:
         max_from_config = _read_max_players_from_config()
@@ -727,12 +2497,608 @@ def scrape_once(tracker: KubernetesLogTracker) -> None:
         log_tracker_up.set(0)
 
 
+def scrape_world() -> None:
+    _reset_world_metrics()
+
+    api_data: Dict[str, Any] = {}
+    try:
+        api_data = _update_world_from_api()
+    except Exception:
+        pass
+
+    try:
+        _update_from_world_file()
+    except Exception:
+        world_parser_up.set(0)
+
+    # The live API listing wins; otherwise fall back to the last parsed save.
+    summary = _target().world_state["summary"]
+    chests = api_data.get("chests") or (summary or {}).get("chest_contents")
+    if chests:
+        _target().chest_index.update(chests)
+    if _target().history is not None:
+        try:
+            _target().history.record(_now(), chests or {}, _target().inventories)
+        except sqlite3.Error as exc:
+            print(f"[exporter] history write failed: {exc}", file=sys.stderr)
+
+
+def scrape_once(tracker: KubernetesLogTracker, player_details: Optional[PlayerDetailFetcher] = None) -> None:
+    scrape_world()
+    scrape_runtime(tracker, player_details)
+
+
+class PublishedDocument:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.body = b""
+        self.body_gzip = b""
+        self.etag = '""'
+        # published_at moves on every store; changed_at only when the content does, which is what Last-Modified means.
+        self.published_at = 0.0
+        self.changed_at = 0.0
+
+    def store(self, body: bytes) -> None:
+        body_gzip = gzip.compress(body, compresslevel=6, mtime=0)
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        now = time.time()
+        with self.lock:
+            if etag != self.etag:
+                self.changed_at = now
+            self.published_at = now
+            self.body = body
+            self.body_gzip = body_gzip
+            self.etag = etag
+
+    def get(self) -> Tuple[bytes, bytes, str, float]:
+        with self.lock:
+            return self.body, self.body_gzip, self.etag, self.changed_at
+
+    def times(self) -> Tuple[float, float]:
+        with self.lock:
+            return self.published_at, self.changed_at
+
+
+class PublishedMetrics(PublishedDocument):
+    def __init__(self, registry: Any) -> None:
+        super().__init__()
+        self.registry = registry
+
+    def publish(self) -> None:
+        self.store(generate_latest(self.registry))
+
+
+class TargetFamilies:
+    def __init__(self, registry: CollectorRegistry, kind: str, label: bool) -> None:
+        self.registry = registry
+        self.kind = kind
+        self.label = label
+        self.lock = threading.Lock()
+        self.targets: List[ScrapeTarget] = []
+
+    def set_targets(self, targets: List[ScrapeTarget]) -> None:
+        with self.lock:
+            for target in self.targets:
+                if target not in targets:
+                    target.families.pop(self.kind, None)
+            self.targets = list(targets)
+
+    def capture(self, target: ScrapeTarget) -> None:
+        target.families[self.kind] = [family for family in self.registry.collect() if family.name.startswith("terraria_")]
+
+    def collect(self) -> Any:
+        for family in self.registry.collect():
+            if not family.name.startswith("terraria_"):
+                yield family
+
+        merged: Dict[str, Metric] = {}
+        with self.lock:
+            targets = list(self.targets)
+        for target in targets:
+            for family in target.families.get(self.kind, []):
+                out = merged.get(family.name)
+                if out is None:
+                    out = merged[family.name] = Metric(family.name, family.documentation, family.type, family.unit)
+                if self.label:
+                    out.samples.extend(s._replace(labels={**s.labels, "server": target.name}) for s in family.samples)
+                else:
+                    out.samples.extend(family.samples)
+        yield from merged.values()
+
+
+published_runtime = PublishedMetrics(RUNTIME_REGISTRY)
+published_world = PublishedMetrics(WORLD_REGISTRY)
+published_snapshot = PublishedDocument()
+
+
+def _published_samples(body: bytes) -> Dict[str, List[Tuple[Dict[str, str], float]]]:
+    samples: Dict[str, List[Tuple[Dict[str, str], float]]] = {}
+    for family in text_string_to_metric_families(body.decode("utf-8")):
+        for sample in family.samples:
+            samples.setdefault(sample.name, []).append((sample.labels, sample.value))
+    return samples
+
+
+def _build_snapshot_document() -> Dict[str, Any]:
+    runtime_body = published_runtime.get()[0]
+    world_body = published_world.get()[0]
+    runtime_at, runtime_changed_at = published_runtime.times()
+    world_changed_at = published_world.times()[1]
+    # Built from the published exposition, never from live gauges, so it matches what Prometheus sees.
+    samples = _published_samples(runtime_body)
+    samples.update(_published_samples(world_body))
+
+    def value(name: str) -> Optional[float]:
+        entries = samples.get(name)
+        return entries[0][1] if entries else None
+
+    def by_label(name: str, label: str) -> Dict[str, float]:
+        return {labels.get(label, ""): sample for labels, sample in samples.get(name, [])}
+
+    health = by_label("terraria_player_health", "player")
+    mana = by_label("terraria_player_mana", "player")
+    deaths = by_label("terraria_player_deaths_total", "player")
+    players = [
+        {"name": name, "health": health.get(name), "mana": mana.get(name), "deaths": deaths.get(name)}
+        for name in sorted(set(health) | set(mana) | set(deaths))
+    ]
+    top_items = sorted(by_label("terraria_chest_item_count_by_item", "item").items(), key=lambda x: x[1], reverse=True)
+    world_mtime = value("terraria_world_snapshot_mtime_seconds") or 0.0
+
+    metrics = {
+        "source_up": value("terraria_exporter_source_up"),
+        "world_parser_up": value("terraria_world_parser_up"),
+        "players_online": value("terraria_players_online"),
+        "players_max": value("terraria_players_max"),
+        "hardmode": value("terraria_world_hardmode"),
+        "blood_moon": value("terraria_world_blood_moon"),
+        "eclipse": value("terraria_world_eclipse"),
+        "world_time": value("terraria_world_time"),
+        "chests_total": value("terraria_world_chests_total"),
+        "houses_total": value("terraria_world_houses_total"),
+        "housed_npcs_total": value("terraria_world_housed_npcs_total"),
+    }
+
+    return {
+        "ok": bool(runtime_at),
+        "metrics": metrics,
+        "sources": {
+            "api_up": value("terraria_exporter_source_up") == 1,
+            "world_runtime_up": value("terraria_world_runtime_up") == 1,
+            "log_tracker_up": value("terraria_log_tracker_up") == 1,
+            "world_parser_up": value("terraria_world_parser_up") == 1,
+            "world_parser_unsupported": value("terraria_world_parser_unsupported_version") == 1,
+        },
+        "runtime": {
+            "players_online": metrics["players_online"],
+            "players_online_api": value("terraria_players_online_api"),
+            "players_online_log": value("terraria_players_online_log"),
+            "players_max": metrics["players_max"],
+            "daytime": value("terraria_world_daytime"),
+            "blood_moon": metrics["blood_moon"],
+            "eclipse": metrics["eclipse"],
+            "hardmode": metrics["hardmode"],
+            "world_time": metrics["world_time"],
+            "players": players,
+            "monsters": by_label("terraria_monster_active", "monster"),
+        },
+        "world": {
+            "chests_total": metrics["chests_total"],
+            "houses_total": metrics["houses_total"],
+            "housed_npcs_total": metrics["housed_npcs_total"],
+            "housed_npcs": sorted(by_label("terraria_world_housed_npc", "npc")),
+            "top_items": [{"item": item, "count": count} for item, count in top_items[:SNAPSHOT_TOP_ITEMS]],
+        },
+        # Only absolute times that move with the content; refresh ages are sent per request (_snapshot_age_headers).
+        "times": {
+            "runtime_changed_at": runtime_changed_at or None,
+            "world_changed_at": world_changed_at or None,
+            "world_file_mtime": world_mtime or None,
+        },
+    }
+
+
+def publish_snapshot() -> None:
+    published_snapshot.store(json.dumps(_build_snapshot_document()).encode("utf-8"))
+
+
+def _snapshot_age_headers() -> Dict[str, str]:
+    now = time.time()
+    headers = {}
+    for name, published in (("Runtime", published_runtime), ("World", published_world)):
+        published_at = published.times()[0]
+        if published_at:
+            headers[f"X-{name}-Age-Seconds"] = f"{max(0.0, now - published_at):.3f}"
+    return headers
+
+
+def _published_combined() -> Tuple[bytes, bytes, str, float]:
+    runtime_body, runtime_gzip, runtime_etag, runtime_at = published_runtime.get()
+    world_body, world_gzip, world_etag, world_at = published_world.get()
+    # Concatenated gzip members are still a valid gzip stream, so neither part is recompressed.
+    etag = f'"{runtime_etag.strip(chr(34))}-{world_etag.strip(chr(34))}"'
+    return runtime_body + world_body, runtime_gzip + world_gzip, etag, max(runtime_at, world_at)
+
+
+def _not_modified(headers: Any, etag: str, published_at: float) -> bool:
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match:
+        return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+    if_modified_since = headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            return int(published_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _accepts_gzip(headers: Any) -> bool:
+    for entry in (headers.get("Accept-Encoding") or "").split(","):
+        coding, _, params = entry.strip().partition(";")
+        if coding.strip().lower() in {"gzip", "*"} and params.replace(" ", "") not in {"q=0", "q=0.0"}:
+            return True
+    return False
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        return
+
+    def send_cached(
+        self,
+        body: bytes,
+        body_gzip: bytes,
+        etag: str,
+        published_at: float,
+        content_type: str,
+        extra: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if not body:
+            return self.send_plain(503, b"no snapshot published yet\n")
+
+        headers = {
+            "Content-Type": content_type,
+            "ETag": etag,
+            "Last-Modified": formatdate(published_at, usegmt=True),
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+            **(extra or {}),
+        }
+        if _not_modified(self.headers, etag, published_at):
+            self.send_response(304)
+            for key, value in headers.items():
+                if key != "Content-Type":
+                    self.send_header(key, value)
+            self.end_headers()
+            return
+
+        payload = body
+        if body_gzip and _accepts_gzip(self.headers):
+            payload = body_gzip
+            headers["Content-Encoding"] = "gzip"
+
+        self.send_response(200)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def send_plain(self, status_code: int, body: bytes) -> None:
+        self.send_response(status_code)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def send_tiles(self, query: Dict[str, List[str]], manifest_only: bool) -> None:
+        store = _for_server(tile_stores, (query.get("server") or [""])[0])
+        loaded = store.load() if store is not None else None
+        if loaded is None:
+            return self.send_plain(503, b"no tile store published yet\n")
+        manifest = loaded[0]
+        if manifest_only:
+            etag = f'"{manifest["generation"]}"'
+            if self.headers.get("If-None-Match") == etag:
+                return self.send_body(304, b"", "application/json", etag)
+            return self.send_body(200, json.dumps(manifest).encode("utf-8"), "application/json", etag)
+
+        try:
+            x, y, w, h = (int((query.get(name) or [""])[0]) for name in ("x", "y", "w", "h"))
+        except ValueError:
+            return self.send_plain(400, b"x, y, w and h are required integers\n")
+        attrs = [attr for attr in ",".join(query.get("attrs") or []).split(",") if attr] or list(TILE_ATTRIBUTES)
+        if w <= 0 or h <= 0 or w * h > TILE_REGION_MAX_TILES or any(attr not in TILE_ATTRIBUTES for attr in attrs):
+            return self.send_plain(400, b"invalid region or attributes\n")
+
+        etag = f'"{manifest["generation"]}-{x}-{y}-{w}-{h}-{"-".join(attrs)}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self.send_body(304, b"", "application/octet-stream", etag)
+        region = store.region(x, y, w, h, attrs)
+        first = region[attrs[0]]
+        headers = {
+            "X-Tile-Region": f"{max(0, x)},{max(0, y)},{first.shape[0]},{first.shape[1]}",
+            "X-Tile-Attributes": ",".join(f"{attr}:{TILE_ATTRIBUTES[attr]}" for attr in attrs),
+        }
+        if (query.get("format") or [""])[0] == "json":
+            body = json.dumps({attr: region[attr].tolist() for attr in attrs}).encode("utf-8")
+            return self.send_body(200, body, "application/json", etag, headers)
+        # Attributes are concatenated in request order, each x-major; whole chunks go out without a copy.
+        parts = [memoryview(np.ascontiguousarray(region[attr])).cast("B") for attr in attrs]
+        return self.send_body(200, parts, "application/octet-stream", etag, headers)
+
+    def send_chest_search(self, query: Dict[str, List[str]]) -> None:
+        target = _for_server(chest_indexes, (query.get("server") or [""])[0])
+        if target is None:
+            return self.send_plain(503, b"no chest index yet\n")
+        try:
+            limit = min(100, int((query.get("limit") or [CHEST_SEARCH_LIMIT])[0]))
+            chest_limit = min(1000, int((query.get("chests") or ["50"])[0]))
+        except ValueError:
+            return self.send_plain(400, b"limit and chests must be integers\n")
+        text = (query.get("q") or [""])[0]
+        # The answer depends only on the index generation and the normalized request.
+        request = json.dumps([(query.get("server") or [""])[0], " ".join(text.lower().split()), limit, chest_limit])
+        etag = f'"{target.updated_at}-{hashlib.md5(request.encode()).hexdigest()[:12]}"'
+        if _not_modified(self.headers, etag, target.updated_at):
+            return self.send_body(304, b"", "application/json", etag)
+        started = time.perf_counter()
+        results = target.search(text, limit, chest_limit)
+        document = {
+            "query": text,
+            "updated_at": target.updated_at,
+            "indexed_items": len(target.postings),
+            "indexed_chests": len(target.chests),
+            "took_ms": round((time.perf_counter() - started) * 1000, 3),
+            "results": results,
+        }
+        return self.send_body(200, json.dumps(document).encode("utf-8"), "application/json", etag)
+
+    def send_history(self, kind: str, query: Dict[str, List[str]]) -> None:
+        history = _for_server(histories, (query.get("server") or [""])[0])
+        if history is None:
+            return self.send_plain(503, b"history store disabled\n")
+        key = (query.get("name") or query.get("id") or [""])[0]
+        if not key:
+            return self.send_plain(400, b"name (or id for chests) is required\n")
+        try:
+            since = float((query.get("since") or ["0"])[0])
+        except ValueError:
+            return self.send_plain(400, b"since must be epoch seconds\n")
+        if kind == "item":
+            document: Dict[str, Any] = {"item": key, "points": history.item(key, since)}
+        else:
+            document = {kind: key, "items": history.breakdown(f"{kind}_history", key, since)}
+        body = json.dumps(document).encode("utf-8")
+        return self.send_body(200, body, "application/json", f'"{hashlib.md5(body).hexdigest()[:16]}"')
+
+    def send_heatmap(self, query: Dict[str, List[str]]) -> None:
+        heatmap = _for_server(heatmaps, (query.get("server") or [""])[0])
+        if heatmap is None:
+            return self.send_plain(503, b"player heatmap disabled\n")
+        etag = f'"{heatmap.updated:.3f}-{heatmap.samples}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self.send_body(304, b"", "application/json", etag)
+        if (query.get("format") or [""])[0] == "png":
+            return self.send_body(200, heatmap.image(), "image/png", etag)
+        return self.send_body(200, json.dumps(heatmap.document()).encode("utf-8"), "application/json", etag)
+
+    def send_body(
+        self, status_code: int, body: Any, content_type: str, etag: str, extra: Optional[Dict[str, str]] = None
+    ) -> None:
+        parts = body if isinstance(body, list) else [body]
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        for key, value in (extra or {}).items():
+            self.send_header(key, value)
+        if status_code == 304:
+            self.end_headers()
+            return
+        self.send_header("Content-Length", str(sum(len(part) for part in parts)))
+        self.end_headers()
+        if self.command != "HEAD":
+            for part in parts:
+                self.wfile.write(part)
+
+    def do_GET(self) -> None:
+        path, _, raw_query = self.path.partition("?")
+        if path in {"/", "/metrics"}:
+            return self.send_cached(*_published_combined(), CONTENT_TYPE_LATEST)
+        if path == "/metrics/runtime":
+            return self.send_cached(*published_runtime.get(), CONTENT_TYPE_LATEST)
+        if path == "/metrics/world":
+            return self.send_cached(*published_world.get(), CONTENT_TYPE_LATEST)
+        if path == "/api/snapshot":
+            return self.send_cached(*published_snapshot.get(), "application/json", _snapshot_age_headers())
+        if path in {"/api/tiles/manifest", "/api/tiles/region"}:
+            return self.send_tiles(parse_qs(raw_query), path.endswith("manifest"))
+        if path == "/api/heatmap":
+            return self.send_heatmap(parse_qs(raw_query))
+        if path == "/api/chests/search":
+            return self.send_chest_search(parse_qs(raw_query))
+        if path in {"/api/history/item", "/api/history/chest", "/api/history/player"}:
+            return self.send_history(path.rsplit("/", 1)[-1], parse_qs(raw_query))
+        return self.send_plain(404, b"not found\n")
+
+    do_HEAD = do_GET
+
+
+def start_metrics_server(port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def _world_loop() -> None:
+    while True:
+        started = time.time()
+        scrape_world()
+        published_world.publish()
+        publish_snapshot()
+        time.sleep(max(1.0, WORLD_PARSE_INTERVAL - (time.time() - started)))
+
+
+def _scrape_targets(targets: List[ScrapeTarget], families: TargetFamilies, scrape: Callable[[ScrapeTarget], None]) -> None:
+    for target in targets:
+        _active.target = target
+        try:
+            scrape(target)
+        finally:
+            _active.target = None
+        families.capture(target)
+
+
+def _run_sharded(targets: List[ScrapeTarget], coordinator: Optional[ShardCoordinator]) -> None:
+    label = bool(TERRARIA_TARGETS)
+    runtime_families = TargetFamilies(RUNTIME_REGISTRY, "runtime", label)
+    world_families = TargetFamilies(WORLD_REGISTRY, "world", label)
+    published_runtime.registry = runtime_families
+    published_world.registry = world_families
+    world_wakeup = threading.Event()
+
+    def world_loop() -> None:
+        while True:
+            started = time.time()
+            world_wakeup.clear()
+            with world_families.lock:
+                owned = list(world_families.targets)
+            _scrape_targets(owned, world_families, lambda target: scrape_world())
+            published_world.publish()
+            publish_snapshot()
+            world_wakeup.wait(max(1.0, WORLD_PARSE_INTERVAL - (time.time() - started)))
+
+    published_runtime.publish()
+    published_world.publish()
+    publish_snapshot()
+    start_metrics_server(EXPORTER_PORT)
+    threading.Thread(target=world_loop, name="world-refresh", daemon=True).start()
+
+    owned_names: List[str] = []
+    while True:
+        started = time.time()
+        owned = targets
+        if coordinator is not None:
+            try:
+                owned = coordinator.owned(targets)
+            except OSError as exc:
+                print(f"[exporter] shard membership unavailable: {exc}", file=sys.stderr)
+                owned = []
+        names = [target.name for target in owned]
+        if names != owned_names:
+            print(f"[exporter] replica {SHARD_REPLICA_ID} now owns: {', '.join(names) or '(nothing)'}", file=sys.stderr)
+            gained = set(names) - set(owned_names)
+            owned_names = names
+            runtime_families.set_targets(owned)
+            world_families.set_targets(owned)
+            if gained:
+                world_wakeup.set()
+
+        _scrape_targets(owned, runtime_families, lambda target: scrape_runtime(target.tracker, target.player_details))
+        published_runtime.publish()
+        publish_snapshot()
+        time.sleep(max(1.0, SCRAPE_INTERVAL - (time.time() - started)))
+
+
+def render_exposition() -> bytes:
+    body = generate_latest(RUNTIME_REGISTRY) + generate_latest(WORLD_REGISTRY)
+    lines = [
+        line
+        for line in body.decode("utf-8").splitlines()
+        if line.startswith("terraria_") or line.startswith("# HELP terraria_") or line.startswith("# TYPE terraria_")
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def capture_cycle(path: str) -> None:
+    global _recorder
+    _recorder = InputRecorder()
+    try:
+        # A capture is a single cycle, so every event in the captured tail counts, not only the ones
+        # logged after this process started. The state is saved so a replay pairs the same lines.
+        tracker = KubernetesLogTracker()
+        tracker.started_at = 0.0
+        _recorder.tracker = {"started_at": tracker.started_at, "watermark": tracker.watermark}
+        scrape_once(tracker, PlayerDetailFetcher())
+        _recorder.save(path, time.time() - _recorder.started)
+        print(f"[exporter] captured {len(_recorder.entries)} inputs to {path}", file=sys.stderr)
+    finally:
+        _recorder = None
+
+
+def replay_cycles(path: str, speed: float, iterations: int, output: str) -> None:
+    global _replay
+    _replay = InputReplay(path, speed)
+    try:
+        for iteration in range(max(1, iterations)):
+            _replay.rewind()
+            _target().world_state.update({"key": None, "summary": None, "unsupported": False})
+            wall_started = time.perf_counter()
+            cpu_started = time.process_time()
+            tracker = KubernetesLogTracker()
+            _replay.restore(tracker)
+            scrape_once(tracker, PlayerDetailFetcher())
+            print(
+                f"[exporter] replay {iteration + 1}: wall={time.perf_counter() - wall_started:.4f}s "
+                f"cpu={time.process_time() - cpu_started:.4f}s "
+                f"recorded={_replay.manifest.get('cycle_seconds')}s",
+                file=sys.stderr,
+            )
+        body = render_exposition()
+        if output == "-":
+            sys.stdout.buffer.write(body)
+        else:
+            Path(output).write_bytes(body)
+    finally:
+        if _replay.world_path:
+            Path(_replay.world_path).unlink(missing_ok=True)
+        _replay = None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Terraria gameplay exporter")
+    parser.add_argument("--capture", metavar="ARCHIVE", help="run one scrape cycle and save every input it received")
+    parser.add_argument("--replay", metavar="ARCHIVE", help="run scrape_once against a capture, without network")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (0 disables recorded delays)")
+    parser.add_argument("--iterations", type=int, default=1, help="replay cycles to run")
+    parser.add_argument("--output", default="-", help="where to write the replayed exposition")
+    return parser.parse_args()
+
+
 def main() -> None:
-    tracker = KubernetesLogTracker()
-    start_http_server(EXPORTER_PORT)
+    args = parse_args()
+    if args.capture:
+        return capture_cycle(args.capture)
+    if args.replay:
+        return replay_cycles(args.replay, args.speed, args.iterations, args.output)
+
+    targets = _load_targets()
+    if targets or SHARD_MEMBERSHIP_DIR:
+        coordinator = ShardCoordinator(SHARD_MEMBERSHIP_DIR, SHARD_REPLICA_ID) if SHARD_MEMBERSHIP_DIR else None
+        if coordinator is not None:
+            coordinator.start_heartbeat()
+        return _run_sharded(targets or [_target()], coordinator)
+
+    target = _target()
+    published_runtime.publish()
+    published_world.publish()
+    publish_snapshot()
+    start_metrics_server(EXPORTER_PORT)
+    threading.Thread(target=_world_loop, name="world-refresh", daemon=True).start()
     while True:
-        scrape_once(tracker)
-        time.sleep(SCRAPE_INTERVAL)
+        started = time.time()
+        scrape_runtime(target.tracker, target.player_details)
+        published_runtime.publish()
+        publish_snapshot()
+        time.sleep(max(1.0, SCRAPE_INTERVAL - (time.time() - started)))
 
 
 if __name__ == "__main__":
@@ -8,6 +8,15 @@ const state = {
   lastManagement: null,
   uploadPollTimer: null,
   currentUploadJobId: null,
+  currentUploadJob: null,
+  pendingJobEvents: [],
+  uploadReceiving: false,
+  uploadTotalBytes: 0,
+  uploadReceivedBytes: 0,
+  events: null,
+  eventsOpen: false,
+  mapTimer: null,
+  map: { index: null, level: 0, x: 0, y: 0, drag: null, images: new Map() },
 };
 
 const worldNameEl = document.getElementById("worldName");
@@ -44,6 +53,10 @@ const uploadProgressLabelEl = document.getElementById("uploadProgressLabel");
 const uploadBytesLabelEl = document.getElementById("uploadBytesLabel");
 const uploadStepsEl = document.getElementById("uploadSteps");
 
+const mapStatusEl = document.getElementById("mapStatus");
+const mapViewportEl = document.getElementById("mapViewport");
+const mapLayerEl = document.getElementById("mapLayer");
+
 function setStatus(chipEl, mode, text) {
   chipEl.className = `status-chip ${mode}`;
   chipEl.textContent = text;
@@ -142,66 +155,160 @@ async function pollUploadJob(jobId) {
     if (!data.ok || !data.job) {
       throw new Error(data.error || "job not found");
     }
-
-    const job = data.job;
-    const jobStatus = job.status || "running";
-    const stage = job.stage || "starting";
-
-    if (jobStatus === "running") {
-      setStatus(uploadStatusEl, "running", stage.replaceAll("_", " "));
-      renderUploadSteps(stage, "running");
-    } else if (jobStatus === "success") {
-      setStatus(uploadStatusEl, "success", "success");
-      renderUploadSteps(stage === "done" ? "done" : stage, "success");
-    } else {
-      setStatus(uploadStatusEl, "error", "error");
-      renderUploadSteps(stage, "error");
+    if (jobId !== state.currentUploadJobId) {
+      return;
     }
-
-    // Keep the bar at 100% once the file upload is finished.
-    setUploadProgress(100, null, null, "processing");
-
-    const header = [
-      `job_id: ${job.id}`,
-      `status: ${job.status}`,
-      `stage: ${job.stage}`,
-      `world_name: ${(job.meta || {}).world_name || "-"}`,
-      `exit_code: ${job.exit_code ?? "-"}`,
-      `duration_seconds: ${job.duration_seconds ?? "-"}`,
-      "",
-      "log (tail):",
-    ];
-    const lines = header.concat(job.log || []);
-    outputEl.textContent = lines.join("\n");
-
-    if (jobStatus !== "running") {
-      window.clearInterval(state.uploadPollTimer);
-      state.uploadPollTimer = null;
-      state.currentUploadJobId = null;
-      document.getElementById("createWorld").disabled = false;
-      document.getElementById("uploadWorld").disabled = false;
-      setStatus(runStatusEl, jobStatus === "success" ? "success" : "error", jobStatus);
-      await fetchManagement();
+    state.currentUploadJob = data.job;
+    const pending = state.pendingJobEvents;
+    state.pendingJobEvents = [];
+    for (const event of pending) {
+      mergeJobEvent(data.job, event);
     }
+    await renderUploadJob(data.job);
   } catch (err) {
     setStatus(uploadStatusEl, "error", "error");
     outputEl.textContent = `Job polling failed: ${err}`;
     window.clearInterval(state.uploadPollTimer);
     state.uploadPollTimer = null;
     state.currentUploadJobId = null;
+    state.currentUploadJob = null;
     document.getElementById("createWorld").disabled = false;
     document.getElementById("uploadWorld").disabled = false;
     setStatus(runStatusEl, "error", "error");
   }
 }
 
+async function renderUploadJob(job) {
+  const jobStatus = job.status || "running";
+  const stage = job.stage || "starting";
+
+  if (jobStatus === "running") {
+    setStatus(uploadStatusEl, "running", stage.replaceAll("_", " "));
+    renderUploadSteps(stage, "running");
+  } else if (jobStatus === "success") {
+    setStatus(uploadStatusEl, "success", "success");
+    renderUploadSteps(stage === "done" ? "done" : stage, "success");
+  } else {
+    setStatus(uploadStatusEl, "error", "error");
+    renderUploadSteps(stage, "error");
+  }
+
+  // Keep the bar at 100% once the file upload is finished.
+  setUploadProgress(100, null, null, "processing");
+
+  const header = [
+    `job_id: ${job.id}`,
+    `status: ${job.status}`,
+    `stage: ${job.stage}`,
+    `world_name: ${(job.meta || {}).world_name || "-"}`,
+    `exit_code: ${job.exit_code ?? "-"}`,
+    `duration_seconds: ${job.duration_seconds ?? "-"}`,
+    "",
+    "log (tail):",
+  ];
+  const lines = header.concat(job.log || []);
+  outputEl.textContent = lines.join("\n");
+
+  if (jobStatus !== "running") {
+    window.clearInterval(state.uploadPollTimer);
+    state.uploadPollTimer = null;
+    state.currentUploadJobId = null;
+    state.currentUploadJob = null;
+    document.getElementById("createWorld").disabled = false;
+    document.getElementById("uploadWorld").disabled = false;
+    setStatus(runStatusEl, jobStatus === "success" ? "success" : "error", jobStatus);
+    await fetchManagement();
+  }
+}
+
 function startUploadJobPolling(jobId) {
   if (state.uploadPollTimer) {
     window.clearInterval(state.uploadPollTimer);
+    state.uploadPollTimer = null;
   }
   state.currentUploadJobId = jobId;
+  state.currentUploadJob = null;
+  state.pendingJobEvents = [];
+  // One fetch picks up what happened before this tab knew the job id; /api/events streams the rest.
   pollUploadJob(jobId);
-  state.uploadPollTimer = window.setInterval(() => pollUploadJob(jobId), 1200);
+  if (!state.eventsOpen) {
+    state.uploadPollTimer = window.setInterval(() => pollUploadJob(jobId), 1200);
+  }
+}
+
+function mergeJobEvent(job, data) {
+  // Events the fetched job already reflects carry a seq we have seen.
+  if (data.seq <= (job.seq || 0)) {
+    return false;
+  }
+  const { id, seq, line, ...fields } = data;
+  if (line !== undefined) {
+    job.log = (job.log || []).concat(line).slice(-600);
+  }
+  Object.assign(job, fields);
+  job.seq = seq;
+  return true;
+}
+
+function showReceivedBytes(bytes) {
+  // Bytes the server has actually written; parts finish out of order, so never move the bar back.
+  state.uploadReceivedBytes = Math.max(state.uploadReceivedBytes, bytes);
+  const total = state.uploadTotalBytes;
+  setUploadProgress(Math.round((state.uploadReceivedBytes / total) * 100), state.uploadReceivedBytes, total, "uploading");
+}
+
+function applyJobEvent(data) {
+  if (data.id !== state.currentUploadJobId) {
+    return;
+  }
+  if (state.uploadReceiving && data.received_bytes !== undefined) {
+    showReceivedBytes(data.received_bytes);
+  }
+  const job = state.currentUploadJob;
+  if (!job) {
+    // The first fetch is still in flight; merge once it lands.
+    state.pendingJobEvents.push(data);
+    return;
+  }
+  if (mergeJobEvent(job, data)) {
+    renderUploadJob(job);
+  }
+}
+
+function startManagementPolling() {
+  if (!state.managementTimer) {
+    state.managementTimer = setInterval(fetchManagement, 20000);
+  }
+}
+
+function connectEvents() {
+  if (!window.EventSource) {
+    return;
+  }
+  // The browser reconnects on its own and sends Last-Event-ID, so missed events are replayed.
+  const source = new EventSource("/api/events");
+  state.events = source;
+  source.addEventListener("open", () => {
+    state.eventsOpen = true;
+    window.clearInterval(state.managementTimer);
+    state.managementTimer = null;
+    window.clearInterval(state.uploadPollTimer);
+    state.uploadPollTimer = null;
+  });
+  source.addEventListener("error", () => {
+    state.eventsOpen = false;
+    startManagementPolling();
+    if (state.currentUploadJobId && !state.uploadPollTimer) {
+      const jobId = state.currentUploadJobId;
+      state.uploadPollTimer = window.setInterval(() => pollUploadJob(jobId), 1200);
+    }
+  });
+  source.addEventListener("management", (event) => {
+    const message = JSON.parse(event.data);
+    const snapshot = message.full ? message.data : { ...(state.lastManagement || {}), ...message.data };
+    renderManagement({ ...snapshot, age_seconds: 0 });
+  });
+  source.addEventListener("job", (event) => applyJobEvent(JSON.parse(event.data)));
 }
 
 function bindChoiceGroup(rootId, key) {
@@ -362,6 +469,98 @@ async function createWorld() {
   }
 }
 
+const UPLOAD_PARALLEL = 4;
+const UPLOAD_PART_RETRIES = 5;
+
+function sleep(ms) {
+  return new Promise((resolve) => window.setTimeout(resolve, ms));
+}
+
+async function sha256Hex(buffer) {
+  // crypto.subtle only exists on https or localhost; the server hashes every part either way.
+  if (!window.crypto || !window.crypto.subtle) {
+    return "";
+  }
+  const digest = await window.crypto.subtle.digest("SHA-256", buffer);
+  return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, "0")).join("");
+}
+
+async function uploadJson(method, url, payload) {
+  const res = await fetch(url, {
+    method,
+    headers: payload ? { "Content-Type": "application/json" } : {},
+    body: payload ? JSON.stringify(payload) : undefined,
+  });
+  const data = await res.json().catch(() => ({}));
+  return { res, data };
+}
+
+async function compressForUpload(file) {
+  // .wld files shrink 5-10x. World-ui keeps them compressed and they are only unpacked next to the PVC.
+  const name = file.name.toLowerCase();
+  if (name.endsWith(".gz")) {
+    return { blob: file, encoding: "gzip" };
+  }
+  if (name.endsWith(".zst")) {
+    return { blob: file, encoding: "zstd" };
+  }
+  if (!window.CompressionStream) {
+    return { blob: file, encoding: "" };
+  }
+  const blob = await new Response(file.stream().pipeThrough(new CompressionStream("gzip"))).blob();
+  if (blob.size >= file.size * 0.9) {
+    return { blob: file, encoding: "" };
+  }
+  return { blob, encoding: "gzip" };
+}
+
+async function openUploadSession(file, blob, encoding, worldName) {
+  // A session for the same file survives a reload or a dropped link; only its missing parts are sent.
+  const resumeKey = `world-upload:${file.name}:${file.size}:${file.lastModified}:${worldName}:${encoding}`;
+  const previous = window.localStorage.getItem(resumeKey);
+  if (previous) {
+    const { res, data } = await uploadJson("GET", `/api/uploads/${previous}`);
+    if (res.ok && data.ok && data.size === blob.size) {
+      return { resumeKey, session: data };
+    }
+    window.localStorage.removeItem(resumeKey);
+  }
+  const { res, data } = await uploadJson("POST", "/api/uploads", { world_name: worldName, size: blob.size, encoding });
+  if (!res.ok || !data.ok) {
+    throw new Error(data.error || res.statusText || res.status);
+  }
+  window.localStorage.setItem(resumeKey, data.upload_id);
+  return { resumeKey, session: data };
+}
+
+async function uploadPart(blob, session, index) {
+  const start = index * session.part_size;
+  const buffer = await blob.slice(start, Math.min(blob.size, start + session.part_size)).arrayBuffer();
+  const checksum = await sha256Hex(buffer);
+  let lastError = null;
+  for (let attempt = 0; attempt < UPLOAD_PART_RETRIES; attempt += 1) {
+    try {
+      const res = await fetch(`/api/uploads/${session.upload_id}/parts/${index}`, {
+        method: "PUT",
+        headers: checksum ? { "X-Part-Sha256": checksum } : {},
+        body: buffer,
+      });
+      const data = await res.json().catch(() => ({}));
+      if (res.ok && data.ok) {
+        return data;
+      }
+      lastError = new Error(data.error || res.statusText || res.status);
+      if (res.status === 404) {
+        break;
+      }
+    } catch (err) {
+      lastError = err;
+    }
+    await sleep(1000 * 2 ** attempt);
+  }
+  throw lastError;
+}
+
 async function uploadWorldFile() {
   const file = (worldFileEl.files || [])[0];
   if (!file) {
@@ -371,15 +570,11 @@ async function uploadWorldFile() {
   }
 
   const worldName = worldNameEl.value.trim() || file.name;
-  const form = new FormData();
-  form.append("world_file", file, file.name);
-  form.append("world_name", worldName);
-
   setStatus(runStatusEl, "running", "running");
   setStatus(uploadStatusEl, "running", "uploading");
   setUploadProgress(0, 0, file.size, "uploading");
   renderUploadSteps("uploaded", "running");
-  outputEl.textContent = "Uploading world to the UI pod...";
+  outputEl.textContent = "Compressing world...";
   document.getElementById("createWorld").disabled = true;
   document.getElementById("uploadWorld").disabled = true;
 
@@ -388,54 +583,58 @@ async function uploadWorldFile() {
     state.uploadPollTimer = null;
   }
 
-  await new Promise((resolve) => {
-    const xhr = new XMLHttpRequest();
-    xhr.open("POST", "/api/upload-world", true);
-    xhr.responseType = "json";
-
-    xhr.upload.onprogress = (event) => {
-      if (!event.lengthComputable) {
-        setUploadProgress(0, event.loaded, file.size, "uploading");
-        return;
-      }
-      const pct = Math.round((event.loaded / event.total) * 100);
-      setUploadProgress(pct, event.loaded, event.total, "uploading");
-      setStatus(uploadStatusEl, "running", pct >= 100 ? "processing" : "uploading");
-    };
-
-    xhr.onload = () => {
-      const okHttp = xhr.status >= 200 && xhr.status < 300;
-      const result = xhr.response || {};
-      if (!okHttp || !result.ok) {
-        outputEl.textContent = `Upload failed: ${result.error || xhr.statusText || xhr.status}`;
-        setStatus(runStatusEl, "error", "error");
-        setStatus(uploadStatusEl, "error", "error");
-        document.getElementById("createWorld").disabled = false;
-        document.getElementById("uploadWorld").disabled = false;
-        resolve();
-        return;
-      }
-
-      setUploadProgress(100, file.size, file.size, "processing");
-      outputEl.textContent = `Upload received. Starting in-cluster job...\njob_id: ${result.job_id}`;
-      worldNameEl.value = result.world_name || worldNameEl.value;
-      worldFileEl.value = "";
-
-      startUploadJobPolling(result.job_id);
-      resolve();
-    };
+  try {
+    const { blob, encoding } = await compressForUpload(file);
+    outputEl.textContent =
+      blob !== file
+        ? `Uploading ${formatBytes(blob.size)} (${encoding} of ${formatBytes(file.size)}) to the UI pod...`
+        : "Uploading world to the UI pod...";
+    const { resumeKey, session } = await openUploadSession(file, blob, encoding, worldName);
+    // The session id is the upload job id, so /api/events progress for it lands here too.
+    state.currentUploadJobId = session.upload_id;
+    state.currentUploadJob = null;
+    state.pendingJobEvents = [];
+    state.uploadReceiving = true;
+    state.uploadTotalBytes = blob.size;
+    state.uploadReceivedBytes = 0;
+    showReceivedBytes(session.received_bytes);
+
+    let missing = session.missing;
+    for (let round = 0; missing.length > 0 && round < 3; round += 1) {
+      const queue = missing.slice();
+      const worker = async () => {
+        while (queue.length > 0) {
+          const result = await uploadPart(blob, session, queue.shift());
+          showReceivedBytes(result.received_bytes);
+        }
+      };
+      await Promise.all(Array.from({ length: Math.min(UPLOAD_PARALLEL, queue.length) }, worker));
+      const { data } = await uploadJson("GET", `/api/uploads/${session.upload_id}`);
+      missing = data.missing || [];
+    }
 
-    xhr.onerror = () => {
-      outputEl.textContent = "Upload failed: network error";
-      setStatus(runStatusEl, "error", "error");
-      setStatus(uploadStatusEl, "error", "error");
-      document.getElementById("createWorld").disabled = false;
-      document.getElementById("uploadWorld").disabled = false;
-      resolve();
-    };
+    setStatus(uploadStatusEl, "running", "processing");
+    const { res, data: result } = await uploadJson("POST", `/api/uploads/${session.upload_id}/complete`);
+    state.uploadReceiving = false;
+    if (!res.ok || !result.ok) {
+      throw new Error(result.error || res.statusText || res.status);
+    }
+    window.localStorage.removeItem(resumeKey);
 
-    xhr.send(form);
-  });
+    setUploadProgress(100, blob.size, blob.size, "processing");
+    outputEl.textContent = `Upload received. Starting in-cluster job...\njob_id: ${result.job_id}\nsha256: ${result.sha256}`;
+    worldNameEl.value = result.world_name || worldNameEl.value;
+    worldFileEl.value = "";
+    startUploadJobPolling(result.job_id);
+  } catch (err) {
+    state.uploadReceiving = false;
+    state.currentUploadJobId = null;
+    outputEl.textContent = `Upload failed: ${err.message || err}\nSelect the same file again to resume.`;
+    setStatus(runStatusEl, "error", "error");
+    setStatus(uploadStatusEl, "error", "error");
+    document.getElementById("createWorld").disabled = false;
+    document.getElementById("uploadWorld").disabled = false;
+  }
 }
 
 function metricValue(value) {
@@ -458,6 +657,37 @@ function renderKV(container, pairs) {
   }
 }
 
+function worldDetails(world) {
+  if (world.error) {
+    return `unreadable header: ${world.error}`;
+  }
+  const parts = [];
+  if (world.world_name && `${world.world_name}.wld` !== world.name) {
+    parts.push(world.world_name);
+  }
+  for (const value of [world.size, world.difficulty, world.evil]) {
+    if (value) {
+      parts.push(value);
+    }
+  }
+  if (world.hardmode) {
+    parts.push("hardmode");
+  }
+  if (world.seed) {
+    parts.push(`seed ${world.seed}`);
+  }
+  if (world.version) {
+    parts.push(`v${world.version}`);
+  }
+  if (world.file_size !== undefined) {
+    parts.push(formatBytes(world.file_size));
+  }
+  if (world.last_played) {
+    parts.push(`saved ${new Date(world.last_played).toLocaleString()}`);
+  }
+  return parts.join(" | ");
+}
+
 function renderWorldList(snapshot) {
   worldListEl.innerHTML = "";
   const worlds = snapshot.worlds || [];
@@ -470,13 +700,14 @@ function renderWorldList(snapshot) {
   for (const world of worlds) {
     const row = document.createElement("div");
     row.className = "world-row";
-    const isActive = world === activeWorld;
+    const isActive = world.name === activeWorld;
     row.innerHTML = `
       <div>
-        <strong>${world}</strong>
+        <strong>${world.name}</strong>
         <span class="muted">${isActive ? "active" : "available"}</span>
+        <div class="pod-sub">${worldDetails(world)}</div>
       </div>
-      <button class="${isActive ? "secondary" : "ghost"}" data-world="${world}" ${isActive ? "disabled" : ""}>
+      <button class="${isActive ? "secondary" : "ghost"}" data-world="${world.name}" ${isActive ? "disabled" : ""}>
         ${isActive ? "Active" : "Set Active"}
       </button>
     `;
@@ -541,6 +772,7 @@ function renderManagement(snapshot) {
     ["NodePort 7777", service.node_port_terraria || "-"],
     ["NodePort API", service.node_port_api || "-"],
     ["Cluster IP", service.cluster_ip || "-"],
+    ["Snapshot age", `${Math.round(snapshot.age_seconds ?? 0)}s`],
   ]);
 
   renderKV(metricsInfoEl, [
@@ -607,6 +839,140 @@ async function serverAction(action, payload = {}) {
   await fetchManagement();
 }
 
+function fitMap() {
+  const { index } = state.map;
+  const width = mapViewportEl.clientWidth;
+  const height = mapViewportEl.clientHeight;
+  let level = index.levels.length - 1;
+  while (level > 0 && index.width / index.levels[level - 1].scale <= width) {
+    level -= 1;
+  }
+  const scale = index.levels[level].scale;
+  state.map.level = level;
+  state.map.x = (index.width / scale - width) / 2;
+  state.map.y = (index.height / scale - height) / 2;
+  renderMap();
+}
+
+function renderMap() {
+  const { index, level, x, y, images } = state.map;
+  if (!index) {
+    return;
+  }
+  const info = index.levels[level];
+  const size = index.tile_size;
+  const width = mapViewportEl.clientWidth;
+  const height = mapViewportEl.clientHeight;
+  const wanted = new Set();
+
+  // Only tiles intersecting the viewport get an <img>; URLs are content hashes, so revisits hit the browser cache.
+  const firstX = Math.max(0, Math.floor(x / size));
+  const lastX = Math.min(info.cols - 1, Math.floor((x + width) / size));
+  const firstY = Math.max(0, Math.floor(y / size));
+  const lastY = Math.min(info.rows - 1, Math.floor((y + height) / size));
+  for (let tx = firstX; tx <= lastX; tx += 1) {
+    for (let ty = firstY; ty <= lastY; ty += 1) {
+      const key = `${level}:${tx}:${ty}`;
+      const src = `/api/map/tiles/${info.tiles[tx][ty]}.png`;
+      let img = images.get(key);
+      if (!img) {
+        img = document.createElement("img");
+        img.className = "map-tile";
+        img.alt = "";
+        img.draggable = false;
+        images.set(key, img);
+        mapLayerEl.appendChild(img);
+      }
+      if (img.getAttribute("src") !== src) {
+        img.src = src;
+      }
+      img.style.transform = `translate(${Math.round(tx * size - x)}px, ${Math.round(ty * size - y)}px)`;
+      wanted.add(key);
+    }
+  }
+
+  for (const [key, img] of images) {
+    if (!wanted.has(key)) {
+      img.remove();
+      images.delete(key);
+    }
+  }
+}
+
+function zoomMap(step, anchorX = mapViewportEl.clientWidth / 2, anchorY = mapViewportEl.clientHeight / 2) {
+  const { index, level } = state.map;
+  if (!index) {
+    return;
+  }
+  const next = Math.max(0, Math.min(index.levels.length - 1, level - step));
+  if (next === level) {
+    return;
+  }
+  const ratio = index.levels[level].scale / index.levels[next].scale;
+  state.map.x = (state.map.x + anchorX) * ratio - anchorX;
+  state.map.y = (state.map.y + anchorY) * ratio - anchorY;
+  state.map.level = next;
+  renderMap();
+}
+
+async function fetchMapIndex() {
+  try {
+    const response = await fetch("/api/map");
+    const index = await response.json();
+    if (!index.ok) {
+      setStatus(mapStatusEl, "idle", index.error || "unavailable");
+      return;
+    }
+    const first = !state.map.index;
+    state.map.index = index;
+    setStatus(mapStatusEl, "success", `${index.width}x${index.height}`);
+    if (first) {
+      fitMap();
+    } else {
+      renderMap();
+    }
+  } catch (error) {
+    setStatus(mapStatusEl, "error", "offline");
+  }
+}
+
+function bindMapControls() {
+  document.getElementById("mapZoomIn").addEventListener("click", () => zoomMap(1));
+  document.getElementById("mapZoomOut").addEventListener("click", () => zoomMap(-1));
+  document.getElementById("mapFit").addEventListener("click", () => state.map.index && fitMap());
+
+  mapViewportEl.addEventListener("pointerdown", (event) => {
+    state.map.drag = { px: event.clientX, py: event.clientY, x: state.map.x, y: state.map.y };
+    mapViewportEl.setPointerCapture(event.pointerId);
+    mapViewportEl.classList.add("dragging");
+  });
+  mapViewportEl.addEventListener("pointermove", (event) => {
+    const { drag } = state.map;
+    if (!drag) {
+      return;
+    }
+    state.map.x = drag.x - (event.clientX - drag.px);
+    state.map.y = drag.y - (event.clientY - drag.py);
+    renderMap();
+  });
+  const endDrag = () => {
+    state.map.drag = null;
+    mapViewportEl.classList.remove("dragging");
+  };
+  mapViewportEl.addEventListener("pointerup", endDrag);
+  mapViewportEl.addEventListener("pointercancel", endDrag);
+  mapViewportEl.addEventListener(
+    "wheel",
+    (event) => {
+      event.preventDefault();
+      const rect = mapViewportEl.getBoundingClientRect();
+      zoomMap(event.deltaY < 0 ? 1 : -1, event.clientX - rect.left, event.clientY - rect.top);
+    },
+    { passive: false },
+  );
+  window.addEventListener("resize", renderMap);
+}
+
 function boot() {
   bindChoiceGroup("sizeChoices", "size");
   bindChoiceGroup("difficultyChoices", "difficulty");
@@ -641,6 +1007,7 @@ function boot() {
   document.getElementById("startServer").addEventListener("click", () => serverAction("start"));
   document.getElementById("stopServer").addEventListener("click", () => serverAction("stop"));
   document.getElementById("restartServer").addEventListener("click", () => serverAction("restart"));
+  bindMapControls();
 
   setStatus(runStatusEl, "idle", "idle");
   setStatus(mgmtStatusEl, "idle", "idle");
@@ -655,7 +1022,12 @@ function boot() {
       setStatus(runStatusEl, "error", "error");
     });
 
-  state.managementTimer = setInterval(fetchManagement, 20000);
+  startManagementPolling();
+  connectEvents();
+
+  setStatus(mapStatusEl, "idle", "loading");
+  fetchMapIndex();
+  state.mapTimer = setInterval(fetchMapIndex, 60000);
 }
 
 boot();
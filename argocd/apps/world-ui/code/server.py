@@ -1,21 +1,46 @@
 #!/usr/bin/env python3
 import argparse
-import cgi
+import base64
+import gzip
+import hashlib
+import http.client
 import json
 import os
+import queue
+import re
+import shutil
+import ssl
+import struct
 import subprocess
 import tempfile
 import threading
 import time
 import uuid
+import zlib
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
 from datetime import datetime, timezone
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import quote, urlparse
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, quote, urlencode, urlparse
 from urllib.request import Request, urlopen
 
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+try:
+    from compression import zstd
+except Exception:
+    try:
+        import zstandard as zstd
+    except Exception:
+        zstd = None
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 STATIC_DIR = Path(__file__).resolve().parent / "static"
 
@@ -27,6 +52,99 @@ DEFAULT_PROMETHEUS_URLS = [
     "http://kube-prom-stack-kube-prome-prometheus.monitoring.svc.cluster.local:9090",
     "http://localhost:30090",
 ]
+DEFAULT_EXPORTER_SNAPSHOT_URL = "http://terraria-exporter.terraria.svc.cluster.local:9150/api/snapshot"
+DEFAULT_EXPORTER_TILES_URL = "http://terraria-exporter.terraria.svc.cluster.local:9150/api/tiles"
+MAP_CACHE_DIR = Path(os.environ.get("MAP_CACHE_DIR", "/tmp/world-ui-map"))
+MAP_REFRESH_INTERVAL = int(os.environ.get("MAP_REFRESH_INTERVAL", "60"))
+WORLDS_DIR = Path(os.environ.get("WORLDS_DIR", "/worlds"))
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", str(1024 * 1024 * 1024)))
+WORLD_MAX_RAW_BYTES = int(os.environ.get("WORLD_MAX_RAW_BYTES", str(1024 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+UPLOAD_PROGRESS_SECONDS = 0.5
+UPLOAD_PART_BYTES = int(os.environ.get("UPLOAD_PART_BYTES", str(8 * 1024 * 1024)))
+UPLOAD_SESSION_TTL = float(os.environ.get("UPLOAD_SESSION_TTL", str(6 * 3600)))
+MANAGEMENT_DEADLINE_SECONDS = float(os.environ.get("MANAGEMENT_DEADLINE_SECONDS", "8"))
+MANAGEMENT_WORKERS = int(os.environ.get("MANAGEMENT_WORKERS", "8"))
+MANAGEMENT_CACHE_TTL = float(os.environ.get("MANAGEMENT_CACHE_TTL", "5"))
+MANAGEMENT_MAX_STALE = float(os.environ.get("MANAGEMENT_MAX_STALE", "120"))
+MANAGEMENT_REFRESH_INTERVAL = float(os.environ.get("MANAGEMENT_REFRESH_INTERVAL", "0"))
+EVENT_BACKLOG = int(os.environ.get("EVENT_BACKLOG", "1000"))
+EVENT_CLIENT_QUEUE = int(os.environ.get("EVENT_CLIENT_QUEUE", "256"))
+EVENT_HEARTBEAT_SECONDS = float(os.environ.get("EVENT_HEARTBEAT_SECONDS", "15"))
+PROMETHEUS_TIMEOUT_SECONDS = float(os.environ.get("PROMETHEUS_TIMEOUT_SECONDS", "3"))
+PROMETHEUS_BREAKER_SECONDS = float(os.environ.get("PROMETHEUS_BREAKER_SECONDS", "30"))
+PROMETHEUS_BREAKER_MAX_SECONDS = float(os.environ.get("PROMETHEUS_BREAKER_MAX_SECONDS", "600"))
+KUBE_CLIENT = os.environ.get("KUBE_CLIENT", "auto").strip().lower()
+KUBE_WATCH = os.environ.get("KUBE_WATCH", "true").strip().lower() in {"1", "true", "yes", "on"}
+KUBE_WATCH_TIMEOUT_SECONDS = int(os.environ.get("KUBE_WATCH_TIMEOUT_SECONDS", "300"))
+KUBE_SERVICE_ACCOUNT_DIR = Path("/var/run/secrets/kubernetes.io/serviceaccount")
+KUBE_PATHS = {
+    "deployment": "/apis/apps/v1/namespaces/{namespace}/deployments/{name}",
+    "service": "/api/v1/namespaces/{namespace}/services/{name}",
+    "endpoints": "/api/v1/namespaces/{namespace}/endpoints/{name}",
+    "pod": "/api/v1/namespaces/{namespace}/pods/{name}",
+    "pods": "/api/v1/namespaces/{namespace}/pods",
+}
+# Kinds served from a watch cache, mapped to the collection that is watched.
+KUBE_WATCHED = {
+    "deployment": "/apis/apps/v1/namespaces/{namespace}/deployments",
+    "service": "/api/v1/namespaces/{namespace}/services",
+    "endpoints": "/api/v1/namespaces/{namespace}/endpoints",
+    "pods": "/api/v1/namespaces/{namespace}/pods",
+}
+# The only fields read from each kind. Responses and watch caches keep just these, so managedFields,
+# pod specs and annotations are dropped as soon as they arrive.
+KUBE_METADATA_FIELDS = {"name": True, "resourceVersion": True, "creationTimestamp": True}
+KUBE_POD_FIELDS = {
+    "metadata": KUBE_METADATA_FIELDS,
+    "status": {"phase": True, "podIP": True, "nodeName": True, "containerStatuses": {"ready": True, "restartCount": True}},
+}
+KUBE_FIELDS = {
+    "deployment": {
+        "metadata": KUBE_METADATA_FIELDS,
+        "spec": {"replicas": True, "template": {"spec": {"containers": {"image": True, "env": {"name": True, "value": True}}}}},
+        "status": {"readyReplicas": True, "availableReplicas": True, "observedGeneration": True},
+    },
+    "service": {
+        "metadata": KUBE_METADATA_FIELDS,
+        "spec": {"clusterIP": True, "type": True, "ports": {"name": True, "port": True, "nodePort": True}},
+    },
+    "endpoints": {"metadata": KUBE_METADATA_FIELDS, "subsets": {"addresses": {"ip": True}}},
+    "pod": KUBE_POD_FIELDS,
+    "pods": KUBE_POD_FIELDS,
+}
+KUBE_METADATA_ACCEPT = "application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1,application/json"
+KUBE_METADATA_LIST_ACCEPT = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,application/json"
+METRIC_SNAPSHOT_KEYS = [
+    "source_up",
+    "world_parser_up",
+    "players_online",
+    "players_max",
+    "hardmode",
+    "blood_moon",
+    "eclipse",
+    "world_time",
+    "chests_total",
+    "houses_total",
+    "housed_npcs_total",
+]
+PROMETHEUS_SNAPSHOT_METRICS = {
+    "source_up": "terraria_exporter_source_up",
+    "world_parser_up": "terraria_world_parser_up",
+    "players_online": "terraria_players_online",
+    "players_max": "terraria_players_max",
+    "hardmode": "terraria_world_hardmode",
+    "blood_moon": "terraria_world_blood_moon",
+    "eclipse": "terraria_world_eclipse",
+    "world_time": "terraria_world_time",
+    "chests_total": "terraria_world_chests_total",
+    "houses_total": "terraria_world_houses_total",
+    "housed_npcs_total": "terraria_world_housed_npcs_total",
+}
+
+UPLOAD_ENCODINGS = {"gzip": ".gz", "zstd": ".zst"}
+WORLD_DIFFICULTIES = {0: "classic", 1: "expert", 2: "master", 3: "journey"}
+WORLD_SIZES = {4200: "small", 6400: "medium", 8400: "large"}
 
 SPECIAL_SEEDS = [
     {
@@ -120,6 +238,106 @@ JOBS: Dict[str, Dict] = {}
 JOB_LOG_MAX_LINES = 600
 
 
+class EventSubscriber:
+    def __init__(self) -> None:
+        self.queue: "queue.Queue[Tuple[str, str, str]]" = queue.Queue(maxsize=EVENT_CLIENT_QUEUE)
+        self.dropped = False
+
+
+class EventHub:
+    """Fan-out behind /api/events.
+
+    Events are numbered "<epoch>-<n>" so a reconnect after a restart is recognised. The last
+    EVENT_BACKLOG events are kept for Last-Event-ID replay. A client too far behind, or whose queue
+    filled up, starts over from a full management snapshot.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.epoch = uuid.uuid4().hex[:8]
+        self.next_id = 0
+        self.backlog: deque = deque(maxlen=EVENT_BACKLOG)
+        self.subscribers: set = set()
+        self.management: Optional[Dict] = None
+        self.management_id = ""
+        self.pusher: Optional[threading.Thread] = None
+
+    def _publish(self, name: str, data: Dict) -> str:
+        # Caller holds the lock.
+        self.next_id += 1
+        event = (f"{self.epoch}-{self.next_id}", name, json.dumps(data))
+        self.backlog.append((self.next_id, event))
+        for subscriber in self.subscribers:
+            try:
+                subscriber.queue.put_nowait(event)
+            except queue.Full:
+                subscriber.dropped = True
+        return event[0]
+
+    def publish(self, name: str, data: Dict) -> None:
+        with self.lock:
+            self._publish(name, data)
+
+    def publish_management(self, previous: Optional[Dict], snapshot: Dict) -> None:
+        with self.lock:
+            base = self.management if self.management is not None else previous
+            if base is None:
+                event_id = self._publish("management", {"full": True, "data": snapshot})
+            else:
+                changes = {key: value for key, value in snapshot.items() if key != "timestamp" and base.get(key) != value}
+                if not changes:
+                    self.management = snapshot
+                    return
+                changes["timestamp"] = snapshot.get("timestamp")
+                event_id = self._publish("management", {"full": False, "data": changes})
+            self.management = snapshot
+            self.management_id = event_id
+
+    def _replay(self, last_event_id: str) -> Optional[List[Tuple[str, str, str]]]:
+        epoch, _, number = last_event_id.partition("-")
+        if epoch != self.epoch or not number.isdigit():
+            return None
+        last = int(number)
+        oldest = self.backlog[0][0] if self.backlog else self.next_id + 1
+        if last > self.next_id or last < oldest - 1:
+            return None
+        return [event for number, event in self.backlog if number > last]
+
+    def subscribe(self, last_event_id: str) -> Tuple[EventSubscriber, List[Tuple[str, str, str]]]:
+        subscriber = EventSubscriber()
+        with self.lock:
+            replay = self._replay(last_event_id) if last_event_id else None
+            if replay is None:
+                replay = []
+                if self.management is not None:
+                    replay.append((self.management_id, "management", json.dumps({"full": True, "data": self.management})))
+            self.subscribers.add(subscriber)
+            if self.pusher is None:
+                self.pusher = threading.Thread(target=self._push_management, name="events-management", daemon=True)
+                self.pusher.start()
+        return subscriber, replay
+
+    def unsubscribe(self, subscriber: EventSubscriber) -> None:
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def _push_management(self) -> None:
+        # While anyone listens, keep touching the snapshot cache; its TTL decides when a rebuild happens
+        # and every rebuild publishes its diff.
+        while True:
+            with self.lock:
+                if not self.subscribers:
+                    self.pusher = None
+                    return
+            MANAGEMENT_SNAPSHOT.get()
+            time.sleep(1)
+
+
+EVENTS = EventHub()
+
+MANAGEMENT_POOL = ThreadPoolExecutor(max_workers=MANAGEMENT_WORKERS, thread_name_prefix="management")
+
+
 def now_rfc3339() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -186,8 +404,8 @@ def run_subprocess(command: List[str], timeout: int = 1200, cwd: Path = REPO_ROO
     }
 
 
-def job_create(kind: str, meta: Dict) -> Dict:
-    job_id = uuid.uuid4().hex
+def job_create(kind: str, meta: Dict, job_id: Optional[str] = None) -> Dict:
+    job_id = job_id or uuid.uuid4().hex
     job = {
         "id": job_id,
         "kind": kind,
@@ -201,8 +419,12 @@ def job_create(kind: str, meta: Dict) -> Dict:
         "duration_seconds": None,
         "meta": meta or {},
         "log": deque(maxlen=JOB_LOG_MAX_LINES),
+        # Bumped on every change so /api/events subscribers can drop what a fetched job already has.
+        "seq": 0,
     }
     with JOBS_LOCK:
+        if job_id in JOBS:
+            job["id"] = job_id = uuid.uuid4().hex
         JOBS[job_id] = job
     return job
 
@@ -224,6 +446,9 @@ def job_update(job_id: str, **fields) -> None:
         if not job:
             return
         job.update(fields)
+        job["seq"] += 1
+        seq = job["seq"]
+    EVENTS.publish("job", {"id": job_id, "seq": seq, **fields})
 
 
 def job_append(job_id: str, line: str) -> None:
@@ -234,6 +459,9 @@ def job_append(job_id: str, line: str) -> None:
         if not job:
             return
         job["log"].append(line)
+        job["seq"] += 1
+        seq = job["seq"]
+    EVENTS.publish("job", {"id": job_id, "seq": seq, "line": line})
 
 
 def kubectl(args: List[str], timeout: int = 120) -> Dict:
@@ -250,6 +478,313 @@ def kubectl_json(args: List[str], timeout: int = 120) -> Tuple[Optional[dict], O
         return None, f"invalid kubectl json output: {exc}"
 
 
+class KubeClient:
+    """Read-only Kubernetes REST client that keeps one keep-alive HTTPS connection per thread.
+
+    Uses the pod service account in-cluster, or the current kubeconfig context when it has a token or
+    client certificate. Anything else (exec/auth-provider plugins, KUBE_CLIENT=kubectl) leaves it disabled
+    and callers fall back to kubectl.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.configured = False
+        self.host = ""
+        self.port = 443
+        self.context: Optional[ssl.SSLContext] = None
+        self.token = ""
+        self.token_path: Optional[Path] = None
+        self.local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        if not self.configured:
+            with self.lock:
+                if not self.configured:
+                    self._configure()
+                    self.configured = True
+        return bool(self.host)
+
+    def _configure(self) -> None:
+        if KUBE_CLIENT == "kubectl":
+            return
+        token_path = KUBE_SERVICE_ACCOUNT_DIR / "token"
+        service_host = os.environ.get("KUBERNETES_SERVICE_HOST", "")
+        if service_host and token_path.exists():
+            self.context = ssl.create_default_context(cafile=str(KUBE_SERVICE_ACCOUNT_DIR / "ca.crt"))
+            self.host = service_host
+            self.port = int(os.environ.get("KUBERNETES_SERVICE_PORT", "443"))
+            self.token_path = token_path
+            return
+
+        # One kubectl call at startup resolves the kubeconfig (merging, contexts, inline data) for us.
+        res = run_subprocess(["kubectl", "config", "view", "--raw", "--minify", "--flatten", "-o", "json"], timeout=15)
+        if not res["ok"]:
+            return
+        try:
+            config = json.loads(res["stdout"] or "{}")
+            cluster = config["clusters"][0]["cluster"]
+            user = config["users"][0].get("user") or {}
+        except (ValueError, KeyError, IndexError, TypeError):
+            return
+        server = urlparse(cluster.get("server", ""))
+        if server.scheme != "https" or "exec" in user or "auth-provider" in user:
+            return
+        context = ssl.create_default_context()
+        if cluster.get("insecure-skip-tls-verify"):
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        elif cluster.get("certificate-authority-data"):
+            context.load_verify_locations(cadata=base64.b64decode(cluster["certificate-authority-data"]).decode("ascii"))
+        if user.get("client-certificate-data") and user.get("client-key-data"):
+            # ssl only loads key pairs from files, so the PEM lives on disk just long enough to be read.
+            with tempfile.NamedTemporaryFile(suffix=".pem") as handle:
+                handle.write(base64.b64decode(user["client-certificate-data"]))
+                handle.write(b"\n")
+                handle.write(base64.b64decode(user["client-key-data"]))
+                handle.flush()
+                context.load_cert_chain(handle.name)
+        self.context = context
+        self.token = user.get("token", "")
+        self.host = server.hostname or ""
+        self.port = server.port or 443
+
+    def _connection(self, timeout: float) -> http.client.HTTPSConnection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPSConnection(self.host, self.port, context=self.context, timeout=timeout)
+            self.local.conn = conn
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def _headers(self, accept: str = "application/json, */*") -> Dict[str, str]:
+        token = self.token_path.read_text(encoding="utf-8").strip() if self.token_path else self.token
+        headers = {"Accept": accept}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        return headers
+
+    def request(
+        self, path: str, params: Optional[Dict] = None, timeout: float = 30, accept: str = "application/json, */*"
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        url = f"{path}?{urlencode(params)}" if params else path
+        headers = self._headers(accept)
+        for attempt in range(2):
+            conn = self._connection(timeout)
+            try:
+                conn.request("GET", url, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                # A pooled connection the apiserver already closed fails once; retry on a fresh one.
+                conn.close()
+                self.local.conn = None
+                if attempt:
+                    return None, f"kubernetes api: {exc}"
+                continue
+            if response.status != 200:
+                try:
+                    message = json.loads(body.decode("utf-8")).get("message")
+                except (ValueError, AttributeError):
+                    message = None
+                return None, message or f"kubernetes api returned HTTP {response.status}"
+            return body, None
+        return None, "kubernetes api: request failed"
+
+    def get_json(
+        self, path: str, params: Optional[Dict] = None, timeout: float = 30, accept: str = "application/json, */*"
+    ) -> Tuple[Optional[dict], Optional[str]]:
+        body, err = self.request(path, params, timeout, accept)
+        if err:
+            return None, err
+        try:
+            return json.loads(body or b"{}"), None
+        except json.JSONDecodeError as exc:
+            return None, f"invalid kubernetes api json: {exc}"
+
+    def watch(self, path: str, params: Dict, timeout: float):
+        """Yield watch events from a dedicated connection until the apiserver ends the stream."""
+        conn = http.client.HTTPSConnection(self.host, self.port, context=self.context, timeout=timeout)
+        try:
+            conn.request("GET", f"{path}?{urlencode(params)}", headers=self._headers())
+            response = conn.getresponse()
+            if response.status == 410:
+                yield {"type": "ERROR", "object": {"code": 410}}
+                return
+            if response.status != 200:
+                raise RuntimeError(f"kubernetes watch returned HTTP {response.status}")
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            conn.close()
+
+
+KUBE = KubeClient()
+
+
+def kube_project(value, fields):
+    """Keep only the keys named in fields (nested the same way); lists are projected item by item."""
+    if fields is True:
+        return value
+    if isinstance(value, list):
+        return [kube_project(item, fields) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: kube_project(value[key], sub) for key, sub in fields.items() if key in value}
+
+
+class KubeInformer:
+    """List-then-watch cache of one collection; relists when the watch answers 410 Gone.
+
+    Only the projected fields of each object are kept.
+    """
+
+    def __init__(self, client: KubeClient, path: str, params: Dict, fields) -> None:
+        self.client = client
+        self.path = path
+        self.params = params
+        self.fields = fields
+        self.lock = threading.Lock()
+        self.items: Dict[str, dict] = {}
+        self.resource_version = ""
+        self.synced = False
+        self.version = 0
+        self.error: Optional[str] = None
+        self.thread = threading.Thread(target=self.run, name=f"watch{path}", daemon=True)
+
+    def get(self, name: str) -> Optional[dict]:
+        with self.lock:
+            return self.items.get(name)
+
+    def list(self) -> List[dict]:
+        with self.lock:
+            return [self.items[name] for name in sorted(self.items)]
+
+    def _relist(self) -> None:
+        data, err = self.client.get_json(self.path, self.params, timeout=30)
+        if err:
+            raise RuntimeError(err)
+        items = {item.get("metadata", {}).get("name", ""): kube_project(item, self.fields) for item in data.get("items", []) or []}
+        with self.lock:
+            self.items = items
+            self.resource_version = (data.get("metadata") or {}).get("resourceVersion", "")
+            self.synced = True
+            self.version += 1
+
+    def _watch(self) -> bool:
+        params = {
+            **self.params,
+            "watch": "1",
+            "resourceVersion": self.resource_version,
+            "allowWatchBookmarks": "true",
+            "timeoutSeconds": str(KUBE_WATCH_TIMEOUT_SECONDS),
+        }
+        for event in self.client.watch(self.path, params, timeout=KUBE_WATCH_TIMEOUT_SECONDS + 30):
+            kind = event.get("type")
+            obj = event.get("object") or {}
+            if kind == "ERROR":
+                # 410 means our resourceVersion fell out of the apiserver's window; anything else retries the watch.
+                return obj.get("code") == 410
+            metadata = obj.get("metadata") or {}
+            with self.lock:
+                if kind in {"ADDED", "MODIFIED"}:
+                    self.items[metadata.get("name", "")] = kube_project(obj, self.fields)
+                    self.version += 1
+                elif kind == "DELETED":
+                    self.items.pop(metadata.get("name", ""), None)
+                    self.version += 1
+                self.resource_version = metadata.get("resourceVersion") or self.resource_version
+        return False
+
+    def run(self) -> None:
+        relist = True
+        backoff = 1.0
+        while True:
+            try:
+                if relist:
+                    self._relist()
+                relist = self._watch()
+                self.error = None
+                backoff = 1.0
+            except Exception as exc:
+                self.error = str(exc)
+                with self.lock:
+                    self.synced = self.synced and not relist
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+WATCH_CACHES: Dict[Tuple[str, str, str], KubeInformer] = {}
+WATCH_CACHES_LOCK = threading.Lock()
+
+
+def watch_cache(namespace: str, kind: str, name: str = "", label_selector: str = "") -> Optional[KubeInformer]:
+    if not KUBE_WATCH or kind not in KUBE_WATCHED or not KUBE.enabled:
+        return None
+    selector = f"metadata.name={name}" if name else ""
+    key = (namespace, kind, selector or label_selector)
+    with WATCH_CACHES_LOCK:
+        informer = WATCH_CACHES.get(key)
+        if informer is None:
+            params = {"fieldSelector": selector} if selector else {"labelSelector": label_selector}
+            path = KUBE_WATCHED[kind].format(namespace=quote(namespace, safe=""))
+            informer = WATCH_CACHES[key] = KubeInformer(KUBE, path, params, KUBE_FIELDS[kind])
+            informer.thread.start()
+    return informer
+
+
+def kube_get(
+    namespace: str, kind: str, name: str = "", label_selector: str = "", timeout: int = 120, metadata_only: bool = False
+) -> Tuple[Optional[dict], Optional[str]]:
+    """Read one object or a labelled list, trimmed to KUBE_FIELDS; metadata_only asks the apiserver for metadata alone."""
+    informer = None if metadata_only else watch_cache(namespace, kind, name, label_selector)
+    if informer is not None and informer.synced:
+        if not name:
+            return {"items": informer.list()}, None
+        item = informer.get(name)
+        return (item, None) if item is not None else (None, f'{kind} "{name}" not found')
+    if KUBE.enabled:
+        path = KUBE_PATHS[kind].format(namespace=quote(namespace, safe=""), name=quote(name, safe=""))
+        # resourceVersion=0 lets the apiserver answer lists from its watch cache instead of etcd.
+        params = {"labelSelector": label_selector, "resourceVersion": "0"} if label_selector else None
+        if metadata_only:
+            data, err = KUBE.get_json(path, params, timeout, KUBE_METADATA_ACCEPT if name else KUBE_METADATA_LIST_ACCEPT)
+        else:
+            data, err = KUBE.get_json(path, params, timeout)
+    else:
+        args = ["-n", namespace, "get", kind]
+        if name:
+            args.append(name)
+        if label_selector:
+            args += ["-l", label_selector]
+        data, err = kubectl_json(args, timeout=timeout)
+    if err or data is None:
+        return data, err
+    fields = {"metadata": KUBE_METADATA_FIELDS} if metadata_only else KUBE_FIELDS[kind]
+    if name:
+        return kube_project(data, fields), None
+    return {"items": [kube_project(item, fields) for item in data.get("items", []) or []]}, None
+
+
+def kube_logs(namespace: str, deployment: str, app_label: str, tail: int, timeout: int = 120) -> Dict:
+    if not KUBE.enabled:
+        return kubectl(["-n", namespace, "logs", f"deploy/{deployment}", f"--tail={tail}"], timeout=timeout)
+    pod_name = first_running_pod_name(namespace, app_label, get_terraria_pods(namespace, app_label, timeout))
+    if not pod_name:
+        return {"ok": False, "output": f"no pods found for deployment {deployment}"}
+    path = f"/api/v1/namespaces/{quote(namespace, safe='')}/pods/{quote(pod_name, safe='')}/log"
+    body, err = KUBE.request(path, {"tailLines": str(tail)}, timeout)
+    if err:
+        return {"ok": False, "output": err}
+    return {"ok": True, "output": (body or b"").decode("utf-8", errors="replace").rstrip()}
+
+
 def resolve_seed(custom_seed: str, selected_seed_ids: List[str]) -> Tuple[str, str]:
     custom_seed = (custom_seed or "").strip()
     if custom_seed:
@@ -375,7 +910,8 @@ def build_world_command(payload: Dict) -> Tuple[List[str], Dict]:
     return command, meta
 
 
-def build_upload_world_command(world_file: Path, world_name: str) -> List[str]:
+def build_upload_world_command(world_file: Path, world_name: str, upload: Optional[Dict] = None) -> List[str]:
+    upload = upload or {}
     if os.name == "nt":
         script_path = REPO_ROOT / "scripts" / "upload-world.ps1"
         return [
@@ -392,7 +928,7 @@ def build_upload_world_command(world_file: Path, world_name: str) -> List[str]:
         ]
 
     script_path = REPO_ROOT / "scripts" / "upload-world.sh"
-    return [
+    command = [
         "bash",
         str(script_path),
         "--world-file",
@@ -400,6 +936,14 @@ def build_upload_world_command(world_file: Path, world_name: str) -> List[str]:
         "--world-name",
         world_name,
     ]
+    if upload.get("encoding"):
+        command.extend(["--encoding", str(upload["encoding"])])
+    command.extend(["--max-raw-bytes", str(WORLD_MAX_RAW_BYTES)])
+    if upload.get("raw_bytes") is not None:
+        command.extend(["--expect-size", str(upload["raw_bytes"])])
+    if upload.get("raw_sha256"):
+        command.extend(["--expect-sha256", str(upload["raw_sha256"])])
+    return command
 
 
 def sanitize_world_name(world_name: str, fallback_name: str) -> str:
@@ -412,52 +956,470 @@ def sanitize_world_name(world_name: str, fallback_name: str) -> str:
     return candidate
 
 
-def save_world_upload_to_tmp(content_type: str, headers, body_stream) -> Tuple[Optional[Dict], Optional[str]]:
-    content_type = content_type or ""
-    if "multipart/form-data" not in content_type:
-        return None, "Content-Type must be multipart/form-data"
+def split_upload_encoding(file_name: str) -> Tuple[str, str]:
+    """'map.wld.gz' -> ('map.wld', 'gzip'); names without a known suffix are returned as-is."""
+    for encoding, suffix in UPLOAD_ENCODINGS.items():
+        if file_name.lower().endswith(suffix):
+            return file_name[: -len(suffix)], encoding
+    return file_name, ""
 
-    content_length = headers.get("Content-Length", "0")
-    form = cgi.FieldStorage(
-        fp=body_stream,
-        headers=headers,
-        environ={
-            "REQUEST_METHOD": "POST",
-            "CONTENT_TYPE": content_type,
-            "CONTENT_LENGTH": content_length,
-        },
-        keep_blank_values=True,
-    )
-
-    file_item = form["world_file"] if "world_file" in form else None
-    if file_item is None or not getattr(file_item, "file", None):
-        return None, "world_file is required"
-
-    uploaded_name = os.path.basename(getattr(file_item, "filename", "") or "")
-    manual_name = form.getfirst("world_name", "")
-    world_name = sanitize_world_name(manual_name, uploaded_name or "uploaded-world.wld")
 
-    tmp_dir = Path(tempfile.mkdtemp(prefix="terraria-world-upload-"))
-    tmp_file = tmp_dir / world_name
-
-    with tmp_file.open("wb") as target:
-        while True:
-            chunk = file_item.file.read(1024 * 1024)
-            if not chunk:
-                break
-            target.write(chunk)
+def open_decompressed(path: Path, encoding: str):
+    if encoding == "gzip":
+        return gzip.open(path, "rb")
+    if encoding == "zstd" and zstd is not None:
+        if hasattr(zstd, "ZstdFile"):
+            return zstd.open(path, "rb")
+        # zstandard stops after the first frame unless told otherwise; multi-threaded zstd writes several.
+        return zstd.ZstdDecompressor().stream_reader(path.open("rb"), read_across_frames=True, closefd=True)
+    return None
 
-    if tmp_file.stat().st_size == 0:
-        return None, "Uploaded file is empty"
 
+def inspect_upload(
+    tmp_dir: Path, part_file: Path, world_name: str, encoding: str, size: int, sha256: str
+) -> Tuple[Optional[Dict], Optional[str]]:
+    """Move a received upload into place and describe what it will unpack to.
+
+    Compressed uploads stay compressed all the way to the manager pod. The one decompression pass
+    here writes nothing; it checks the stream's own integrity and yields the raw size and SHA-256
+    that upload-world.sh verifies after unpacking on the PVC. Without a zstd module, .zst uploads
+    go through unverified here. The pass stops as soon as the unpacked size passes WORLD_MAX_RAW_BYTES,
+    so a small, highly compressible upload cannot keep it busy.
+    """
+    raw_bytes: Optional[int] = size
+    raw_sha256: Optional[str] = sha256
+    if not encoding and size > WORLD_MAX_RAW_BYTES:
+        return None, f"Unpacked world exceeds WORLD_MAX_RAW_BYTES ({WORLD_MAX_RAW_BYTES} bytes)"
+    if encoding:
+        raw_bytes = None
+        raw_sha256 = None
+        stream = open_decompressed(part_file, encoding)
+        if stream is not None:
+            digest = hashlib.sha256()
+            raw_bytes = 0
+            try:
+                with stream:
+                    for chunk in iter(lambda: stream.read(UPLOAD_CHUNK_BYTES), b""):
+                        digest.update(chunk)
+                        raw_bytes += len(chunk)
+                        if raw_bytes > WORLD_MAX_RAW_BYTES:
+                            return None, f"Unpacked world exceeds WORLD_MAX_RAW_BYTES ({WORLD_MAX_RAW_BYTES} bytes)"
+            except Exception as exc:
+                return None, f"{encoding} data is corrupt: {exc}"
+            raw_sha256 = digest.hexdigest()
+            if raw_bytes == 0:
+                return None, "Uploaded file is empty"
+
+    tmp_file = tmp_dir / (world_name + UPLOAD_ENCODINGS.get(encoding, ""))
+    part_file.rename(tmp_file)
     return {
         "world_name": world_name,
         "tmp_dir": str(tmp_dir),
         "tmp_file": str(tmp_file),
-        "bytes": tmp_file.stat().st_size,
+        "bytes": size,
+        "sha256": sha256,
+        "encoding": encoding,
+        "raw_bytes": raw_bytes,
+        "raw_sha256": raw_sha256,
     }, None
 
 
+def parse_header_params(value: str) -> Tuple[str, Dict[str, str]]:
+    """Split 'type; key="value"; ...' into the main value and its parameters."""
+    main, _, rest = (value or "").partition(";")
+    params: Dict[str, str] = {}
+    for key, raw in re.findall(r';\s*([^=;\s]+)\s*=\s*("(?:[^"\\]|\\.)*"|[^;]*)', ";" + rest):
+        raw = raw.strip()
+        if len(raw) >= 2 and raw[0] == raw[-1] == '"':
+            raw = raw[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+        params[key.lower()] = raw
+    return main.strip().lower(), params
+
+
+class MultipartReader:
+    """Incremental multipart/form-data parser over a body of known length.
+
+    Only one chunk plus the boundary is ever held in memory; part bodies are handed to the caller as
+    they arrive, so a file part can go straight to its destination.
+    """
+
+    def __init__(self, stream, boundary: bytes, length: int, on_progress=None) -> None:
+        self.stream = stream
+        self.remaining = length
+        self.delimiter = b"\r\n--" + boundary
+        self.buffer = b"\r\n"  # lets the first boundary match the same delimiter as the rest
+        self.received = 0
+        self.on_progress = on_progress
+        self.finished = False
+
+    def _fill(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        chunk = self.stream.read(min(UPLOAD_CHUNK_BYTES, self.remaining))
+        if not chunk:
+            raise ValueError("upload ended before the multipart body was complete")
+        self.remaining -= len(chunk)
+        self.received += len(chunk)
+        self.buffer += chunk
+        if self.on_progress:
+            self.on_progress(self.received)
+        return True
+
+    def _read_until(self, marker: bytes, limit: int) -> bytes:
+        while True:
+            index = self.buffer.find(marker)
+            if index >= 0:
+                value = self.buffer[:index]
+                self.buffer = self.buffer[index + len(marker) :]
+                return value
+            if len(self.buffer) > limit or not self._fill():
+                raise ValueError("malformed multipart body")
+
+    def _after_boundary(self) -> None:
+        # A boundary is followed by CRLF before the next part, or by "--" after the last one.
+        while len(self.buffer) < 2 and self._fill():
+            pass
+        if self.buffer.startswith(b"--"):
+            self.finished = True
+        elif not self.buffer.startswith(b"\r\n"):
+            raise ValueError("malformed multipart boundary")
+        self.buffer = self.buffer[2:]
+
+    def drain(self) -> None:
+        # Read whatever follows the closing boundary so the connection is left clean.
+        while self._fill():
+            self.buffer = b""
+
+    def parts(self):
+        """Yield (headers, body chunks) per part; each body iterator must be drained before the next part."""
+        self._read_until(self.delimiter, 64 * 1024)  # preamble
+        self._after_boundary()
+        while not self.finished:
+            headers: Dict[str, str] = {}
+            for line in self._read_until(b"\r\n\r\n", 16 * 1024).split(b"\r\n"):
+                name, _, value = line.decode("utf-8", errors="replace").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            yield headers, self._body()
+
+    def _body(self):
+        keep = len(self.delimiter) - 1
+        while True:
+            index = self.buffer.find(self.delimiter)
+            if index >= 0:
+                if index:
+                    yield self.buffer[:index]
+                self.buffer = self.buffer[index + len(self.delimiter) :]
+                self._after_boundary()
+                return
+            # Everything but a possible partial delimiter at the end is body.
+            if len(self.buffer) > keep:
+                yield self.buffer[:-keep]
+                self.buffer = self.buffer[-keep:]
+            if not self._fill():
+                raise ValueError("multipart body ended without a closing boundary")
+
+
+def read_form_field(body, limit: int) -> bytes:
+    # Keep at most limit bytes; the rest of the field is drained without being held in memory.
+    value = b""
+    for chunk in body:
+        if len(value) < limit:
+            value += chunk[: limit - len(value)]
+    return value
+
+
+def save_world_upload_to_tmp(
+    content_type: str, headers, body_stream, on_progress=None
+) -> Tuple[Optional[Dict], Optional[str]]:
+    main_type, params = parse_header_params(content_type or "")
+    if main_type != "multipart/form-data" or not params.get("boundary"):
+        return None, "Content-Type must be multipart/form-data"
+    try:
+        content_length = int(headers.get("Content-Length", "0"))
+    except ValueError:
+        return None, "Invalid Content-Length"
+    if content_length <= 0:
+        return None, "Empty body"
+
+    reader = MultipartReader(body_stream, params["boundary"].encode("latin-1"), content_length, on_progress)
+    tmp_dir = Path(tempfile.mkdtemp(prefix="terraria-world-upload-"))
+    # world_name may arrive after the file, so the file is renamed into place once the form is read.
+    part_file = tmp_dir / "upload.part"
+    uploaded_name = ""
+    manual_name = ""
+    encoding = ""
+    file_seen = False
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        for part_headers, body in reader.parts():
+            _, disposition = parse_header_params(part_headers.get("content-disposition", ""))
+            field = disposition.get("name", "")
+            if field == "world_file" and "filename" in disposition and not file_seen:
+                file_seen = True
+                uploaded_name = os.path.basename(disposition["filename"])
+                with part_file.open("wb") as target:
+                    for chunk in body:
+                        digest.update(chunk)
+                        target.write(chunk)
+                        size += len(chunk)
+            elif field == "world_name":
+                manual_name = read_form_field(body, 1024).decode("utf-8", errors="replace")
+            elif field == "encoding":
+                encoding = read_form_field(body, 16).decode("ascii", errors="replace").strip().lower()
+            else:
+                for _ in body:
+                    pass
+        reader.drain()
+    except (OSError, ValueError) as exc:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None, f"Upload failed: {exc}"
+
+    if not file_seen:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None, "world_file is required"
+    if size == 0:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None, "Uploaded file is empty"
+
+    # The encoding comes from the form or from a .gz/.zst suffix on the uploaded file name.
+    uploaded_name, suffix_encoding = split_upload_encoding(uploaded_name)
+    encoding = encoding or suffix_encoding
+    if encoding and encoding not in UPLOAD_ENCODINGS:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None, f"encoding must be one of: {', '.join(UPLOAD_ENCODINGS)}"
+    world_name = sanitize_world_name(split_upload_encoding(manual_name)[0], uploaded_name or "uploaded-world.wld")
+    saved, err = inspect_upload(tmp_dir, part_file, world_name, encoding, size, digest.hexdigest())
+    if err:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return saved, err
+
+
+class UploadSession:
+    """A resumable upload: parts of a fixed size are written in any order into a preallocated file.
+
+    The session id is also the id of its upload job, so received_bytes shows up on /api/events as
+    parts land. Sessions untouched for UPLOAD_SESSION_TTL are dropped along with their file.
+    Parts being written are tracked under the lock: finish() refuses while any are in flight, and a
+    discard() that races a writer leaves removing the file to the last writer out.
+    """
+
+    def __init__(self, world_name: str, size: int, part_size: int, sha256: str, encoding: str) -> None:
+        self.world_name = world_name
+        self.size = size
+        self.part_size = part_size
+        self.parts = max(1, -(-size // part_size))
+        self.sha256 = sha256
+        self.encoding = encoding
+        self.lock = threading.Lock()
+        self.received: set = set()
+        self.received_bytes = 0
+        self.writing: set = set()
+        self.finishing = False
+        self.closed = False
+        self.touched = time.monotonic()
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="terraria-world-upload-"))
+        self.part_file = self.tmp_dir / "upload.part"
+        with self.part_file.open("wb") as handle:
+            handle.truncate(size)
+        self.job = job_create("upload-world", {"world_name": world_name, "bytes": size, "encoding": encoding})
+        self.id = self.job["id"]
+        job_update(self.id, stage="receiving", received_bytes=0, total_bytes=size)
+
+    def part_length(self, index: int) -> int:
+        return min(self.part_size, self.size - index * self.part_size)
+
+    def missing(self) -> List[int]:
+        with self.lock:
+            return [index for index in range(self.parts) if index not in self.received]
+
+    def status(self) -> Dict:
+        missing = self.missing()
+        return {
+            "ok": True,
+            "upload_id": self.id,
+            "world_name": self.world_name,
+            "size": self.size,
+            "encoding": self.encoding,
+            "part_size": self.part_size,
+            "parts": self.parts,
+            "received_bytes": self.received_bytes,
+            "missing": missing,
+        }
+
+    def write_part(self, index: int, stream, length: int, checksum: str) -> Tuple[Optional[Dict], Optional[str]]:
+        if not 0 <= index < self.parts:
+            return None, f"part must be between 0 and {self.parts - 1}"
+        expected = self.part_length(index)
+        if length != expected:
+            return None, f"part {index} must be {expected} bytes, got {length}"
+        with self.lock:
+            if self.closed:
+                return None, "upload was discarded"
+            if self.finishing:
+                return None, "upload is being finalized"
+            if index in self.writing:
+                return None, f"part {index} is already being written"
+            # A resend overwrites the bytes in place, so the part stops counting as received until its
+            # new checksum has been verified.
+            if index in self.received:
+                self.received.discard(index)
+                self.received_bytes -= length
+            self.writing.add(index)
+        self.touched = time.monotonic()
+        try:
+            actual, err = self._write_range(index, stream, length)
+            if not err and checksum and checksum.lower() != actual:
+                err = f"part {index} checksum mismatch: got {actual}"
+            with self.lock:
+                if not err and self.closed:
+                    err = "upload was discarded"
+                if not err:
+                    self.received.add(index)
+                    self.received_bytes += length
+                received_bytes = self.received_bytes
+        finally:
+            with self.lock:
+                self.writing.discard(index)
+                cleanup = self.closed and not self.writing
+            if cleanup:
+                shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        job_update(self.id, received_bytes=received_bytes)
+        if err:
+            return None, err
+        return {"ok": True, "part": index, "sha256": actual, "received_bytes": received_bytes}, None
+
+    def _write_range(self, index: int, stream, length: int) -> Tuple[str, Optional[str]]:
+        digest = hashlib.sha256()
+        offset = index * self.part_size
+        try:
+            fd = os.open(self.part_file, os.O_WRONLY)
+        except OSError as exc:
+            return "", f"upload file is not available: {exc}"
+        try:
+            remaining = length
+            while remaining:
+                chunk = stream.read(min(UPLOAD_CHUNK_BYTES, remaining))
+                if not chunk:
+                    return "", f"part {index} ended after {length - remaining} of {length} bytes"
+                digest.update(chunk)
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                remaining -= len(chunk)
+        except OSError as exc:
+            return "", f"part {index} could not be written: {exc}"
+        finally:
+            os.close(fd)
+        return digest.hexdigest(), None
+
+    def finish(self) -> Tuple[Optional[Dict], Optional[str]]:
+        with self.lock:
+            if self.closed:
+                return None, "upload was discarded"
+            if self.finishing:
+                return None, "upload is already being finalized"
+            if self.writing:
+                return None, f"{len(self.writing)} parts are still being written"
+            if len(self.received) != self.parts:
+                return None, f"{self.parts - len(self.received)} parts are still missing"
+            self.finishing = True
+
+        digest = hashlib.sha256()
+        with self.part_file.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(UPLOAD_CHUNK_BYTES), b""):
+                digest.update(chunk)
+        actual = digest.hexdigest()
+        err = None
+        if self.sha256 and self.sha256.lower() != actual:
+            err = f"file checksum mismatch: got {actual}"
+        else:
+            saved, err = inspect_upload(self.tmp_dir, self.part_file, self.world_name, self.encoding, self.size, actual)
+            if not err:
+                return saved, None
+        with self.lock:
+            # Something slipped past the part checksums; make the client send everything again.
+            self.received.clear()
+            self.received_bytes = 0
+            self.finishing = False
+        return None, f"{err}; all parts must be sent again"
+
+    def discard(self, reason: str) -> Optional[str]:
+        with self.lock:
+            if self.finishing:
+                return "upload is being finalized"
+            self.closed = True
+            pending = bool(self.writing)
+        if not pending:
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        job_append(self.id, reason)
+        job_update(self.id, status="error", ok=False, finished_at=now_rfc3339())
+        return None
+
+
+UPLOADS_LOCK = threading.Lock()
+UPLOADS: Dict[str, UploadSession] = {}
+
+
+def upload_sessions_expire() -> None:
+    cutoff = time.monotonic() - UPLOAD_SESSION_TTL
+    with UPLOADS_LOCK:
+        expired = [session for session in UPLOADS.values() if session.touched < cutoff and not session.finishing]
+        for session in expired:
+            del UPLOADS[session.id]
+    for session in expired:
+        session.discard(f"Upload expired after {UPLOAD_SESSION_TTL:g}s without activity")
+
+
+def upload_create(payload: Dict) -> Tuple[Optional[UploadSession], Optional[str]]:
+    upload_sessions_expire()
+    try:
+        size = int(payload.get("size", 0))
+        part_size = int(payload.get("part_size") or UPLOAD_PART_BYTES)
+    except (TypeError, ValueError):
+        return None, "size and part_size must be integers"
+    if size <= 0:
+        return None, "size must be positive"
+    if size > UPLOAD_MAX_BYTES:
+        return None, f"Upload exceeds UPLOAD_MAX_BYTES ({UPLOAD_MAX_BYTES} bytes)"
+    part_size = max(256 * 1024, min(64 * 1024 * 1024, part_size))
+    sha256 = str(payload.get("sha256", "") or "").strip()
+    if sha256 and not re.fullmatch(r"[0-9a-fA-F]{64}", sha256):
+        return None, "sha256 must be 64 hex characters"
+    encoding = str(payload.get("encoding", "") or "").strip().lower()
+    if encoding and encoding not in UPLOAD_ENCODINGS:
+        return None, f"encoding must be one of: {', '.join(UPLOAD_ENCODINGS)}"
+    world_name = sanitize_world_name(split_upload_encoding(str(payload.get("world_name", "")))[0], "uploaded-world.wld")
+    session = UploadSession(world_name, size, part_size, sha256, encoding)
+    with UPLOADS_LOCK:
+        UPLOADS[session.id] = session
+    return session, None
+
+
+def upload_get(upload_id: str) -> Optional[UploadSession]:
+    with UPLOADS_LOCK:
+        return UPLOADS.get(upload_id)
+
+
+def upload_remove(upload_id: str) -> Optional[UploadSession]:
+    with UPLOADS_LOCK:
+        return UPLOADS.pop(upload_id, None)
+
+
+def upload_meta(saved: Dict) -> Dict:
+    return {key: saved[key] for key in ("world_name", "bytes", "sha256", "encoding", "raw_bytes", "raw_sha256")}
+
+
+def start_upload_job(job_id: str, saved: Dict) -> None:
+    job_update(job_id, stage="uploaded", received_bytes=saved["bytes"], meta=upload_meta(saved))
+    line = f"Received {saved['world_name']}: {saved['bytes']} bytes, sha256 {saved['sha256']}"
+    if saved["encoding"]:
+        raw = "unknown size" if saved["raw_bytes"] is None else f"{saved['raw_bytes']} bytes, sha256 {saved['raw_sha256']}"
+        line += f" ({saved['encoding']}; unpacks to {raw})"
+    job_append(job_id, line)
+    thread = threading.Thread(target=run_upload_job, args=(job_id, saved), daemon=True)
+    thread.start()
+
+
 def stage_from_line(line: str) -> Optional[str]:
     l = (line or "").lower()
     if "escalando" in l and "replicas" in l:
@@ -475,9 +1437,25 @@ def stage_from_line(line: str) -> Optional[str]:
     return None
 
 
-def run_upload_job(job_id: str, tmp_dir: Path, tmp_file: Path, world_name: str, bytes_size: int) -> None:
+def run_upload_job(job_id: str, saved: Dict) -> None:
     started = time.time()
-    command = build_upload_world_command(tmp_file, world_name)
+    tmp_dir = Path(str(saved["tmp_dir"]))
+    tmp_file = Path(str(saved["tmp_file"]))
+    world_name = str(saved["world_name"])
+    if os.name == "nt" and saved["encoding"]:
+        # upload-world.ps1 only copies raw files, so unpack here first.
+        raw_file = tmp_dir / world_name
+        stream = open_decompressed(tmp_file, saved["encoding"])
+        if stream is None:
+            job_append(job_id, f"No {saved['encoding']} decoder available on this host")
+            job_update(job_id, status="error", ok=False, finished_at=now_rfc3339())
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        with stream, raw_file.open("wb") as target:
+            shutil.copyfileobj(stream, target, UPLOAD_CHUNK_BYTES)
+        tmp_file.unlink()
+        tmp_file = raw_file
+    command = build_upload_world_command(tmp_file, world_name, saved)
     job_update(job_id, stage="running_script")
     job_append(job_id, f"$ {' '.join(command)}")
 
@@ -518,33 +1496,24 @@ def run_upload_job(job_id: str, tmp_dir: Path, tmp_file: Path, world_name: str,
         exit_code=rc,
         finished_at=now_rfc3339(),
         duration_seconds=round(time.time() - started, 2),
-        meta={
-            "world_name": world_name,
-            "bytes": bytes_size,
-            "command": command,
-        },
+        meta={**upload_meta(saved), "command": command},
     )
     if not ok:
         job_append(job_id, f"(exit code {rc})")
-
-    try:
-        if tmp_file.exists():
-            tmp_file.unlink()
-        if tmp_dir.exists():
-            tmp_dir.rmdir()
-    except OSError:
-        pass
+    MANAGEMENT_SNAPSHOT.invalidate()
+    shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
-def get_terraria_pods(namespace: str, app_label: str) -> List[Dict]:
-    data, err = kubectl_json(["-n", namespace, "get", "pods", "-l", f"app={app_label}"])
+def get_terraria_pods(namespace: str, app_label: str, timeout: int = 120) -> List[Dict]:
+    data, err = kube_get(namespace, "pods", label_selector=f"app={app_label}", timeout=timeout)
     if err or not data:
         return []
     return data.get("items", []) or []
 
 
-def first_running_pod_name(namespace: str, app_label: str) -> Optional[str]:
-    pods = get_terraria_pods(namespace, app_label)
+def first_running_pod_name(namespace: str, app_label: str, pods: Optional[List[Dict]] = None) -> Optional[str]:
+    if pods is None:
+        pods = get_terraria_pods(namespace, app_label)
     for item in pods:
         if item.get("status", {}).get("phase") == "Running":
             return item.get("metadata", {}).get("name")
@@ -553,10 +1522,160 @@ def first_running_pod_name(namespace: str, app_label: str) -> Optional[str]:
     return None
 
 
-def list_worlds(namespace: str, app_label: str) -> List[str]:
-    pod_name = first_running_pod_name(namespace, app_label)
+class WldReader:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+
+    def unpack(self, fmt: str) -> Tuple:
+        values = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return values
+
+    def string(self) -> str:
+        # .NET BinaryWriter strings carry a 7-bit encoded length prefix.
+        length = 0
+        shift = 0
+        while True:
+            part = self.unpack("<B")[0]
+            length |= (part & 0x7F) << shift
+            shift += 7
+            if not part & 0x80:
+                break
+        value = self.data[self.pos : self.pos + length].decode("utf-8", errors="replace")
+        self.pos += length
+        return value
+
+
+def read_wld_summary(path: Path) -> Dict:
+    """Parse only the file and world header of a .wld, never the tile data."""
+    with path.open("rb") as handle:
+        data = handle.read(4096)
+        reader = WldReader(data)
+        version = reader.unpack("<i")[0]
+        if version < 140:
+            raise ValueError(f"unsupported .wld version {version}")
+        if reader.unpack("<7sB")[0] != b"relogic":
+            raise ValueError("not a Terraria world file")
+        reader.unpack("<IQ")  # revision, favorite flags
+        sections = reader.unpack(f"<{reader.unpack('<h')[0]}i")
+        if len(sections) < 2:
+            raise ValueError("truncated section table")
+        # The world header ends where the tile section starts.
+        if sections[1] > len(data):
+            data += handle.read(sections[1] - len(data))
+    reader = WldReader(data)
+    reader.pos = sections[0]
+
+    name = reader.string()
+    seed = ""
+    if version >= 179:
+        seed = str(reader.unpack("<i")[0]) if version == 179 else reader.string()
+        reader.unpack("<Q")  # generator version
+    if version >= 181:
+        reader.pos += 16  # unique id
+    reader.unpack("<5i")  # world id and pixel bounds
+    height, width = reader.unpack("<2i")
+    game_mode = 0
+    if version >= 209:
+        game_mode = reader.unpack("<i")[0]
+        reader.pos += sum(1 for flag_version in (222, 227, 238, 239, 241, 249, 266, 267) if version >= flag_version)
+    else:
+        if version >= 112 and reader.unpack("<?")[0]:
+            game_mode = 1
+        if version == 208 and reader.unpack("<?")[0]:
+            game_mode = 2
+    if version >= 141:
+        reader.unpack("<q")  # creation time
+    reader.unpack("<B")  # moon type
+    reader.unpack("<7i7i3i2i")  # tree/cave styles, ice/jungle/hell styles, spawn
+    reader.unpack("<3d")  # surface, rock layer, time
+    reader.unpack("<?i??2i")  # day time, moon phase, blood moon, eclipse, dungeon
+    crimson = reader.unpack("<?")[0]
+    reader.pos += 10 + (1 if version >= 118 else 0) + 7  # boss and NPC progression flags
+    reader.unpack("<??Bi")  # shadow orbs, meteor, orb count, altar count
+    hardmode = reader.unpack("<?")[0]
+    return {
+        "world_name": name,
+        "seed": seed,
+        "version": version,
+        "width": width,
+        "height": height,
+        "size": WORLD_SIZES.get(width, f"{width}x{height}"),
+        "difficulty": WORLD_DIFFICULTIES.get(game_mode, str(game_mode)),
+        "evil": "crimson" if crimson else "corruption",
+        "hardmode": hardmode,
+    }
+
+
+class WorldCatalog:
+    """.wld files in WORLDS_DIR with their parsed headers.
+
+    The directory is rescanned on every call, which is only a stat per file. A header is parsed again
+    only when that file's size or mtime changed, and the sorted list is rebuilt only when some file
+    was added, removed or rewritten.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.headers: Dict[Tuple[str, int, int], Dict] = {}
+        self.signature: Optional[Tuple] = None
+        self.worlds: List[Dict] = []
+
+    @property
+    def available(self) -> bool:
+        return self.directory.is_dir()
+
+    def list(self) -> List[Dict]:
+        with os.scandir(self.directory) as entries:
+            files = sorted(
+                (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                for entry in entries
+                if entry.name.endswith(".wld") and entry.is_file()
+            )
+        signature = tuple(files)
+        with self.lock:
+            if signature == self.signature:
+                return self.worlds
+            headers: Dict[Tuple[str, int, int], Dict] = {}
+            worlds: List[Dict] = []
+            for key in files:
+                name, size, mtime_ns = key
+                header = self.headers.get(key)
+                if header is None:
+                    try:
+                        header = read_wld_summary(self.directory / name)
+                    except struct.error:
+                        header = {"error": "truncated world header"}
+                    except (OSError, ValueError) as exc:
+                        header = {"error": str(exc)}
+                headers[key] = header
+                worlds.append(
+                    {
+                        "name": name,
+                        "file_size": size,
+                        "last_played": datetime.fromtimestamp(mtime_ns / 1e9, timezone.utc).isoformat(),
+                        **header,
+                    }
+                )
+            self.headers = headers
+            self.signature = signature
+            self.worlds = worlds
+            return worlds
+
+
+WORLD_CATALOG = WorldCatalog(WORLDS_DIR)
+
+
+def list_worlds(namespace: str, app_label: str, pods: Optional[List[Dict]] = None, timeout: int = 60) -> List[Dict]:
+    if WORLD_CATALOG.available:
+        return WORLD_CATALOG.list()
+
+    # Without the config volume mounted (local runs), only file names are available, listed inside a pod.
+    pod_name = first_running_pod_name(namespace, app_label, pods)
     if not pod_name:
-        manager_data, _ = kubectl_json(["-n", namespace, "get", "pod", "world-manager"])
+        manager_data, _ = kube_get(namespace, "pod", "world-manager", timeout=timeout, metadata_only=True)
         if manager_data:
             pod_name = "world-manager"
     if not pod_name:
@@ -572,10 +1691,10 @@ def list_worlds(namespace: str, app_label: str) -> List[str]:
         "-lc",
         "ls -1 /config/*.wld 2>/dev/null | sed 's#.*/##' | sort",
     ]
-    res = kubectl(command, timeout=60)
+    res = kubectl(command, timeout=timeout)
     if not res["ok"]:
         return []
-    return [line.strip() for line in (res["stdout"] or "").splitlines() if line.strip()]
+    return [{"name": line.strip()} for line in (res["stdout"] or "").splitlines() if line.strip()]
 
 
 def get_prometheus_urls() -> List[str]:
@@ -586,108 +1705,168 @@ def get_prometheus_urls() -> List[str]:
     return urls or DEFAULT_PROMETHEUS_URLS
 
 
-def query_prometheus_scalar(query: str) -> Optional[float]:
-    for base_url in get_prometheus_urls():
+class PrometheusEndpoints:
+    """Failover order for PROMETHEUS_URLS.
+
+    The last URL that answered is tried first. A URL that fails is skipped for PROMETHEUS_BREAKER_SECONDS,
+    doubling on each consecutive failure up to PROMETHEUS_BREAKER_MAX_SECONDS. When every URL is open
+    they are all tried anyway, so a recovered Prometheus is noticed without waiting out the breaker.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.healthy: Optional[str] = None
+        self.failures: Dict[str, int] = {}
+        self.open_until: Dict[str, float] = {}
+
+    def order(self) -> List[str]:
+        urls = get_prometheus_urls()
+        now = time.monotonic()
+        with self.lock:
+            if self.healthy in urls:
+                urls = [self.healthy] + [url for url in urls if url != self.healthy]
+            closed = [url for url in urls if self.open_until.get(url, 0) <= now]
+        return closed or urls
+
+    def succeeded(self, url: str) -> None:
+        with self.lock:
+            self.healthy = url
+            self.failures.pop(url, None)
+            self.open_until.pop(url, None)
+
+    def failed(self, url: str) -> None:
+        with self.lock:
+            count = self.failures.get(url, 0) + 1
+            self.failures[url] = count
+            backoff = min(PROMETHEUS_BREAKER_MAX_SECONDS, PROMETHEUS_BREAKER_SECONDS * 2 ** (count - 1))
+            self.open_until[url] = time.monotonic() + backoff
+            if self.healthy == url:
+                self.healthy = None
+
+
+PROMETHEUS = PrometheusEndpoints()
+
+
+def query_prometheus(query: str, timeout: float = PROMETHEUS_TIMEOUT_SECONDS) -> Optional[List[Dict]]:
+    """Run an instant query and return its result vector, or None when no Prometheus answered."""
+    for base_url in PROMETHEUS.order():
         try:
             url = f"{base_url}/api/v1/query?query={quote(query, safe='')}"
             req = Request(url, method="GET")
-            with urlopen(req, timeout=3) as response:
+            with urlopen(req, timeout=timeout) as response:
                 payload = json.loads(response.read().decode("utf-8"))
             if payload.get("status") != "success":
-                continue
-            result = payload.get("data", {}).get("result", [])
-            if not result:
-                return 0.0
-            value = result[0].get("value", [None, None])[1]
-            return float(value)
+                raise ValueError(payload.get("error") or "query failed")
         except Exception:
+            PROMETHEUS.failed(base_url)
             continue
+        PROMETHEUS.succeeded(base_url)
+        return payload.get("data", {}).get("result", []) or []
     return None
 
 
-def scrape_metric_snapshot() -> Dict:
-    def pick(query: str) -> Optional[float]:
-        return query_prometheus_scalar(query)
-
-    return {
-        "source_up": pick("max(terraria_exporter_source_up)"),
-        "world_parser_up": pick("max(terraria_world_parser_up)"),
-        "players_online": pick("max(terraria_players_online)"),
-        "players_max": pick("max(terraria_players_max)"),
-        "hardmode": pick("max(terraria_world_hardmode)"),
-        "blood_moon": pick("max(terraria_world_blood_moon)"),
-        "eclipse": pick("max(terraria_world_eclipse)"),
-        "world_time": pick("max(terraria_world_time)"),
-        "chests_total": pick("max(terraria_world_chests_total)"),
-        "houses_total": pick("max(terraria_world_houses_total)"),
-        "housed_npcs_total": pick("max(terraria_world_housed_npcs_total)"),
-    }
+def fetch_exporter_snapshot() -> Optional[Dict]:
+    url = os.environ.get("EXPORTER_SNAPSHOT_URL", DEFAULT_EXPORTER_SNAPSHOT_URL).strip()
+    if not url:
+        return None
+    try:
+        req = Request(url, method="GET", headers={"Accept": "application/json"})
+        with urlopen(req, timeout=2) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+            headers = response.headers
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or not payload.get("ok"):
+        return None
+    # The body only carries absolute times so its ETag holds still; the refresh ages come as headers.
+    ages = dict(payload.get("times") or {})
+    for key, header in (("runtime_age_seconds", "X-Runtime-Age-Seconds"), ("world_age_seconds", "X-World-Age-Seconds")):
+        try:
+            ages[key] = float(headers[header])
+        except (KeyError, TypeError, ValueError):
+            ages[key] = None
+    payload["ages"] = ages
+    return payload
 
 
-def build_management_snapshot(namespace: str, deployment: str, service: str, app_label: str) -> Dict:
+def scrape_metric_snapshot() -> Dict:
+    exporter_snapshot = fetch_exporter_snapshot()
+    if exporter_snapshot is not None:
+        metrics = exporter_snapshot.get("metrics") or {}
+        snapshot = {key: metrics.get(key) for key in METRIC_SNAPSHOT_KEYS}
+        snapshot["source"] = "exporter"
+        snapshot["ages"] = exporter_snapshot.get("ages") or {}
+        return snapshot
+
+    # One instant query for every gauge: max by (__name__) reduces each metric server-side, and the
+    # vector is split back into snapshot keys here.
+    query = "max by (__name__) ({__name__=~\"%s\"})" % "|".join(PROMETHEUS_SNAPSHOT_METRICS.values())
+    result = query_prometheus(query)
+    values: Dict[str, float] = {}
+    for sample in result or []:
+        try:
+            values[sample["metric"]["__name__"]] = float(sample["value"][1])
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
     snapshot: Dict = {
-        "ok": True,
-        "timestamp": now_rfc3339(),
-        "namespace": namespace,
-        "deployment_name": deployment,
-        "service_name": service,
-        "issues": [],
+        key: (None if result is None else values.get(metric, 0.0)) for key, metric in PROMETHEUS_SNAPSHOT_METRICS.items()
     }
+    snapshot["source"] = "prometheus"
+    return snapshot
+
 
-    deployment_data, deployment_err = kubectl_json(["-n", namespace, "get", "deployment", deployment])
+def snapshot_deployment(namespace: str, deployment: str, timeout: int) -> Dict:
+    deployment_data, deployment_err = kube_get(namespace, "deployment", deployment, timeout=timeout)
     if deployment_err:
-        snapshot["issues"].append(f"deployment: {deployment_err}")
-        snapshot["ok"] = False
-        snapshot["deployment"] = None
-    else:
-        spec = deployment_data.get("spec", {})
-        status = deployment_data.get("status", {})
-        containers = (spec.get("template", {}).get("spec", {}).get("containers", []) or [])
-        env_vars = {}
-        image = ""
-        if containers:
-            first = containers[0]
-            image = first.get("image", "")
-            for env in first.get("env", []) or []:
-                name = env.get("name")
-                if name:
-                    env_vars[name] = env.get("value", "")
-        snapshot["deployment"] = {
-            "replicas_desired": spec.get("replicas", 0),
-            "replicas_ready": status.get("readyReplicas", 0),
-            "replicas_available": status.get("availableReplicas", 0),
-            "observed_generation": status.get("observedGeneration"),
-            "image": image,
-            "world": env_vars.get("world", ""),
-            "worldpath": env_vars.get("worldpath", ""),
-        }
+        raise RuntimeError(deployment_err)
+    spec = deployment_data.get("spec", {})
+    status = deployment_data.get("status", {})
+    containers = (spec.get("template", {}).get("spec", {}).get("containers", []) or [])
+    env_vars = {}
+    image = ""
+    if containers:
+        first = containers[0]
+        image = first.get("image", "")
+        for env in first.get("env", []) or []:
+            name = env.get("name")
+            if name:
+                env_vars[name] = env.get("value", "")
+    return {
+        "replicas_desired": spec.get("replicas", 0),
+        "replicas_ready": status.get("readyReplicas", 0),
+        "replicas_available": status.get("availableReplicas", 0),
+        "observed_generation": status.get("observedGeneration"),
+        "image": image,
+        "world": env_vars.get("world", ""),
+        "worldpath": env_vars.get("worldpath", ""),
+    }
 
-    service_data, service_err = kubectl_json(["-n", namespace, "get", "service", service])
+
+def snapshot_service(namespace: str, service: str, timeout: int) -> Dict:
+    service_data, service_err = kube_get(namespace, "service", service, timeout=timeout)
     if service_err:
-        snapshot["issues"].append(f"service: {service_err}")
-        snapshot["service"] = None
-    else:
-        ports = service_data.get("spec", {}).get("ports", []) or []
-        port_map = {port.get("name"): port for port in ports}
-        snapshot["service"] = {
-            "cluster_ip": service_data.get("spec", {}).get("clusterIP"),
-            "type": service_data.get("spec", {}).get("type"),
-            "node_port_terraria": (port_map.get("terraria") or {}).get("nodePort"),
-            "node_port_api": (port_map.get("terraria-api") or {}).get("nodePort"),
-            "port_terraria": (port_map.get("terraria") or {}).get("port"),
-            "port_api": (port_map.get("terraria-api") or {}).get("port"),
-        }
+        raise RuntimeError(service_err)
+    ports = service_data.get("spec", {}).get("ports", []) or []
+    port_map = {port.get("name"): port for port in ports}
+    return {
+        "cluster_ip": service_data.get("spec", {}).get("clusterIP"),
+        "type": service_data.get("spec", {}).get("type"),
+        "node_port_terraria": (port_map.get("terraria") or {}).get("nodePort"),
+        "node_port_api": (port_map.get("terraria-api") or {}).get("nodePort"),
+        "port_terraria": (port_map.get("terraria") or {}).get("port"),
+        "port_api": (port_map.get("terraria-api") or {}).get("port"),
+    }
 
-    endpoints_data, endpoints_err = kubectl_json(["-n", namespace, "get", "endpoints", service])
+
+def snapshot_endpoints(namespace: str, service: str, timeout: int) -> Dict:
+    endpoints_data, endpoints_err = kube_get(namespace, "endpoints", service, timeout=timeout)
     if endpoints_err:
-        snapshot["issues"].append(f"endpoints: {endpoints_err}")
-        snapshot["endpoints"] = {"ready": 0}
-    else:
-        subsets = endpoints_data.get("subsets", []) or []
-        ready_addresses = sum(len(subset.get("addresses", []) or []) for subset in subsets)
-        snapshot["endpoints"] = {"ready": ready_addresses}
+        raise RuntimeError(endpoints_err)
+    subsets = endpoints_data.get("subsets", []) or []
+    return {"ready": sum(len(subset.get("addresses", []) or []) for subset in subsets)}
 
-    pods = get_terraria_pods(namespace, app_label)
+
+def snapshot_pod_rows(pods: List[Dict]) -> List[Dict]:
     pod_rows = []
     for item in pods:
         status = item.get("status", {})
@@ -707,25 +1886,175 @@ def build_management_snapshot(namespace: str, deployment: str, service: str, app
                 "node": status.get("nodeName"),
             }
         )
-    snapshot["pods"] = pod_rows
+    return pod_rows
 
-    worlds = list_worlds(namespace, app_label)
-    snapshot["worlds"] = worlds
-    active_world = ""
-    if snapshot.get("deployment"):
-        active_world = snapshot["deployment"].get("world", "")
-    snapshot["active_world_exists"] = bool(active_world and active_world in worlds)
 
-    logs = kubectl(["-n", namespace, "logs", f"deploy/{deployment}", "--tail=120"], timeout=90)
-    snapshot["logs"] = {
+def snapshot_logs(namespace: str, deployment: str, app_label: str, timeout: int) -> Dict:
+    logs = kube_logs(namespace, deployment, app_label, 120, timeout=timeout)
+    return {
         "ok": logs["ok"],
         "tail": logs["output"] if logs["output"] else "(no logs)",
     }
 
-    snapshot["metrics"] = scrape_metric_snapshot()
+
+def build_management_snapshot(namespace: str, deployment: str, service: str, app_label: str) -> Dict:
+    snapshot: Dict = {
+        "ok": True,
+        "timestamp": now_rfc3339(),
+        "namespace": namespace,
+        "deployment_name": deployment,
+        "service_name": service,
+        "issues": [],
+    }
+
+    # Every section is independent, so the snapshot costs about as much as its slowest call.
+    # Calls still running at the deadline are reported as issues and their section keeps its empty value.
+    deadline = time.monotonic() + MANAGEMENT_DEADLINE_SECONDS
+    timeout = max(1, int(MANAGEMENT_DEADLINE_SECONDS))
+    futures = {
+        "deployment": MANAGEMENT_POOL.submit(snapshot_deployment, namespace, deployment, timeout),
+        "service": MANAGEMENT_POOL.submit(snapshot_service, namespace, service, timeout),
+        "endpoints": MANAGEMENT_POOL.submit(snapshot_endpoints, namespace, service, timeout),
+        "pods": MANAGEMENT_POOL.submit(get_terraria_pods, namespace, app_label, timeout),
+        "logs": MANAGEMENT_POOL.submit(snapshot_logs, namespace, deployment, app_label, timeout),
+        "metrics": MANAGEMENT_POOL.submit(scrape_metric_snapshot),
+    }
+    fallbacks: Dict = {
+        "deployment": None,
+        "service": None,
+        "endpoints": {"ready": 0},
+        "pods": [],
+        "worlds": [],
+        "logs": {"ok": False, "tail": "(no logs)"},
+        "metrics": {**{key: None for key in METRIC_SNAPSHOT_KEYS}, "source": None},
+    }
+
+    def collect(name: str, future) -> object:
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            snapshot["issues"].append(f"{name}: timed out after {MANAGEMENT_DEADLINE_SECONDS:g}s")
+        except Exception as exc:
+            snapshot["issues"].append(f"{name}: {exc}")
+        return fallbacks[name]
+
+    # Worlds are listed from the pods already fetched instead of fetching them a second time.
+    pods = collect("pods", futures.pop("pods"))
+    worlds_future = MANAGEMENT_POOL.submit(list_worlds, namespace, app_label, pods, timeout)
+    for name, future in futures.items():
+        snapshot[name] = collect(name, future)
+    if snapshot["deployment"] is None:
+        snapshot["ok"] = False
+    snapshot["pods"] = snapshot_pod_rows(pods)
+
+    worlds = collect("worlds", worlds_future)
+    snapshot["worlds"] = worlds
+    active_world = ""
+    if snapshot.get("deployment"):
+        active_world = snapshot["deployment"].get("world", "")
+    snapshot["active_world_exists"] = bool(active_world and any(world.get("name") == active_world for world in worlds))
     return snapshot
 
 
+def management_target() -> Tuple[str, str, str, str]:
+    return (
+        os.environ.get("WORLD_UI_NAMESPACE", DEFAULT_TERRARIA_NAMESPACE),
+        os.environ.get("WORLD_UI_DEPLOYMENT", DEFAULT_TERRARIA_DEPLOYMENT),
+        os.environ.get("WORLD_UI_SERVICE", DEFAULT_TERRARIA_SERVICE),
+        os.environ.get("WORLD_UI_APP_LABEL", DEFAULT_TERRARIA_APP_LABEL),
+    )
+
+
+class SnapshotCache:
+    """Process-wide management snapshot shared by every tab.
+
+    Fresh snapshots (younger than MANAGEMENT_CACHE_TTL) are served as-is. Expired ones are served stale
+    while a single rebuild runs in the background; only past MANAGEMENT_MAX_STALE (or with no snapshot at
+    all) do callers wait, and then they all wait on that same rebuild.
+    """
+
+    def __init__(self, build) -> None:
+        self.build = build
+        self.lock = threading.Lock()
+        self.snapshot: Optional[Dict] = None
+        self.built_at = 0.0
+        self.invalidated = False
+        # Bumped by invalidate(); a build only counts as fresh when it started at the current generation.
+        self.generation = 0
+        self.snapshot_generation = -1
+        self.flight: Optional[threading.Event] = None
+        self.flight_generation = -1
+
+    def _rebuild(self, flight: threading.Event, generation: int) -> None:
+        try:
+            snapshot = self.build()
+            with self.lock:
+                if generation < self.snapshot_generation:
+                    return
+                previous = self.snapshot
+                self.snapshot = snapshot
+                self.snapshot_generation = generation
+                self.built_at = time.monotonic()
+                # A build that began before the latest action may still show the old state.
+                if generation == self.generation:
+                    self.invalidated = False
+            EVENTS.publish_management(previous, snapshot)
+        except Exception as exc:
+            print(f"[world-ui] management snapshot failed: {exc}")
+        finally:
+            with self.lock:
+                if self.flight is flight:
+                    self.flight = None
+            flight.set()
+
+    def _start(self) -> Tuple[threading.Event, int, bool]:
+        # Caller holds the lock. A flight from before the last invalidate() cannot serve anyone, so a new
+        # one starts next to it.
+        if self.flight is not None and self.flight_generation == self.generation:
+            return self.flight, self.flight_generation, False
+        self.flight = threading.Event()
+        self.flight_generation = self.generation
+        return self.flight, self.generation, True
+
+    def get(self) -> Tuple[Optional[Dict], float]:
+        with self.lock:
+            snapshot = self.snapshot
+            age = time.monotonic() - self.built_at
+            usable = snapshot is not None and not self.invalidated
+            if usable and age < MANAGEMENT_CACHE_TTL:
+                return snapshot, age
+            flight, generation, owner = self._start()
+        if usable and age < MANAGEMENT_MAX_STALE:
+            if owner:
+                threading.Thread(
+                    target=self._rebuild, args=(flight, generation), name="management-refresh", daemon=True
+                ).start()
+            return snapshot, age
+        if owner:
+            self._rebuild(flight, generation)
+        else:
+            flight.wait(MANAGEMENT_DEADLINE_SECONDS + 5)
+        with self.lock:
+            return self.snapshot, time.monotonic() - self.built_at
+
+    def invalidate(self) -> None:
+        """After an action, make the next request wait for a rebuild instead of seeing the old state."""
+        with self.lock:
+            self.invalidated = True
+            self.generation += 1
+
+    def run(self, interval: float) -> None:
+        while True:
+            with self.lock:
+                flight, generation, owner = self._start()
+            if owner:
+                self._rebuild(flight, generation)
+            time.sleep(interval)
+
+
+MANAGEMENT_SNAPSHOT = SnapshotCache(lambda: build_management_snapshot(*management_target()))
+
+
 def run_server_action(namespace: str, deployment: str, action: str, payload: Dict) -> Dict:
     action = (action or "").strip().lower()
     commands: List[List[str]] = []
@@ -767,12 +2096,226 @@ def run_server_action(namespace: str, deployment: str, action: str, payload: Dic
     return {"ok": True, "action": action, "results": outputs}
 
 
+MAP_TILE_SIZE = 256
+# Bump when the palette or rendering changes so every cached PNG is regenerated.
+MAP_RENDER_VERSION = "1"
+MAP_NO_TILE = 0xFFFF
+MAP_SKY = (132, 170, 248, 255)
+MAP_TILE_COLORS = {
+    0: (151, 107, 75), 1: (128, 128, 128), 2: (28, 216, 94), 3: (13, 101, 36), 5: (151, 107, 75),
+    6: (140, 101, 80), 7: (150, 67, 22), 8: (185, 164, 23), 9: (185, 194, 195), 19: (191, 142, 111),
+    21: (174, 129, 92), 22: (98, 95, 167), 23: (141, 137, 223), 25: (109, 90, 128), 30: (170, 120, 84),
+    37: (104, 86, 84), 40: (146, 81, 68), 41: (66, 84, 109), 43: (84, 100, 63), 44: (107, 68, 99),
+    53: (211, 198, 111), 56: (68, 60, 82), 57: (68, 68, 76), 58: (142, 66, 66), 59: (92, 68, 73),
+    60: (143, 215, 29), 70: (93, 127, 255), 107: (11, 80, 143), 108: (91, 169, 169), 109: (78, 193, 227),
+    111: (221, 85, 152), 112: (103, 98, 122), 116: (238, 225, 218), 117: (181, 172, 190), 147: (211, 236, 241),
+    161: (144, 195, 232), 163: (154, 120, 207), 164: (218, 174, 223), 166: (129, 125, 93), 167: (62, 82, 114),
+    168: (132, 157, 127), 169: (152, 171, 198), 189: (223, 230, 238), 191: (121, 87, 56), 192: (43, 137, 33),
+    199: (208, 80, 80), 200: (216, 152, 144), 203: (128, 44, 45), 204: (125, 55, 65), 211: (40, 235, 16),
+    221: (239, 90, 50), 222: (231, 96, 228), 223: (57, 85, 101), 225: (227, 125, 22), 226: (141, 56, 0),
+    234: (53, 44, 41), 367: (168, 178, 204), 368: (50, 46, 104), 396: (186, 168, 84), 397: (186, 150, 84),
+    398: (115, 101, 147), 399: (160, 87, 80), 400: (80, 68, 112), 401: (140, 60, 60), 402: (210, 196, 216),
+    403: (160, 138, 180), 408: (50, 200, 150),
+}
+MAP_LIQUID_COLORS = [(0, 0, 0, 0), (9, 61, 191, 255), (253, 32, 3, 255), (254, 194, 20, 255), (190, 160, 220, 255)]
+MAP_HASH_RE = re.compile(r"^[0-9a-f]{16}$")
+_MAP_LUTS: Optional[Tuple] = None
+
+
+def map_color_luts() -> Tuple:
+    global _MAP_LUTS
+    if _MAP_LUTS is None:
+        ids = np.arange(65536, dtype=np.uint32)
+        # Unknown ids still get a stable, distinguishable colour derived from the id.
+        tiles = np.stack([(ids * 67) % 160 + 60, (ids * 131) % 160 + 60, (ids * 29) % 160 + 60, np.full_like(ids, 255)], axis=1)
+        tiles = tiles.astype(np.uint8)
+        for tile, rgb in MAP_TILE_COLORS.items():
+            tiles[tile] = (*rgb, 255)
+        walls = tiles.copy()
+        walls[:, :3] //= 3
+        _MAP_LUTS = (tiles, walls, np.array(MAP_LIQUID_COLORS, dtype=np.uint8))
+    return _MAP_LUTS
+
+
+def render_map_chunk(types, walls, liquids):
+    """Colour one (w, h) block of tiles into a MAP_TILE_SIZE square RGBA image (rows are y)."""
+    tile_lut, wall_lut, liquid_lut = map_color_luts()
+    image = np.zeros((MAP_TILE_SIZE, MAP_TILE_SIZE, 4), dtype=np.uint8)
+    pixels = np.empty(types.shape + (4,), dtype=np.uint8)
+    pixels[:] = MAP_SKY
+    pixels = np.where((walls != 0)[..., None], wall_lut[walls], pixels)
+    pixels = np.where((liquids != 0)[..., None], liquid_lut[liquids], pixels)
+    pixels = np.where((types != MAP_NO_TILE)[..., None], tile_lut[types], pixels)
+    image[: types.shape[1], : types.shape[0]] = pixels.transpose(1, 0, 2)
+    return image
+
+
+def downsample_map_tiles(children: List[List[Optional["np.ndarray"]]]):
+    size = MAP_TILE_SIZE
+    merged = np.zeros((size * 2, size * 2, 4), dtype=np.uint16)
+    for dx in range(2):
+        for dy in range(2):
+            child = children[dx][dy]
+            if child is not None:
+                merged[dy * size : (dy + 1) * size, dx * size : (dx + 1) * size] = child
+    return (merged.reshape(size, 2, size, 2, 4).sum(axis=(1, 3)) // 4).astype(np.uint8)
+
+
+def encode_png(image) -> bytes:
+    height, width = image.shape[:2]
+    rows = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, width * 4)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)) + chunk(b"IEND", b"")
+
+
+def decode_own_png(data: bytes):
+    # Only understands what encode_png writes: one IDAT, RGBA, filter type 0 on every row.
+    width, height = struct.unpack(">II", data[16:24])
+    length = struct.unpack(">I", data[33:37])[0]
+    rows = np.frombuffer(zlib.decompress(data[41 : 41 + length]), dtype=np.uint8).reshape(height, width * 4 + 1)
+    return rows[:, 1:].reshape(height, width, 4)
+
+
+class MapPyramid:
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.index: Optional[Dict] = None
+        self.manifest_etag = ""
+        try:
+            self.index = json.loads((cache_dir / "index.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+
+    def tile_path(self, tile_hash: str) -> Path:
+        return self.cache_dir / f"{tile_hash}.png"
+
+    def fetch_manifest(self) -> Optional[Dict]:
+        headers = {"Accept": "application/json"}
+        if self.manifest_etag:
+            headers["If-None-Match"] = self.manifest_etag
+        req = Request(f"{get_exporter_tiles_url()}/manifest", method="GET", headers=headers)
+        try:
+            with urlopen(req, timeout=5) as response:
+                self.manifest_etag = response.headers.get("ETag", "")
+                return json.loads(response.read().decode("utf-8"))
+        except HTTPError as exc:
+            if exc.code != 304:
+                print(f"[world-ui] map manifest unavailable: HTTP {exc.code}")
+            return None
+
+    def render_base(self, cx: int, cy: int) -> bytes:
+        size = MAP_TILE_SIZE
+        url = f"{get_exporter_tiles_url()}/region?x={cx * size}&y={cy * size}&w={size}&h={size}&attrs=types,walls,liquids"
+        with urlopen(Request(url, method="GET"), timeout=30) as response:
+            _, _, width, height = (int(part) for part in response.headers.get("X-Tile-Region", "0,0,0,0").split(","))
+            raw = response.read()
+        cells = width * height
+        types = np.frombuffer(raw, dtype="<u2", count=cells).reshape(width, height)
+        walls = np.frombuffer(raw, dtype="<u2", count=cells, offset=cells * 2).reshape(width, height)
+        liquids = np.frombuffer(raw, dtype=np.uint8, count=cells, offset=cells * 4).reshape(width, height)
+        return encode_png(render_map_chunk(types, walls, liquids))
+
+    def refresh(self) -> bool:
+        manifest = self.fetch_manifest()
+        if manifest is None:
+            return False
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        rendered = 0
+        grid = [
+            [hashlib.blake2b(f"{MAP_RENDER_VERSION}:{chunk_hash}".encode(), digest_size=8).hexdigest() for chunk_hash in column]
+            for column in manifest["hashes"]
+        ]
+        for cx, column in enumerate(grid):
+            for cy, tile_hash in enumerate(column):
+                # Chunks whose content hash is unchanged since the last save are already on disk.
+                if not self.tile_path(tile_hash).exists():
+                    self.write_tile(tile_hash, self.render_base(cx, cy))
+                    rendered += 1
+
+        levels = [{"scale": 1, "cols": len(grid), "rows": len(grid[0]) if grid else 0, "tiles": grid}]
+        while levels[-1]["cols"] > 1 or levels[-1]["rows"] > 1:
+            below = levels[-1]
+            cols, rows = -(-below["cols"] // 2), -(-below["rows"] // 2)
+            tiles = []
+            for tx in range(cols):
+                column = []
+                for ty in range(rows):
+                    children = [
+                        [
+                            below["tiles"][x][y] if x < below["cols"] and y < below["rows"] else None
+                            for y in (ty * 2, ty * 2 + 1)
+                        ]
+                        for x in (tx * 2, tx * 2 + 1)
+                    ]
+                    key = f"{below['scale'] * 2}:" + ",".join(child or "-" for pair in children for child in pair)
+                    tile_hash = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+                    if not self.tile_path(tile_hash).exists():
+                        images = [
+                            [decode_own_png(self.tile_path(child).read_bytes()) if child else None for child in pair]
+                            for pair in children
+                        ]
+                        self.write_tile(tile_hash, encode_png(downsample_map_tiles(images)))
+                        rendered += 1
+                    column.append(tile_hash)
+                tiles.append(column)
+            levels.append({"scale": below["scale"] * 2, "cols": cols, "rows": rows, "tiles": tiles})
+
+        index = {
+            "generation": manifest["generation"],
+            "width": manifest["width"],
+            "height": manifest["height"],
+            "tile_size": MAP_TILE_SIZE,
+            "levels": levels,
+            "rendered": rendered,
+            "updated_at": now_rfc3339(),
+        }
+        (self.cache_dir / "index.json.tmp").write_text(json.dumps(index), encoding="utf-8")
+        os.replace(self.cache_dir / "index.json.tmp", self.cache_dir / "index.json")
+        with self.lock:
+            self.index = index
+
+        referenced = {f"{tile_hash}.png" for level in levels for column in level["tiles"] for tile_hash in column}
+        for path in self.cache_dir.glob("*.png"):
+            if path.name not in referenced:
+                path.unlink(missing_ok=True)
+        print(f"[world-ui] map generation {manifest['generation']}: rendered {rendered} tiles")
+        return True
+
+    def write_tile(self, tile_hash: str, body: bytes) -> None:
+        tmp = self.cache_dir / f".{tile_hash}.tmp"
+        tmp.write_bytes(body)
+        os.replace(tmp, self.tile_path(tile_hash))
+
+    def get_index(self) -> Optional[Dict]:
+        with self.lock:
+            return self.index
+
+    def run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as exc:
+                print(f"[world-ui] map refresh failed: {exc}")
+            time.sleep(MAP_REFRESH_INTERVAL)
+
+
+def get_exporter_tiles_url() -> str:
+    return os.environ.get("EXPORTER_TILES_URL", DEFAULT_EXPORTER_TILES_URL).strip().rstrip("/")
+
+
+MAP_PYRAMID = MapPyramid(MAP_CACHE_DIR)
+
+
 class WorldCreatorHandler(SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
-        self.namespace = os.environ.get("WORLD_UI_NAMESPACE", DEFAULT_TERRARIA_NAMESPACE)
-        self.deployment = os.environ.get("WORLD_UI_DEPLOYMENT", DEFAULT_TERRARIA_DEPLOYMENT)
-        self.service = os.environ.get("WORLD_UI_SERVICE", DEFAULT_TERRARIA_SERVICE)
-        self.app_label = os.environ.get("WORLD_UI_APP_LABEL", DEFAULT_TERRARIA_APP_LABEL)
+        self.namespace, self.deployment, self.service, self.app_label = management_target()
         super().__init__(*args, directory=str(STATIC_DIR), **kwargs)
 
     def log_message(self, fmt: str, *args) -> None:
@@ -787,7 +2330,10 @@ class WorldCreatorHandler(SimpleHTTPRequestHandler):
         self.wfile.write(body)
 
     def parse_json_body(self) -> Tuple[Optional[dict], Optional[str]]:
-        content_length = int(self.headers.get("Content-Length", "0"))
+        try:
+            content_length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            return None, "Invalid Content-Length"
         if content_length <= 0:
             return None, "Empty body"
         raw = self.rfile.read(content_length)
@@ -796,8 +2342,18 @@ class WorldCreatorHandler(SimpleHTTPRequestHandler):
         except json.JSONDecodeError:
             return None, "Invalid JSON payload"
 
+    def upload_route(self, path: str) -> Tuple[Optional[UploadSession], List[str]]:
+        # /api/uploads/<id>[/...]: returns the session (None once it is gone) and the remaining segments.
+        segments = path[len("/api/uploads/") :].strip("/").split("/")
+        return upload_get(segments[0]), segments[1:]
+
     def do_GET(self):
         parsed = urlparse(self.path)
+        if parsed.path.startswith("/api/uploads/"):
+            session, rest = self.upload_route(parsed.path)
+            if not session or rest:
+                return self.send_json(404, {"ok": False, "error": "upload not found"})
+            return self.send_json(200, session.status())
         if parsed.path.startswith("/api/jobs/"):
             job_id = parsed.path.split("/api/jobs/")[1].strip("/")
             job = job_get(job_id)
@@ -825,47 +2381,152 @@ class WorldCreatorHandler(SimpleHTTPRequestHandler):
             worlds = list_worlds(self.namespace, self.app_label)
             return self.send_json(200, {"ok": True, "worlds": worlds})
 
+        if parsed.path == "/api/events":
+            return self.send_events(parse_qs(parsed.query))
+
         if parsed.path == "/api/management":
-            payload = build_management_snapshot(self.namespace, self.deployment, self.service, self.app_label)
-            return self.send_json(200, payload)
+            snapshot, age = MANAGEMENT_SNAPSHOT.get()
+            if snapshot is None:
+                return self.send_json(503, {"ok": False, "error": "management snapshot unavailable"})
+            return self.send_json(200, {**snapshot, "age_seconds": round(age, 1)})
+
+        if parsed.path == "/api/map":
+            index = MAP_PYRAMID.get_index()
+            if index is None:
+                return self.send_json(503, {"ok": False, "error": "map not rendered yet"})
+            return self.send_json(200, {"ok": True, **index})
+
+        if parsed.path.startswith("/api/map/tiles/"):
+            return self.send_map_tile(parsed.path.rsplit("/", 1)[-1].removesuffix(".png"))
 
         if parsed.path.startswith("/api/"):
             return self.send_json(404, {"ok": False, "error": "Endpoint not found"})
 
         return super().do_GET()
 
+    def send_events(self, query: Dict[str, List[str]]) -> None:
+        last_event_id = self.headers.get("Last-Event-ID") or (query.get("lastEventId") or [""])[0]
+        subscriber, replay = EVENTS.subscribe(last_event_id.strip())
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("X-Accel-Buffering", "no")
+            self.end_headers()
+            self.wfile.write(b"retry: 3000\n\n")
+            for event in replay:
+                self.write_event(event)
+            # A dropped subscriber fell behind; closing makes the browser reconnect and resync.
+            while not subscriber.dropped:
+                try:
+                    event = subscriber.queue.get(timeout=EVENT_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    self.wfile.write(b": ping\n\n")
+                    continue
+                self.write_event(event)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            EVENTS.unsubscribe(subscriber)
+
+    def write_event(self, event: Tuple[str, str, str]) -> None:
+        event_id, name, data = event
+        self.wfile.write(f"id: {event_id}\nevent: {name}\ndata: {data}\n\n".encode("utf-8"))
+
+    def send_map_tile(self, tile_hash: str) -> None:
+        if not MAP_HASH_RE.match(tile_hash):
+            return self.send_json(404, {"ok": False, "error": "tile not found"})
+        etag = f'"{tile_hash}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        try:
+            body = MAP_PYRAMID.tile_path(tile_hash).read_bytes()
+        except OSError:
+            return self.send_json(404, {"ok": False, "error": "tile not found"})
+        # Tile URLs are content hashes, so a given URL never changes.
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_POST(self):
         parsed = urlparse(self.path)
 
         if parsed.path == "/api/upload-world":
             content_type = self.headers.get("Content-Type", "")
-            saved, err = save_world_upload_to_tmp(content_type, self.headers, self.rfile)
-            if err:
-                return self.send_json(400, {"ok": False, "error": err})
-
-            assert saved is not None
-            world_name = str(saved["world_name"])
-            tmp_dir = Path(str(saved["tmp_dir"]))
-            tmp_file = Path(str(saved["tmp_file"]))
-            bytes_size = int(saved.get("bytes", 0))
-
+            try:
+                total_bytes = int(self.headers.get("Content-Length", "0") or 0)
+            except ValueError:
+                return self.send_json(400, {"ok": False, "error": "Invalid Content-Length"})
+            if total_bytes > UPLOAD_MAX_BYTES:
+                return self.send_json(
+                    413, {"ok": False, "error": f"Upload exceeds UPLOAD_MAX_BYTES ({UPLOAD_MAX_BYTES} bytes)"}
+                )
+
+            # The job exists while the body streams in, so a client can follow received_bytes on
+            # /api/events under the id it chose before the response arrives.
+            upload_id = self.headers.get("X-Upload-Id", "").strip().lower()
             job = job_create(
                 "upload-world",
-                {
-                    "world_name": world_name,
-                    "bytes": bytes_size,
-                },
+                {"world_name": None, "bytes": 0},
+                job_id=upload_id if re.fullmatch(r"[0-9a-f]{32}", upload_id) else None,
             )
-            job_update(job["id"], stage="uploaded")
+            started = time.time()
+            job_update(job["id"], stage="receiving", received_bytes=0, total_bytes=total_bytes)
+            last_progress = time.monotonic()
+
+            def report(received: int) -> None:
+                nonlocal last_progress
+                now = time.monotonic()
+                if received >= total_bytes or now - last_progress >= UPLOAD_PROGRESS_SECONDS:
+                    last_progress = now
+                    job_update(job["id"], received_bytes=received)
+
+            saved, err = save_world_upload_to_tmp(content_type, self.headers, self.rfile, report)
+            if err:
+                job_append(job["id"], err)
+                job_update(
+                    job["id"],
+                    status="error",
+                    ok=False,
+                    finished_at=now_rfc3339(),
+                    duration_seconds=round(time.time() - started, 2),
+                )
+                status = 413 if "WORLD_MAX_RAW_BYTES" in err else 400
+                return self.send_json(status, {"ok": False, "error": err, "job_id": job["id"]})
 
-            thread = threading.Thread(
-                target=run_upload_job,
-                args=(job["id"], tmp_dir, tmp_file, world_name, bytes_size),
-                daemon=True,
-            )
-            thread.start()
+            assert saved is not None
+            start_upload_job(job["id"], saved)
+            return self.send_json(202, {"ok": True, "job_id": job["id"], **upload_meta(saved)})
 
-            return self.send_json(202, {"ok": True, "job_id": job["id"], "world_name": world_name, "bytes": bytes_size})
+        if parsed.path == "/api/uploads":
+            payload, err = self.parse_json_body()
+            if err:
+                return self.send_json(400, {"ok": False, "error": err})
+            session, err = upload_create(payload or {})
+            if err:
+                return self.send_json(413 if "UPLOAD_MAX_BYTES" in err else 400, {"ok": False, "error": err})
+            assert session is not None
+            return self.send_json(201, session.status())
+
+        if parsed.path.startswith("/api/uploads/"):
+            session, rest = self.upload_route(parsed.path)
+            if not session or rest != ["complete"]:
+                return self.send_json(404, {"ok": False, "error": "upload not found"})
+            saved, err = session.finish()
+            if err:
+                status = 413 if "WORLD_MAX_RAW_BYTES" in err else 409
+                return self.send_json(status, {"ok": False, "error": err, **session.status()})
+            assert saved is not None
+            upload_remove(session.id)
+            start_upload_job(session.id, saved)
+            return self.send_json(202, {"ok": True, "job_id": session.id, **upload_meta(saved)})
 
         if parsed.path == "/api/create-world":
             payload, err = self.parse_json_body()
@@ -892,10 +2553,40 @@ class WorldCreatorHandler(SimpleHTTPRequestHandler):
                 action=str((payload or {}).get("action", "")).strip(),
                 payload=payload or {},
             )
+            MANAGEMENT_SNAPSHOT.invalidate()
             return self.send_json(200 if result.get("ok") else 500, result)
 
         return self.send_json(404, {"ok": False, "error": "Endpoint not found"})
 
+    def do_PUT(self):
+        parsed = urlparse(self.path)
+        if parsed.path.startswith("/api/uploads/"):
+            session, rest = self.upload_route(parsed.path)
+            if not session or len(rest) != 2 or rest[0] != "parts" or not rest[1].isdigit():
+                return self.send_json(404, {"ok": False, "error": "upload not found"})
+            try:
+                length = int(self.headers.get("Content-Length", "0"))
+            except ValueError:
+                return self.send_json(400, {"ok": False, "error": "Invalid Content-Length"})
+            result, err = session.write_part(int(rest[1]), self.rfile, length, self.headers.get("X-Part-Sha256", ""))
+            if err:
+                return self.send_json(400, {"ok": False, "error": err})
+            return self.send_json(200, result)
+        return self.send_json(404, {"ok": False, "error": "Endpoint not found"})
+
+    def do_DELETE(self):
+        parsed = urlparse(self.path)
+        if parsed.path.startswith("/api/uploads/"):
+            session, rest = self.upload_route(parsed.path)
+            if not session or rest:
+                return self.send_json(404, {"ok": False, "error": "upload not found"})
+            err = session.discard("Upload cancelled")
+            if err:
+                return self.send_json(409, {"ok": False, "error": err})
+            upload_remove(session.id)
+            return self.send_json(200, {"ok": True})
+        return self.send_json(404, {"ok": False, "error": "Endpoint not found"})
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Terraria world creation and server management UI backend")
@@ -907,6 +2598,20 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
     server = ThreadingHTTPServer((args.host, args.port), WorldCreatorHandler)
+    # Start the watches up front so the first /api/management is already served from cache.
+    namespace, deployment, service, app_label = management_target()
+    watch_cache(namespace, "deployment", deployment)
+    watch_cache(namespace, "service", service)
+    watch_cache(namespace, "endpoints", service)
+    watch_cache(namespace, "pods", label_selector=f"app={app_label}")
+    if MANAGEMENT_REFRESH_INTERVAL > 0:
+        threading.Thread(
+            target=MANAGEMENT_SNAPSHOT.run, args=(MANAGEMENT_REFRESH_INTERVAL,), name="management-refresh", daemon=True
+        ).start()
+    if np is not None:
+        threading.Thread(target=MAP_PYRAMID.run, name="map-pyramid", daemon=True).start()
+    else:
+        print("[world-ui] numpy not available; world map disabled")
     print(f"[world-ui] Serving on http://{args.host}:{args.port}")
     print(f"[world-ui] Repo root: {REPO_ROOT}")
     try:
@@ -0,0 +1,59 @@
+import gzip
+import hashlib
+
+import pytest
+
+import server
+
+LIMIT = 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def raw_limit(monkeypatch):
+    monkeypatch.setattr(server, "WORLD_MAX_RAW_BYTES", LIMIT)
+
+
+def inspect(tmp_path, data, encoding):
+    part_file = tmp_path / "upload.part"
+    part_file.write_bytes(data)
+    return server.inspect_upload(tmp_path, part_file, "w.wld", encoding, len(data), hashlib.sha256(data).hexdigest())
+
+
+def test_gzip_bomb_stops_at_the_raw_limit(tmp_path):
+    # 64 MiB of zeros packs into about 64 KiB.
+    bomb = gzip.compress(bytes(64 * LIMIT), compresslevel=9)
+    assert len(bomb) < LIMIT // 8
+    saved, err = inspect(tmp_path, bomb, "gzip")
+    assert saved is None
+    assert "WORLD_MAX_RAW_BYTES" in err
+    assert (tmp_path / "upload.part").exists()
+
+
+@pytest.mark.skipif(server.zstd is None, reason="no zstd module")
+def test_zstd_bomb_stops_at_the_raw_limit(tmp_path):
+    if hasattr(server.zstd, "compress"):
+        bomb = server.zstd.compress(bytes(64 * LIMIT))
+    else:
+        bomb = server.zstd.ZstdCompressor().compress(bytes(64 * LIMIT))
+    saved, err = inspect(tmp_path, bomb, "zstd")
+    assert saved is None
+    assert "WORLD_MAX_RAW_BYTES" in err
+
+
+def test_payload_at_the_limit_is_accepted(tmp_path):
+    raw = bytes(LIMIT)
+    saved, err = inspect(tmp_path, gzip.compress(raw), "gzip")
+    assert err is None
+    assert saved["raw_bytes"] == LIMIT
+    assert saved["raw_sha256"] == hashlib.sha256(raw).hexdigest()
+
+
+def test_uncompressed_upload_over_the_limit(tmp_path):
+    saved, err = inspect(tmp_path, bytes(LIMIT + 1), "")
+    assert saved is None
+    assert "WORLD_MAX_RAW_BYTES" in err
+
+
+def test_upload_command_passes_the_limit():
+    command = server.build_upload_world_command(server.Path("/tmp/w.wld.gz"), "w.wld", {"encoding": "gzip"})
+    assert command[command.index("--max-raw-bytes") + 1] == str(LIMIT)
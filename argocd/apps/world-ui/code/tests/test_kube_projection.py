@@ -0,0 +1,108 @@
+import server
+
+MANAGED = [{"manager": "kubectl", "fieldsV1": {"f:spec": {}}}]
+
+DEPLOYMENT = {
+    "kind": "Deployment",
+    "metadata": {
+        "name": "terraria-server",
+        "resourceVersion": "42",
+        "creationTimestamp": "2026-01-01T00:00:00Z",
+        "managedFields": MANAGED,
+        "annotations": {"kubectl.kubernetes.io/last-applied-configuration": "{...}"},
+    },
+    "spec": {
+        "replicas": 1,
+        "selector": {"matchLabels": {"app": "terraria-server"}},
+        "template": {
+            "metadata": {"labels": {"app": "terraria-server"}},
+            "spec": {
+                "volumes": [{"name": "config"}],
+                "containers": [
+                    {
+                        "name": "terraria",
+                        "image": "ghcr.io/beardedio/terraria:tshock-latest",
+                        "env": [{"name": "world", "value": "a.wld"}, {"name": "worldpath", "value": "/config"}],
+                        "resources": {"limits": {"memory": "2Gi"}},
+                    }
+                ],
+            },
+        },
+    },
+    "status": {"readyReplicas": 1, "availableReplicas": 1, "observedGeneration": 3, "conditions": [{"type": "Available"}]},
+}
+
+POD = {
+    "metadata": {"name": "terraria-0", "resourceVersion": "7", "creationTimestamp": "2026-01-01T00:00:00Z", "managedFields": MANAGED},
+    "spec": {"containers": [{"name": "terraria"}]},
+    "status": {"phase": "Running", "podIP": "10.0.0.5", "nodeName": "node-a", "containerStatuses": [{"ready": True, "restartCount": 2, "image": "x"}]},
+}
+
+
+class FakeKube:
+    enabled = True
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def get_json(self, path, params=None, timeout=30, accept="application/json, */*"):
+        self.calls.append((path, params, accept))
+        return self.responses[path], None
+
+    def watch(self, path, params, timeout):
+        yield {"type": "MODIFIED", "object": dict(POD, metadata=dict(POD["metadata"], resourceVersion="8"))}
+
+
+def test_projection_keeps_only_the_read_fields():
+    projected = server.kube_project(DEPLOYMENT, server.KUBE_FIELDS["deployment"])
+    assert projected["metadata"] == {"name": "terraria-server", "resourceVersion": "42", "creationTimestamp": "2026-01-01T00:00:00Z"}
+    assert projected["spec"] == {
+        "replicas": 1,
+        "template": {"spec": {"containers": [{"image": "ghcr.io/beardedio/terraria:tshock-latest", "env": DEPLOYMENT["spec"]["template"]["spec"]["containers"][0]["env"]}]}},
+    }
+    assert "conditions" not in projected["status"]
+
+
+def test_snapshots_read_the_same_values_from_projected_objects(monkeypatch):
+    fake = FakeKube(
+        {
+            "/apis/apps/v1/namespaces/terraria/deployments/terraria-server": DEPLOYMENT,
+            "/api/v1/namespaces/terraria/pods": {"items": [POD]},
+        }
+    )
+    monkeypatch.setattr(server, "KUBE", fake)
+    monkeypatch.setattr(server, "KUBE_WATCH", False)
+    assert server.snapshot_deployment("terraria", "terraria-server", 5) == {
+        "replicas_desired": 1,
+        "replicas_ready": 1,
+        "replicas_available": 1,
+        "observed_generation": 3,
+        "image": "ghcr.io/beardedio/terraria:tshock-latest",
+        "world": "a.wld",
+        "worldpath": "/config",
+    }
+    pods = server.get_terraria_pods("terraria", "terraria-server", 5)
+    assert "spec" not in pods[0] and "managedFields" not in pods[0]["metadata"]
+    assert server.snapshot_pod_rows(pods)[0]["restarts"] == 2
+
+
+def test_metadata_only_reads_ask_for_partial_metadata(monkeypatch):
+    fake = FakeKube({"/api/v1/namespaces/terraria/pods/world-manager": {"kind": "PartialObjectMetadata", "metadata": POD["metadata"]}})
+    monkeypatch.setattr(server, "KUBE", fake)
+    data, err = server.kube_get("terraria", "pod", "world-manager", timeout=5, metadata_only=True)
+    assert err is None
+    assert data == {"metadata": {"name": "terraria-0", "resourceVersion": "7", "creationTimestamp": "2026-01-01T00:00:00Z"}}
+    assert "as=PartialObjectMetadata;" in fake.calls[0][2]
+
+
+def test_informer_caches_projected_objects():
+    fake = FakeKube({"/api/v1/namespaces/terraria/pods": {"metadata": {"resourceVersion": "7"}, "items": [POD]}})
+    informer = server.KubeInformer(fake, "/api/v1/namespaces/terraria/pods", {"labelSelector": "app=x"}, server.KUBE_FIELDS["pods"])
+    informer._relist()
+    assert informer.get("terraria-0") == server.kube_project(POD, server.KUBE_FIELDS["pods"])
+    informer._watch()
+    cached = informer.get("terraria-0")
+    assert cached["metadata"]["resourceVersion"] == "8"
+    assert "spec" not in cached and "managedFields" not in cached["metadata"]
+    assert informer.resource_version == "8"
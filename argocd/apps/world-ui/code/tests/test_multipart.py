@@ -0,0 +1,89 @@
+import io
+
+import pytest
+
+import server
+
+BOUNDARY = b"----form7MA4YWxk"
+
+
+class TrickleStream:
+    """Hands out at most `step` bytes per read, like a slow socket."""
+
+    def __init__(self, data: bytes, step: int) -> None:
+        self.stream = io.BytesIO(data)
+        self.step = step
+
+    def read(self, size: int) -> bytes:
+        return self.stream.read(min(size, self.step))
+
+
+def form(*parts, epilogue=b""):
+    out = b"preamble to skip\r\n"
+    for name, value, filename in parts:
+        disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+        out += b"--" + BOUNDARY + b"\r\nContent-Disposition: " + disposition.encode() + b"\r\n\r\n" + value + b"\r\n"
+    return out + b"--" + BOUNDARY + b"--\r\n" + epilogue
+
+
+def read_all(data, step):
+    reader = server.MultipartReader(TrickleStream(data, step), BOUNDARY, len(data))
+    parts = []
+    for headers, body in reader.parts():
+        chunks = list(body)
+        assert all(chunks)
+        parts.append((headers["content-disposition"], b"".join(chunks)))
+    reader.drain()
+    return parts, reader
+
+
+# The file body holds every proper prefix of the delimiter, so chunk edges land inside near-misses too.
+NEAR_MISSES = b"".join(b"\r\n--" + BOUNDARY[:cut] + b"x" for cut in range(len(BOUNDARY)))
+FILE_BODY = b"\x00\xffrelogic" + NEAR_MISSES + b"\r\n\r\n--" + bytes(range(256)) * 3
+
+
+@pytest.mark.parametrize("step", [1, 2, 3, 5, len(BOUNDARY) + 3, len(BOUNDARY) + 4, 64, 1 << 20])
+def test_delimiter_split_across_chunks(step):
+    data = form(("world_name", "Meu Mundo".encode(), None), ("file", FILE_BODY, "world.wld"), epilogue=b"trailing")
+    parts, reader = read_all(data, step)
+    assert parts == [
+        ('form-data; name="world_name"', b"Meu Mundo"),
+        ('form-data; name="file"; filename="world.wld"', FILE_BODY),
+    ]
+    assert reader.received == len(data)
+
+
+def test_empty_part_and_progress():
+    data = form(("encoding", b"", None), ("file", b"abc", "w.wld"))
+    seen = []
+    reader = server.MultipartReader(TrickleStream(data, 4), BOUNDARY, len(data), on_progress=seen.append)
+    parts = [(headers["content-disposition"], b"".join(body)) for headers, body in reader.parts()]
+    assert [value for _, value in parts] == [b"", b"abc"]
+    assert seen == sorted(seen) and seen[-1] == len(data)
+
+
+@pytest.mark.parametrize("step", [1, 7, 1 << 20])
+def test_body_without_closing_boundary(step):
+    data = form(("file", b"abcdef", "w.wld"))
+    data = data[: data.rindex(b"\r\n--" + BOUNDARY)] + b"more bytes"
+    reader = server.MultipartReader(TrickleStream(data, step), BOUNDARY, len(data))
+    with pytest.raises(ValueError):
+        for _, body in reader.parts():
+            for _ in body:
+                pass
+
+
+def test_stream_shorter_than_content_length():
+    data = form(("file", b"abcdef", "w.wld"))
+    reader = server.MultipartReader(TrickleStream(data[:-10], 3), BOUNDARY, len(data))
+    with pytest.raises(ValueError, match="ended before"):
+        for _, body in reader.parts():
+            for _ in body:
+                pass
+
+
+def test_read_form_field_keeps_the_limit_and_drains_the_rest():
+    data = form(("world_name", b"n" * 5000, None), ("encoding", b"gzip", None))
+    reader = server.MultipartReader(TrickleStream(data, 100), BOUNDARY, len(data))
+    values = [server.read_form_field(body, 1024) for _, body in reader.parts()]
+    assert values == [b"n" * 1024, b"gzip"]
@@ -0,0 +1,147 @@
+import hashlib
+import io
+import shutil
+import threading
+
+import pytest
+
+import server
+
+PART = 1024
+DATA = bytes(range(256)) * 10  # 2560 bytes: two full parts and a short last one
+
+
+def sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def part(index: int) -> bytes:
+    return DATA[index * PART : (index + 1) * PART]
+
+
+@pytest.fixture
+def session():
+    upload = server.UploadSession("test.wld", len(DATA), PART, sha(DATA), "")
+    yield upload
+    shutil.rmtree(upload.tmp_dir, ignore_errors=True)
+
+
+def send(upload, index, data=None, checksum=None):
+    data = part(index) if data is None else data
+    return upload.write_part(index, io.BytesIO(data), len(data), sha(data) if checksum is None else checksum)
+
+
+class BlockingStream:
+    """Returns the first byte, then waits until released before returning the rest."""
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def read(self, size: int) -> bytes:
+        if not self.started.is_set():
+            self.started.set()
+            chunk, self.data = self.data[:1], self.data[1:]
+            return chunk
+        assert self.release.wait(5)
+        chunk, self.data = self.data[:size], self.data[size:]
+        return chunk
+
+
+def test_parts_in_any_order(session):
+    assert session.parts == 3
+    for index in (2, 0, 1):
+        result, err = send(session, index)
+        assert err is None
+        assert result["part"] == index
+    assert session.received_bytes == len(DATA)
+    assert session.missing() == []
+
+    saved, err = session.finish()
+    assert err is None
+    assert saved["sha256"] == sha(DATA)
+    with open(saved["tmp_file"], "rb") as handle:
+        assert handle.read() == DATA
+
+
+def test_resending_a_good_part_counts_it_once(session):
+    send(session, 0)
+    result, err = send(session, 0)
+    assert err is None
+    assert result["received_bytes"] == PART
+    assert session.missing() == [1, 2]
+
+
+def test_bad_resend_marks_the_part_missing_again(session):
+    for index in range(3):
+        send(session, index)
+    _, err = send(session, 1, b"x" * PART, checksum=sha(part(1)))
+    assert "checksum mismatch" in err
+    assert session.missing() == [1]
+    assert session.received_bytes == len(DATA) - PART
+    _, err = session.finish()
+    assert "1 parts are still missing" in err
+
+    send(session, 1)
+    saved, err = session.finish()
+    assert err is None
+    with open(saved["tmp_file"], "rb") as handle:
+        assert handle.read() == DATA
+
+
+def test_rejected_parts(session):
+    assert "between 0 and 2" in send(session, 3, b"x" * PART)[1]
+    assert "must be 512 bytes" in send(session, 2, b"x" * PART)[1]
+    _, err = session.write_part(0, io.BytesIO(part(0)[:100]), PART, "")
+    assert "ended after 100 of 1024 bytes" in err
+    assert session.missing() == [0, 1, 2]
+
+
+def test_whole_file_mismatch_asks_for_every_part(session):
+    session.sha256 = sha(b"something else")
+    for index in range(3):
+        send(session, index)
+    _, err = session.finish()
+    assert "file checksum mismatch" in err and "all parts must be sent again" in err
+    assert session.missing() == [0, 1, 2]
+    assert session.received_bytes == 0
+
+
+def test_writer_in_flight_blocks_finish_and_a_second_writer(session):
+    send(session, 0)
+    send(session, 2)
+    stream = BlockingStream(part(1))
+    results = []
+    writer = threading.Thread(target=lambda: results.append(session.write_part(1, stream, PART, sha(part(1)))))
+    writer.start()
+    try:
+        assert stream.started.wait(5)
+        assert "already being written" in send(session, 1)[1]
+        _, err = session.finish()
+        assert "1 parts are still being written" in err
+    finally:
+        stream.release.set()
+        writer.join(5)
+    assert results[0][1] is None
+    saved, err = session.finish()
+    assert err is None
+    assert session.discard("late cancel") == "upload is being finalized"
+
+
+def test_discard_during_a_write_leaves_cleanup_to_the_writer(session):
+    stream = BlockingStream(part(0))
+    results = []
+    writer = threading.Thread(target=lambda: results.append(session.write_part(0, stream, PART, "")))
+    writer.start()
+    try:
+        assert stream.started.wait(5)
+        assert session.discard("Upload cancelled") is None
+        assert session.tmp_dir.exists()
+    finally:
+        stream.release.set()
+        writer.join(5)
+    assert results[0][1] == "upload was discarded"
+    assert not session.tmp_dir.exists()
+    assert send(session, 1)[1] == "upload was discarded"
+    assert session.finish()[1] == "upload was discarded"
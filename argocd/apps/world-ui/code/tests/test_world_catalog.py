@@ -0,0 +1,85 @@
+import os
+import struct
+
+import pytest
+
+import server
+from world_bytes import world_file
+
+
+@pytest.mark.parametrize(
+    "version, seed, game_mode, difficulty",
+    [
+        (179, "12345", 1, "expert"),
+        (208, "seed-208", 2, "master"),
+        (209, "seed-209", 3, "journey"),
+        (222, "seed-222", 1, "expert"),
+        (279, "seed-279", 0, "classic"),
+    ],
+)
+def test_summary_versions(tmp_path, version, seed, game_mode, difficulty):
+    path = tmp_path / "world.wld"
+    path.write_bytes(world_file(version, "Mundo ñ", seed, 6400, 1800, game_mode, crimson=True, hardmode=True))
+    summary = server.read_wld_summary(path)
+    assert summary == {
+        "world_name": "Mundo ñ",
+        "seed": seed,
+        "version": version,
+        "width": 6400,
+        "height": 1800,
+        "size": "medium",
+        "difficulty": difficulty,
+        "evil": "crimson",
+        "hardmode": True,
+    }
+
+
+def test_summary_reads_past_the_first_block(tmp_path):
+    # A world header longer than the first 4 KiB read must be fetched in full.
+    path = tmp_path / "long.wld"
+    path.write_bytes(world_file(279, "x" * 6000, "seed", 4200, 1200, hardmode=True) + bytes(1024))
+    summary = server.read_wld_summary(path)
+    assert summary["world_name"] == "x" * 6000
+    assert summary["size"] == "small"
+    assert summary["hardmode"] is True
+
+
+@pytest.mark.parametrize("cut", [2, 20, 40, 90])
+def test_truncated_summary(tmp_path, cut):
+    path = tmp_path / "cut.wld"
+    path.write_bytes(world_file(279, "cut", "1", 4200, 1200)[:cut])
+    with pytest.raises((struct.error, ValueError)):
+        server.read_wld_summary(path)
+
+
+def test_catalog_reports_bad_files_and_reparses_only_changes(tmp_path, monkeypatch):
+    good = world_file(279, "good", "1", 8400, 2400)
+    (tmp_path / "good.wld").write_bytes(good)
+    (tmp_path / "cut.wld").write_bytes(good[:60])
+    (tmp_path / "old.wld").write_bytes(struct.pack("<i", 100) + bytes(64))
+    (tmp_path / "notes.txt").write_text("not a world")
+
+    parsed = []
+    real = server.read_wld_summary
+    monkeypatch.setattr(server, "read_wld_summary", lambda path: parsed.append(path.name) or real(path))
+    catalog = server.WorldCatalog(tmp_path)
+
+    worlds = {world["name"]: world for world in catalog.list()}
+    assert sorted(worlds) == ["cut.wld", "good.wld", "old.wld"]
+    assert worlds["good.wld"]["world_name"] == "good"
+    assert worlds["good.wld"]["size"] == "large"
+    assert worlds["cut.wld"]["error"] == "truncated world header"
+    assert "unsupported .wld version 100" in worlds["old.wld"]["error"]
+    assert sorted(parsed) == ["cut.wld", "good.wld", "old.wld"]
+
+    listed = catalog.list()
+    assert catalog.list() is listed
+    assert len(parsed) == 3
+
+    # Rewriting one file parses only that file again.
+    (tmp_path / "cut.wld").write_bytes(world_file(279, "fixed", "1", 4200, 1200))
+    stat = (tmp_path / "cut.wld").stat()
+    os.utime(tmp_path / "cut.wld", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    worlds = {world["name"]: world for world in catalog.list()}
+    assert worlds["cut.wld"]["world_name"] == "fixed"
+    assert parsed[3:] == ["cut.wld"]
@@ -0,0 +1,46 @@
+import struct
+
+GAME_FLAG_VERSIONS = (222, 227, 238, 239, 241, 249, 266, 267)
+
+
+def dotnet_string(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    length = len(raw)
+    prefix = bytearray()
+    while True:
+        part = length & 0x7F
+        length >>= 7
+        prefix.append(part | (0x80 if length else 0))
+        if not length:
+            return bytes(prefix) + raw
+
+
+def world_file(
+    version: int, name: str, seed: str, width: int, height: int, game_mode: int = 0, crimson: bool = False, hardmode: bool = False
+) -> bytes:
+    """A .wld with a file header, section table and world header as each version lays them out, and no tiles."""
+    header = bytearray(dotnet_string(name))
+    if version >= 179:
+        header += struct.pack("<i", int(seed)) if version == 179 else dotnet_string(seed)
+        header += struct.pack("<Q", 1)  # generator version
+    if version >= 181:
+        header += bytes(16)  # unique id
+    header += struct.pack("<5i", 1, 0, width * 16, 0, height * 16)
+    header += struct.pack("<2i", height, width)
+    if version >= 209:
+        header += struct.pack("<i", game_mode)
+        header += bytes(sum(1 for flag_version in GAME_FLAG_VERSIONS if version >= flag_version))
+    else:
+        header += struct.pack("<?", game_mode >= 1)
+        if version == 208:
+            header += struct.pack("<?", game_mode == 2)
+    header += struct.pack("<qB", 0, 0) + bytes(19 * 4)
+    header += struct.pack("<3d", height * 0.3, height * 0.4, 27000.0)
+    header += struct.pack("<?i??2i", True, 0, False, False, width // 2, height // 3)
+    header += struct.pack("<?", crimson) + bytes(10 + (1 if version >= 118 else 0) + 7)
+    header += struct.pack("<??Bi?", False, False, 0, 0, hardmode)
+
+    table_size = 4 + 8 + 4 + 8 + 2 + 3 * 4 + 2
+    end = table_size + len(header)
+    out = struct.pack("<i7sBIQ", version, b"relogic", 2, 1, 0) + struct.pack("<h3i", 3, table_size, end, end) + struct.pack("<h", 0)
+    return out + bytes(header)
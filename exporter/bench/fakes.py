@@ -0,0 +1,121 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+TSHOCK_ROUTES = {
+    "/v2/server/status": "status",
+    "/v2/players/list": "players",
+    "/v2/world/status": "world",
+    "/v2/monsters/list": "monsters",
+    "/v2/world/chests": "chests",
+    "/v2/world/houses": "houses",
+    "/v2/world/housednpcs": "housed_npcs",
+}
+
+
+class FakeServer:
+    def __init__(self, handler: type, latency_ms: float = 0.0, error_rate: float = 0.0, seed: int = 7) -> None:
+        self.latency = latency_ms / 1000.0
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self  # type: ignore[attr-defined]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self) -> "FakeServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def should_fail(self) -> bool:
+        with self.rng_lock:
+            self.requests += 1
+            return self.rng.random() < self.error_rate
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    def log_message(self, fmt: str, *args: Any) -> None:
+        return
+
+    @property
+    def fake(self) -> Any:
+        return self.server.fake  # type: ignore[attr-defined]
+
+    def send_body(self, status_code: int, body: bytes, content_type: str) -> None:
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_payload(self, payload: Optional[Any]) -> None:
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        if self.fake.should_fail():
+            return self.send_body(500, b'{"status":"500","error":"injected"}', "application/json")
+        if payload is None:
+            return self.send_body(404, b'{"status":"404"}', "application/json")
+        if isinstance(payload, str):
+            return self.send_body(200, payload.encode("utf-8"), "text/plain")
+        return self.send_body(200, json.dumps(payload).encode("utf-8"), "application/json")
+
+
+class FakeTShockHandler(FakeHandler):
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        world = self.fake.world
+        if parsed.path == "/v2/players/read":
+            player = (parse_qs(parsed.query).get("player") or [""])[0]
+            return self.send_payload(world["details"].get(player))
+        key = TSHOCK_ROUTES.get(parsed.path)
+        return self.send_payload(world.get(key) if key else None)
+
+
+class FakeKubeHandler(FakeHandler):
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        if parsed.path.endswith("/pods"):
+            return self.send_payload(
+                {
+                    "items": [
+                        {
+                            "metadata": {"name": "terraria-server-bench", "creationTimestamp": "2026-01-01T00:00:00Z"},
+                            "status": {"phase": "Running"},
+                        }
+                    ]
+                }
+            )
+        if parsed.path.endswith("/log"):
+            query = parse_qs(parsed.query)
+            tail = int((query.get("tailLines") or ["2000"])[0])
+            lines = self.fake.log_lines[-tail:]
+            if (query.get("timestamps") or [""])[0] == "true":
+                lines = [f"2026-01-01T00:{index // 240 % 60:02d}:{index // 4 % 60:02d}.{index % 4 * 25}Z {line}" for index, line in enumerate(lines)]
+            return self.send_payload("\n".join(lines) + "\n")
+        return self.send_payload(None)
+
+
+def start_fake_tshock(world: Dict[str, Any], latency_ms: float = 0.0, error_rate: float = 0.0) -> FakeServer:
+    server = FakeServer(FakeTShockHandler, latency_ms, error_rate)
+    server.world = world  # type: ignore[attr-defined]
+    return server.start()
+
+
+def start_fake_kube(log_lines: List[str], latency_ms: float = 0.0, error_rate: float = 0.0) -> FakeServer:
+    server = FakeServer(FakeKubeHandler, latency_ms, error_rate)
+    server.log_lines = log_lines  # type: ignore[attr-defined]
+    return server.start()
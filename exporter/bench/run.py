@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+EXPORTER_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(BENCH_DIR))
+
+import fakes  # noqa: E402
+import synthetic  # noqa: E402
+
+PHASES = {
+    "api_runtime": "_update_from_api",
+    "api_world": "_update_world_from_api",
+    "world_file": "_update_from_world_file",
+    "logs": "_apply_log_fallback",
+}
+CHECKED_FIELDS = ["wall_seconds", "cpu_seconds", "peak_rss_kb", "series"]
+
+
+def _median(values: List[float]) -> float:
+    return round(statistics.median(values), 6) if values else 0.0
+
+
+def _p95(values: List[float]) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6)
+
+
+def run_worker(
+    profile: str, iterations: int, warmup: int, tshock_url: str, kube_url: str, log_lines: int, world_file: str
+) -> Dict[str, Any]:
+    os.environ["TERRARIA_API_URL"] = tshock_url
+    os.environ["WORLD_FILE_PATH"] = ""
+    os.environ["SERVER_CONFIG_PATH"] = "/nonexistent/serverconfig.txt"
+    os.environ["TSHOCK_CONFIG_PATH"] = "/nonexistent/config.json"
+    os.environ["K8S_LOG_TAIL_LINES"] = str(log_lines)
+    sys.path.insert(0, str(EXPORTER_DIR))
+
+    import resource
+
+    import exporter
+
+    class BenchTracker(exporter.KubernetesLogTracker):
+        def __init__(self) -> None:
+            super().__init__()
+            self.base_url = kube_url
+            self.verify = False
+
+        def _enabled(self) -> bool:
+            return True
+
+        def _headers(self) -> Dict[str, str]:
+            return {}
+
+    timings: Dict[str, List[float]] = {}
+
+    def timed(phase: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timings.setdefault(phase, []).append(time.perf_counter() - started)
+
+        return wrapper
+
+    for phase, name in PHASES.items():
+        setattr(exporter, name, timed(phase, getattr(exporter, name)))
+
+    def publish() -> None:
+        exporter.published_runtime.publish()
+        exporter.published_world.publish()
+        exporter.publish_snapshot()
+
+    publish_timed = timed("publish", publish)
+    tracker = BenchTracker()
+    player_details = exporter.PlayerDetailFetcher()
+
+    walls: List[float] = []
+    cpus: List[float] = []
+    for iteration in range(warmup + iterations):
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        exporter.scrape_once(tracker, player_details)
+        publish_timed()
+        if iteration >= warmup:
+            walls.append(time.perf_counter() - wall_started)
+            cpus.append(time.process_time() - cpu_started)
+        else:
+            timings.clear()
+
+    if world_file and exporter.np is not None:
+        # Tile analytics only run when the world changes, so they are timed once outside the scrape loop.
+        data = Path(world_file).read_bytes()
+        tiles = timed("tiles_decode", exporter.read_wld_tiles)(data)
+        timed("tiles_analyze", exporter.analyze_tiles)(tiles)
+
+    exposition = exporter.render_exposition().decode("utf-8")
+    return {
+        "profile": profile,
+        "iterations": iterations,
+        "wall_seconds": _median(walls),
+        "wall_p95_seconds": _p95(walls),
+        "cpu_seconds": _median(cpus),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "series": sum(1 for line in exposition.splitlines() if line and not line.startswith("#")),
+        "exposition_bytes": len(exporter.published_world.get()[0]) + len(exporter.published_runtime.get()[0]),
+        "phases": {phase: _median(values) for phase, values in sorted(timings.items())},
+    }
+
+
+def run_profile(profile: str, args: argparse.Namespace) -> Dict[str, Any]:
+    world = synthetic.world_payload(profile)
+    lines = synthetic.log_lines(profile)
+    # The fakes run in this process so their CPU and memory never show up in the worker's numbers.
+    tshock = fakes.start_fake_tshock(world, args.api_latency_ms, args.api_error_rate)
+    kube = fakes.start_fake_kube(lines, args.kube_latency_ms, args.kube_error_rate)
+    world_file = tempfile.NamedTemporaryFile(prefix=f"bench-{profile}-", suffix=".wld", delete=False)
+    try:
+        if args.tiles:
+            world_file.write(synthetic.world_file(profile))
+        world_file.close()
+        command = [
+            sys.executable,
+            str(Path(__file__).resolve()),
+            "--worker",
+            profile,
+            "--iterations",
+            str(args.iterations),
+            "--warmup",
+            str(args.warmup),
+            "--tshock-url",
+            tshock.url,
+            "--kube-url",
+            kube.url,
+            "--log-lines",
+            str(len(lines)),
+            "--world-file",
+            world_file.name if args.tiles else "",
+        ]
+        completed = subprocess.run(command, capture_output=True, text=True, check=False)
+        if completed.returncode != 0:
+            raise RuntimeError(f"worker for {profile} failed:\n{completed.stderr}")
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        result["api_requests"] = tshock.requests
+        result["kube_requests"] = kube.requests
+        return result
+    finally:
+        tshock.stop()
+        kube.stop()
+        os.unlink(world_file.name)
+
+
+def machine_info(args: argparse.Namespace) -> Dict[str, Any]:
+    # Stored next to the baseline: timings only compare on the machine and settings that produced them.
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count() or 0,
+        "settings": {
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "api_latency_ms": args.api_latency_ms,
+            "api_error_rate": args.api_error_rate,
+            "kube_latency_ms": args.kube_latency_ms,
+            "kube_error_rate": args.kube_error_rate,
+            "tiles": args.tiles,
+        },
+    }
+
+
+def find_regressions(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions: List[str] = []
+    for result in results:
+        base = baseline.get(result["profile"])
+        if not base:
+            continue
+        for field in CHECKED_FIELDS:
+            reference = float(base.get(field) or 0)
+            current = float(result.get(field) or 0)
+            # Small absolute slack keeps millisecond-scale timings from flapping.
+            slack = 0.002 if field.endswith("_seconds") else 0
+            if reference and current > reference * tolerance + slack:
+                regressions.append(f"{result['profile']}.{field}: {current} > {reference} x {tolerance}")
+    return regressions
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    header = f"{'profile':<8} {'wall(s)':>9} {'p95(s)':>9} {'cpu(s)':>9} {'rss(MB)':>8} {'series':>7}  phases"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        phases = " ".join(f"{name}={value * 1000:.1f}ms" for name, value in result["phases"].items())
+        print(
+            f"{result['profile']:<8} {result['wall_seconds']:>9.4f} {result['wall_p95_seconds']:>9.4f} "
+            f"{result['cpu_seconds']:>9.4f} {result['peak_rss_kb'] / 1024:>8.1f} {result['series']:>7}  {phases}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark scrape_once against synthetic TShock, log and world fixtures")
+    parser.add_argument("--profiles", default=",".join(synthetic.PROFILES), help="comma-separated profiles to run")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--api-latency-ms", type=float, default=0.0)
+    parser.add_argument("--api-error-rate", type=float, default=0.0)
+    parser.add_argument("--kube-latency-ms", type=float, default=0.0)
+    parser.add_argument("--kube-error-rate", type=float, default=0.0)
+    parser.add_argument("--baseline", default=str(BENCH_DIR / "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.3, help="allowed ratio over baseline before failing")
+    parser.add_argument("--json", dest="json_path", help="also write raw results to this file")
+    parser.add_argument("--no-tiles", dest="tiles", action="store_false", help="skip the synthetic .wld tile analytics phases")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--tshock-url", help=argparse.SUPPRESS)
+    parser.add_argument("--kube-url", help=argparse.SUPPRESS)
+    parser.add_argument("--log-lines", type=int, default=2000, help=argparse.SUPPRESS)
+    parser.add_argument("--world-file", default="", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.worker:
+        result = run_worker(
+            args.worker, args.iterations, args.warmup, args.tshock_url, args.kube_url, args.log_lines, args.world_file
+        )
+        print(json.dumps(result))
+        return 0
+
+    profiles = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    unknown = [name for name in profiles if name not in synthetic.PROFILES]
+    if unknown:
+        print(f"unknown profiles: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    results = [run_profile(profile, args) for profile in profiles]
+    print_table(results)
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        saved = {"_machine": machine_info(args), **{r["profile"]: r for r in results}}
+        baseline_path.write_text(json.dumps(saved, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    recorded = baseline.get("_machine")
+    if recorded and recorded != machine_info(args):
+        print(f"note: baseline was recorded with {json.dumps(recorded)}; timings may not be comparable")
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
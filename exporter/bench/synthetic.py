@@ -0,0 +1,170 @@
+import random
+import struct
+from typing import Any, Dict, List
+
+ITEM_NAMES = [
+    "Wood", "Stone Block", "Dirt Block", "Copper Bar", "Iron Bar", "Silver Bar", "Gold Bar", "Demonite Bar",
+    "Hellstone Bar", "Cobalt Bar", "Mythril Bar", "Adamantite Bar", "Hallowed Bar", "Chlorophyte Bar",
+    "Torch", "Rope", "Healing Potion", "Mana Potion", "Wooden Arrow", "Musket Ball", "Gel", "Lens",
+    "Fallen Star", "Life Crystal", "Mana Crystal", "Soul Of Light", "Soul Of Night", "Pixie Dust",
+    "Glowing Mushroom", "Daybloom", "Moonglow", "Blinkroot", "Deathweed", "Waterleaf", "Fireblossom",
+    "Bottle", "Platinum Coin", "Gold Coin", "Silver Coin", "Copper Coin",
+]
+MONSTER_NAMES = ["Green Slime", "Blue Slime", "Zombie", "Demon Eye", "Skeleton", "Cave Bat", "Harpy", "Wraith"]
+NPC_NAMES = ["Guide", "Merchant", "Nurse", "Demolitionist", "Dryad", "Arms Dealer", "Goblin Tinkerer", "Wizard"]
+
+PROFILES: Dict[str, Dict[str, int]] = {
+    "small": {"players": 2, "chests": 50, "items_per_chest": 10, "monsters": 20, "houses": 8, "log_lines": 500},
+    "medium": {"players": 8, "chests": 500, "items_per_chest": 20, "monsters": 60, "houses": 25, "log_lines": 2000},
+    "large": {"players": 16, "chests": 3000, "items_per_chest": 30, "monsters": 120, "houses": 60, "log_lines": 2000},
+    "stress": {"players": 32, "chests": 10000, "items_per_chest": 40, "monsters": 200, "houses": 120, "log_lines": 5000},
+}
+# Tile grid sizes match Terraria's small/medium/large worlds.
+WORLD_SIZES = {"small": (4200, 1200), "medium": (6400, 1800), "large": (8400, 2400), "stress": (8400, 2400)}
+UNDERGROUND_TILES = [1, 1, 1, 0, 0, 59, 40, 7, 166, 6, 167, 9, 168, 8, 169, 25, 203, 117, 56, 408]
+IMPORTANT_TILES = {3, 5, 21}
+WLD_VERSION = 279
+
+
+def world_payload(profile: str, seed: int = 7) -> Dict[str, Any]:
+    shape = PROFILES[profile]
+    rng = random.Random(seed)
+
+    players = [f"Player{index:02d}" for index in range(shape["players"])]
+    details = {
+        name: {
+            "status": "200",
+            "nickname": name,
+            "position": f"{rng.randint(0, 8400)},{rng.randint(0, 2400)}",
+            "inventory": ", ".join(f"{rng.choice(ITEM_NAMES)}:{rng.randint(1, 999)}" for _ in range(50)),
+        }
+        for name in players
+    }
+    chests = [
+        {
+            "id": index,
+            "x": rng.randint(0, 8400),
+            "y": rng.randint(0, 2400),
+            "items": [
+                {"name": rng.choice(ITEM_NAMES), "stack": rng.randint(1, 999)}
+                for _ in range(shape["items_per_chest"])
+            ],
+        }
+        for index in range(shape["chests"])
+    ]
+
+    return {
+        "status": {"status": "200", "playercount": len(players), "maxplayers": max(8, len(players)), "world": "bench"},
+        "players": {"status": "200", "players": [{"nickname": name} for name in players]},
+        "details": details,
+        "world": {"status": "200", "daytime": True, "bloodmoon": False, "eclipse": False, "hardmode": True, "time": 27000},
+        "monsters": {"status": "200", "monsters": [{"name": rng.choice(MONSTER_NAMES)} for _ in range(shape["monsters"])]},
+        "chests": {"status": "200", "chests": chests},
+        "houses": {"status": "200", "houses": [{"id": index} for index in range(shape["houses"])]},
+        "housed_npcs": {"status": "200", "npcs": [{"name": rng.choice(NPC_NAMES)} for _ in range(shape["houses"])]},
+    }
+
+
+def log_lines(profile: str, seed: int = 7) -> List[str]:
+    shape = PROFILES[profile]
+    rng = random.Random(seed)
+    players = [f"Player{index:02d}" for index in range(shape["players"])]
+
+    lines: List[str] = []
+    for index in range(shape["log_lines"]):
+        roll = rng.random()
+        player = rng.choice(players)
+        if roll < 0.05:
+            lines.append(f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}:{rng.randint(1024, 65535)} is connecting...")
+        elif roll < 0.10:
+            lines.append(f"\x1b[33m{player} has joined.\x1b[0m")
+        elif roll < 0.13:
+            lines.append(f"{player} has left.")
+        elif roll < 0.15:
+            lines.append("Backing up world file")
+        elif roll < 0.16:
+            lines.append(rng.choice(["The Blood Moon is rising...", "Night has fallen.", "Day has dawned."]))
+        else:
+            lines.append(f"<{player}> chat message {index}")
+    return lines
+
+
+def _dotnet_string(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    length = len(raw)
+    prefix = bytearray()
+    while True:
+        part = length & 0x7F
+        length >>= 7
+        prefix.append(part | (0x80 if length else 0))
+        if not length:
+            return bytes(prefix) + raw
+
+
+def _tile_run(out: bytearray, tile: int, wall: int, liquid: int, count: int) -> None:
+    flags = 0
+    body = bytearray()
+    if tile >= 0:
+        flags |= 0x02
+        if tile > 0xFF:
+            flags |= 0x20
+            body += struct.pack("<H", tile)
+        else:
+            body.append(tile)
+        if tile in IMPORTANT_TILES:
+            body += b"\x00\x00\x00\x00"
+    if wall:
+        flags |= 0x04
+        body.append(wall)
+    if liquid:
+        flags |= liquid << 3
+        body.append(255)
+    repeat = count - 1
+    if repeat > 0xFF:
+        flags |= 0x80
+        body += struct.pack("<h", repeat)
+    elif repeat:
+        flags |= 0x40
+        body.append(repeat)
+    out.append(flags)
+    out += body
+
+
+def world_file(profile: str, seed: int = 7) -> bytes:
+    """Build a .wld with a real file/world header and a layered, run-length encoded tile section."""
+    width, height = WORLD_SIZES[profile]
+    rng = random.Random(seed)
+
+    header = bytearray()
+    header += _dotnet_string(f"bench-{profile}") + _dotnet_string(str(seed))
+    header += struct.pack("<Q", 1) + bytes(16)
+    header += struct.pack("<5i", 1, 0, width * 16, 0, height * 16)
+    header += struct.pack("<2ii", height, width, 0) + bytes(8)
+    header += struct.pack("<qB", 0, 0) + bytes(19 * 4)
+    header += struct.pack("<3d", height * 0.3, height * 0.4, 27000.0)
+    header += struct.pack("<?i??2i", True, 0, False, False, width // 2, height // 3)
+    header += struct.pack("<?", False) + bytes(18) + struct.pack("<??Bi?", False, False, 0, 0, True)
+
+    tiles = bytearray()
+    for _ in range(width):
+        surface = int(height * rng.uniform(0.25, 0.35))
+        _tile_run(tiles, -1, 0, 0, surface)
+        _tile_run(tiles, 2, 0, 0, 1)
+        y = surface + 1
+        while y < height:
+            count = min(height - y, rng.randint(1, 12))
+            liquid = rng.choice((0, 0, 0, 0, 0, 0, 1, 2))
+            _tile_run(tiles, rng.choice(UNDERGROUND_TILES) if not liquid else -1, rng.choice((0, 2)), liquid, count)
+            y += count
+
+    importance_count = 693
+    bits = bytearray((importance_count + 7) // 8)
+    for tile in IMPORTANT_TILES:
+        bits[tile // 8] |= 1 << (tile % 8)
+
+    sections = 11
+    prefix_size = 4 + 8 + 4 + 8 + 2 + 4 * sections + 2 + len(bits)
+    pointers = [prefix_size, prefix_size + len(header)] + [prefix_size + len(header) + len(tiles)] * (sections - 2)
+    prefix = struct.pack("<i7sBIQh", WLD_VERSION, b"relogic", 2, 1, 0, sections)
+    prefix += struct.pack(f"<{sections}i", *pointers) + struct.pack("<h", importance_count) + bytes(bits)
+    return bytes(prefix + header + tiles)
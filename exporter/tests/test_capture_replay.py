@@ -0,0 +1,53 @@
+import re
+
+import exporter
+
+LOGS = "\n".join(
+    [
+        "2026-01-01T10:00:00Z 10.0.0.1:50000 is connecting...",
+        "2026-01-01T10:00:02Z Alice has joined.",
+        "2026-01-01T10:00:10Z Backing up world file",
+        "2026-01-01T10:00:13Z World saved",
+        "2026-01-01T10:01:00Z 10.0.0.2:50001 is connecting...",
+        "2026-01-01T10:01:05Z Bob has joined.",
+    ]
+)
+
+
+def kube(self, path, params=None):
+    if path.endswith("/pods"):
+        return {
+            "items": [
+                {"metadata": {"name": "terraria-0", "creationTimestamp": "2026-01-01T09:00:00Z"}, "status": {"phase": "Running"}}
+            ]
+        }
+    if path.endswith("/log"):
+        return LOGS
+    return None
+
+
+def histogram_count(body, name):
+    match = re.search(rf"^{name}_count\s+(\S+)$", body, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_replay_reproduces_log_histograms(tmp_path, monkeypatch):
+    monkeypatch.setattr(exporter, "_request_live", lambda paths, extra_params=None: None)
+    monkeypatch.setattr(exporter.KubernetesLogTracker, "_enabled", lambda self: True)
+    monkeypatch.setattr(exporter.KubernetesLogTracker, "_request_live", kube)
+    archive = tmp_path / "cycle.zip"
+    exporter.capture_cycle(str(archive))
+    captured = exporter.render_exposition().decode()
+    assert histogram_count(captured, "terraria_join_latency_seconds") == 2
+    assert histogram_count(captured, "terraria_world_save_duration_seconds") == 1
+
+    # The replay runs long after the captured lines were logged and must still count them.
+    monkeypatch.setattr(exporter.KubernetesLogTracker, "_request_live", lambda self, path, params=None: None)
+    exporter.join_latency.clear()
+    exporter.world_save_duration.clear()
+    output = tmp_path / "replay.prom"
+    exporter.replay_cycles(str(archive), 0, 2, str(output))
+    replayed = output.read_text()
+    assert histogram_count(replayed, "terraria_join_latency_seconds") == 2
+    assert re.search(r'^terraria_join_latency_seconds_sum\s+7\.0$', replayed, re.MULTILINE)
+    assert histogram_count(replayed, "terraria_world_save_duration_seconds") == 1
@@ -0,0 +1,96 @@
+import http.client
+from types import SimpleNamespace
+
+import exporter
+
+
+def chest(x, y, **items):
+    return {"x": x, "y": y, "items": {name.replace("_", " "): quantity for name, quantity in items.items()}}
+
+
+def search(index, query, limit=10, chest_limit=10):
+    return {result["item"]: result for result in index.search(query, limit, chest_limit)}
+
+
+def test_search_matches_any_word_start_and_ranks_chests():
+    index = exporter.ChestIndex()
+    index.update({"a": chest(1, 2, Hallowed_Bar=5, Torch=99), "b": chest(3, 4, Hallowed_Bar=20, Iron_Bar=3)})
+
+    results = search(index, "bar")
+    assert set(results) == {"Hallowed Bar", "Iron Bar"}
+    hallowed = results["Hallowed Bar"]
+    assert hallowed["total"] == 25
+    assert hallowed["chest_count"] == 2
+    assert [entry["chest"] for entry in hallowed["chests"]] == ["b", "a"]
+    assert hallowed["chests"][0] == {"chest": "b", "x": 3, "y": 4, "quantity": 20}
+
+    assert set(search(index, "HALL")) == {"Hallowed Bar"}
+    assert set(search(index, "  hallowed   bar ")) == {"Hallowed Bar"}
+    assert search(index, "wood") == {}
+
+
+def test_update_patches_only_changed_chests():
+    index = exporter.ChestIndex()
+    listing = {"a": chest(1, 1, Torch=10), "b": chest(2, 2, Torch=5, Gel=7)}
+    assert index.update(listing) == 2
+    assert index.update(dict(listing)) == 0
+
+    assert index.update({"a": chest(1, 1, Torch=1), "b": listing["b"]}) == 1
+    assert search(index, "torch")["Torch"]["total"] == 6
+
+    # Dropping the only chest holding an item removes it from the index altogether.
+    assert index.update({"a": chest(1, 1, Torch=1)}) == 1
+    assert search(index, "gel") == {}
+    assert search(index, "torch")["Torch"]["chest_count"] == 1
+    assert all(item != "Gel" for _, item in index.keys)
+
+
+def test_search_limits():
+    index = exporter.ChestIndex()
+    index.update({str(n): chest(n, n, **{f"Item_{n}": n + 1, "Wood": n + 1}) for n in range(5)})
+
+    assert len(index.search("item", 3, 10)) == 3
+    wood = index.search("wood", 10, 2)[0]
+    assert wood["chest_count"] == 5
+    assert wood["total"] == 15
+    assert [entry["quantity"] for entry in wood["chests"]] == [5, 4]
+
+
+def test_summary_keys_chests_by_position():
+    def parsed(x, y, name, quantity):
+        stack = SimpleNamespace(quantity=quantity, type=SimpleNamespace(name=name))
+        return SimpleNamespace(position=SimpleNamespace(x=x, y=y), contents=[stack, None])
+
+    before = exporter._summarize_world(SimpleNamespace(chests=[parsed(10, 20, "TORCH", 5), parsed(30, 40, "GEL", 7)]))
+    assert set(before["chest_contents"]) == {"10,20", "30,40"}
+    # Removing the first chest must not move the second one's key.
+    after = exporter._summarize_world(SimpleNamespace(chests=[parsed(30, 40, "GEL", 7)]))
+    assert after["chest_contents"]["30,40"] == before["chest_contents"]["30,40"]
+    assert [label for label, _, _ in after["chest_pairs"]] == ["30,40"]
+
+
+def test_search_etag_covers_the_query_and_answers_304(monkeypatch):
+    index = exporter.ChestIndex()
+    index.update({"1,1": chest(1, 1, Torch=10, Wood=3)})
+    monkeypatch.setattr(exporter, "chest_indexes", {"default": index})
+    server = exporter.start_metrics_server(0)
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+
+        def get(path, etag=None):
+            connection.request("GET", path, headers={"If-None-Match": etag} if etag else {})
+            response = connection.getresponse()
+            response.read()
+            return response.status, response.getheader("ETag")
+
+        status, etag = get("/api/chests/search?q=torch&limit=5")
+        assert status == 200
+        assert get("/api/chests/search?q=%20TORCH&limit=5", etag) == (304, etag)
+        assert get("/api/chests/search?q=torch&limit=6", etag)[0] == 200
+        assert get("/api/chests/search?q=torch&limit=5&chests=1", etag)[0] == 200
+
+        index.update({"1,1": chest(1, 1, Torch=11)})
+        assert get("/api/chests/search?q=torch&limit=5", etag)[0] == 200
+    finally:
+        server.shutdown()
+        server.server_close()
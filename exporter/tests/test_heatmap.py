@@ -0,0 +1,43 @@
+import pytest
+
+import exporter
+from wld_fixtures import world_file, world_header
+
+pytestmark = pytest.mark.skipif(exporter.np is None, reason="the heatmap needs numpy")
+
+
+def test_world_size_comes_from_the_header(tmp_path):
+    path = tmp_path / "small.wld"
+    path.write_bytes(world_file(279, world_header(279, "small", "1", 4200, 1200)))
+    assert exporter.read_wld_size(str(path)) == (4200, 1200)
+
+    # A world name longer than the first read still parses.
+    path.write_bytes(world_file(279, world_header(279, "x" * 70000, "1", 6400, 1800)))
+    assert exporter.read_wld_size(str(path)) == (6400, 1800)
+
+
+def test_grid_follows_the_world_and_resets_on_a_new_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(exporter, "HEATMAP_CELL_TILES", 16)
+    monkeypatch.setattr(exporter, "HEATMAP_WORLD_SIZE", (8400, 2400))
+    path = tmp_path / "default.npz"
+    heatmap = exporter.PositionHeatmap(path)
+    assert heatmap.grid.shape == (525, 150)
+
+    heatmap.resize(4200, 1200, 100.0)
+    assert heatmap.grid.shape == (263, 75)
+    heatmap.sample([(4100, 1190)], 110.0)
+    heatmap.save(110.0)
+
+    # The stored grid keeps its world size on reload, whatever HEATMAP_WORLD_SIZE says.
+    reloaded = exporter.PositionHeatmap(path)
+    assert reloaded.world == (4200, 1200)
+    assert reloaded.samples == 1
+    assert reloaded.grid[256, 74] == 1.0
+    reloaded.resize(4200, 1200, 120.0)
+    assert reloaded.samples == 1
+
+    reloaded.resize(6400, 1800, 130.0)
+    assert reloaded.grid.shape == (400, 113)
+    assert reloaded.samples == 0 and not reloaded.grid.any()
+    assert exporter.PositionHeatmap(path).world == (6400, 1800)
+    assert reloaded.document()["world_width"] == 6400
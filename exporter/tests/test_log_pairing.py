@@ -0,0 +1,31 @@
+import exporter
+
+
+def pair(tracker, stamp, line):
+    connection = exporter.CONNECTION_PATTERN.search(line)
+    tracker._pair(stamp, line, connection, "has joined" in line, False)
+
+
+def test_join_matches_the_whole_address():
+    tracker = exporter.KubernetesLogTracker()
+    tracker.started_at = 0.0
+    pair(tracker, 100.0, "10.0.0.1:50000 is connecting...")
+    pair(tracker, 104.0, "10.0.0.12:50001 is connecting...")
+    # 10.0.0.1 is a prefix of 10.0.0.12 and must not claim its join.
+    pair(tracker, 105.0, "Bob (10.0.0.12) has joined.")
+    assert list(tracker.pending_connections) == ["10.0.0.1:50000"]
+    assert tracker.join_latency.total == 1.0
+
+    pair(tracker, 106.0, "Alice (10.0.0.1) has joined.")
+    assert not tracker.pending_connections
+    assert tracker.join_latency.total == 7.0
+
+
+def test_join_without_an_address_takes_the_latest_connection():
+    tracker = exporter.KubernetesLogTracker()
+    tracker.started_at = 0.0
+    pair(tracker, 100.0, "10.0.0.1:50000 is connecting...")
+    pair(tracker, 101.0, "10.0.0.2:50000 is connecting...")
+    pair(tracker, 103.0, "Alice has joined.")
+    assert list(tracker.pending_connections) == ["10.0.0.1:50000"]
+    assert tracker.join_latency.total == 2.0
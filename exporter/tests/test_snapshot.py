@@ -0,0 +1,49 @@
+import http.client
+import json
+
+import exporter
+
+RUNTIME = b"""# TYPE terraria_exporter_source_up gauge
+terraria_exporter_source_up 1.0
+# TYPE terraria_players_online gauge
+terraria_players_online 2.0
+"""
+WORLD = b"""# TYPE terraria_world_chests_total gauge
+terraria_world_chests_total 12.0
+# TYPE terraria_world_snapshot_mtime_seconds gauge
+terraria_world_snapshot_mtime_seconds 1000.0
+"""
+
+
+def publish(monkeypatch, now):
+    monkeypatch.setattr(exporter.time, "time", lambda: now)
+    exporter.published_runtime.store(RUNTIME)
+    exporter.published_world.store(WORLD)
+    exporter.publish_snapshot()
+    return exporter.published_snapshot.get()
+
+
+def test_snapshot_etag_holds_while_the_content_does(monkeypatch):
+    for name in ("published_runtime", "published_world", "published_snapshot"):
+        monkeypatch.setattr(exporter, name, exporter.PublishedDocument())
+    body, _, etag, changed_at = publish(monkeypatch, 2000.0)
+    document = json.loads(body)
+    assert document["metrics"]["players_online"] == 2.0
+    assert document["times"] == {"runtime_changed_at": 2000.0, "world_changed_at": 2000.0, "world_file_mtime": 1000.0}
+
+    # A later refresh with the same metrics publishes byte-identical JSON.
+    assert publish(monkeypatch, 2060.0) == (body, exporter.published_snapshot.get()[1], etag, changed_at)
+
+    server = exporter.start_metrics_server(0)
+    try:
+        monkeypatch.setattr(exporter.time, "time", lambda: 2075.5)
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        connection.request("GET", "/api/snapshot", headers={"If-None-Match": etag})
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 304
+        assert response.getheader("X-Runtime-Age-Seconds") == "15.500"
+        assert response.getheader("X-World-Age-Seconds") == "15.500"
+    finally:
+        server.shutdown()
+        server.server_close()
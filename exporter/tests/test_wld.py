@@ -0,0 +1,114 @@
+import random
+import struct
+
+import pytest
+
+import exporter
+from wld_fixtures import tile_run, tile_section, world_file, world_header
+
+
+@pytest.mark.parametrize(
+    "version, seed, game_mode",
+    [
+        (179, "12345", 1),  # numeric seed, no unique id
+        (208, "seed-208", 2),  # master mode as a second boolean
+        (209, "seed-209", 3),  # game mode as an int, no flag bytes yet
+        (222, "seed-222", 1),  # first of the extra world flags
+        (279, "seed-279", 0),  # every flag byte present
+    ],
+)
+def test_header_versions(version, seed, game_mode):
+    data = world_file(version, world_header(version, "Ünïcode world", seed, 4200, 1200, game_mode, crimson=True, hardmode=True))
+    header = exporter.read_wld_header(data)
+    assert header["version"] == version
+    assert header["name"] == "Ünïcode world"
+    assert header["seed"] == seed
+    assert (header["width"], header["height"]) == (4200, 1200)
+    assert header["game_mode"] == (min(game_mode, 1) if version < 208 else game_mode)
+    assert header["crimson"] is True
+    assert header["hardmode"] is True
+    assert len(header["sections"]) == 3
+
+
+def test_header_before_179_has_no_seed():
+    data = world_file(178, world_header(178, "old", "", 4200, 1200))
+    header = exporter.read_wld_header(data)
+    assert header["seed"] == ""
+    assert (header["width"], header["height"]) == (4200, 1200)
+
+
+def test_header_rejects_old_versions_and_foreign_files():
+    with pytest.raises(NotImplementedError):
+        exporter.read_wld_header(struct.pack("<i", 139) + b"relogic\x02" + bytes(64))
+    with pytest.raises(ValueError):
+        exporter.read_wld_header(struct.pack("<i", 279) + b"notwld!\x02" + bytes(64))
+
+
+@pytest.mark.parametrize("cut", [2, 12, 30, 60, 120])
+def test_truncated_header(cut):
+    data = world_file(279, world_header(279, "cut", "1", 4200, 1200))
+    with pytest.raises(struct.error):
+        exporter.read_wld_header(data[:cut])
+
+
+requires_numpy = pytest.mark.skipif(exporter.np is None, reason="tile decoding needs numpy")
+IMPORTANT = (3, 5, 21)
+
+
+def decode(runs_bytes, width, height, important=IMPORTANT, trailer=b""):
+    header = world_header(279, "tiles", "1", width, height)
+    return exporter.read_wld_tiles(world_file(279, header, runs_bytes, important, trailer))
+
+
+@requires_numpy
+def test_tile_record_fields():
+    section = b"".join(
+        [
+            tile_run(0, count=2),  # dirt, repeated through a one-byte count
+            tile_run(470, wall=5),  # 16-bit tile id with a wall
+            tile_run(liquid=2),  # lava
+            tile_run(21, wall=0x0102, important=IMPORTANT, tile_paint=True, wall_paint=True),  # frame, paints, wall high byte
+            tile_run(liquid=1, shimmer=True, flags4=True),  # shimmer, fourth flag byte present
+            tile_run(count=0x102),  # two-byte count
+        ]
+    )
+    tiles = decode(section, 1, 2 + 1 + 1 + 1 + 1 + 0x102)
+    assert tiles["types"].tolist() == [0, 470, exporter.NO_TILE, 21, exporter.NO_TILE, exporter.NO_TILE]
+    assert tiles["walls"].tolist() == [0, 5, 0, 0x0102, 0, 0]
+    assert tiles["liquids"].tolist() == [0, 0, 2, 0, 4, 0]
+    assert tiles["runs"].tolist() == [2, 1, 1, 1, 1, 0x102]
+
+
+@requires_numpy
+def test_tiles_stop_at_world_size_and_ignore_following_sections():
+    section, runs = tile_section([(1, 0, 0, 3), (-1, 0, 1, 3)])
+    tiles = decode(section, 2, 3, trailer=b"\xff" * 64)
+    assert tiles["runs"].tolist() == [3, 3]
+    assert tiles["types"].tolist() == [1, exporter.NO_TILE]
+
+
+@requires_numpy
+def test_short_tile_section_is_rejected():
+    section, _ = tile_section([(1, 0, 0, 3), (-1, 0, 1, 2)])
+    with pytest.raises(ValueError, match="world size"):
+        decode(section, 2, 3)
+
+
+@requires_numpy
+def test_tiles_match_runs_across_decode_blocks():
+    # Enough records of mixed lengths that the chain crosses many TILE_DECODE_BLOCK boundaries.
+    rng = random.Random(5)
+    width, height = 120, 2000
+    runs = []
+    for _ in range(width):
+        left = height
+        while left:
+            count = min(left, rng.choice([1, 1, 2, 7, 300]))
+            tile = rng.choice([-1, 0, 1, 3, 21, 59, 470])
+            runs.append((tile, rng.choice([0, 0, 4, 300]), rng.choice([0, 0, 1, 2, 3]), count))
+            left -= count
+    section, expected = tile_section(runs, IMPORTANT)
+    assert len(section) > 4 * exporter.TILE_DECODE_BLOCK
+    tiles = decode(section, width, height)
+    decoded = list(zip(tiles["types"].tolist(), tiles["walls"].tolist(), tiles["liquids"].tolist(), tiles["runs"].tolist()))
+    assert decoded == expected
@@ -0,0 +1,127 @@
+import struct
+from typing import Iterable, List, Sequence, Tuple
+
+GAME_FLAG_VERSIONS = (222, 227, 238, 239, 241, 249, 266, 267)
+
+
+def dotnet_string(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    length = len(raw)
+    prefix = bytearray()
+    while True:
+        part = length & 0x7F
+        length >>= 7
+        prefix.append(part | (0x80 if length else 0))
+        if not length:
+            return bytes(prefix) + raw
+
+
+def world_header(
+    version: int, name: str, seed: str, width: int, height: int, game_mode: int = 0, crimson: bool = False, hardmode: bool = False
+) -> bytes:
+    """The world header section as each .wld version lays it out, up to the hardmode flag."""
+    out = bytearray(dotnet_string(name))
+    if version >= 179:
+        out += struct.pack("<i", int(seed)) if version == 179 else dotnet_string(seed)
+        out += struct.pack("<Q", 1)  # generator version
+    if version >= 181:
+        out += bytes(range(16))  # unique id
+    out += struct.pack("<5i", 1, 0, width * 16, 0, height * 16)
+    out += struct.pack("<2i", height, width)
+    if version >= 209:
+        out += struct.pack("<i", game_mode)
+        out += bytes(sum(1 for flag_version in GAME_FLAG_VERSIONS if version >= flag_version))
+    else:
+        out += struct.pack("<?", game_mode >= 1)
+        if version == 208:
+            out += struct.pack("<?", game_mode == 2)
+    out += struct.pack("<q", 0)  # creation time
+    out += struct.pack("<B", 0) + bytes(19 * 4)
+    out += struct.pack("<3d", height * 0.3, height * 0.4, 27000.0)
+    out += struct.pack("<?i??2i", True, 0, False, False, width // 2, height // 3)
+    out += struct.pack("<?", crimson)
+    out += bytes(10 + (1 if version >= 118 else 0) + 7)
+    out += struct.pack("<??Bi?", False, False, 0, 0, hardmode)
+    return bytes(out)
+
+
+def world_file(version: int, header: bytes, tiles: bytes = b"", important: Sequence[int] = (), trailer: bytes = b"") -> bytes:
+    """File header, section table and important-tile bits, followed by the given world header and tiles."""
+    count = max(important, default=-1) + 1
+    bits = bytearray((count + 7) // 8)
+    for tile in important:
+        bits[tile // 8] |= 1 << (tile % 8)
+    table_size = 4 + 8 + 4 + 8 + 2 + 3 * 4 + 2 + len(bits)
+    sections = (table_size, table_size + len(header), table_size + len(header) + len(tiles))
+    out = bytearray(struct.pack("<i7sBIQ", version, b"relogic", 2, 1, 0))
+    out += struct.pack("<h3i", len(sections), *sections)
+    out += struct.pack("<h", count) + bits
+    assert len(out) == table_size
+    return bytes(out + header + tiles + trailer)
+
+
+def tile_run(
+    tile: int = -1,
+    wall: int = 0,
+    liquid: int = 0,
+    count: int = 1,
+    important: Iterable[int] = (),
+    tile_paint: bool = False,
+    wall_paint: bool = False,
+    shimmer: bool = False,
+    flags4: bool = False,
+) -> bytes:
+    """One tile record as Terraria writes it: flag bytes, tile, wall, liquid and the repeat count."""
+    flags1 = 0
+    flags3 = 0
+    body = bytearray()
+    if tile >= 0:
+        flags1 |= 0x02
+        if tile > 0xFF:
+            flags1 |= 0x20
+            body += struct.pack("<H", tile)
+        else:
+            body.append(tile)
+        if tile in set(important):
+            body += struct.pack("<2h", 18, 36)  # frame
+        if tile_paint:
+            flags3 |= 0x08
+            body.append(1)
+    if wall:
+        flags1 |= 0x04
+        body.append(wall & 0xFF)
+        if wall_paint:
+            flags3 |= 0x10
+            body.append(2)
+    if liquid:
+        flags1 |= liquid << 3
+        body.append(255)
+    if shimmer:
+        flags3 |= 0x80
+    if wall > 0xFF:
+        flags3 |= 0x40
+        body.append(wall >> 8)
+    repeat = count - 1
+    if repeat > 0xFF:
+        flags1 |= 0x80
+        body += struct.pack("<h", repeat)
+    elif repeat:
+        flags1 |= 0x40
+        body.append(repeat)
+    flags = bytearray([flags1])
+    if flags3 or flags4:
+        flags[0] |= 0x01
+        flags += bytes([0x01, flags3 | (0x01 if flags4 else 0)])
+        if flags4:
+            flags.append(0)
+    return bytes(flags + body)
+
+
+def tile_section(runs: Iterable[Tuple[int, int, int, int]], important: Sequence[int] = ()) -> Tuple[bytes, List[Tuple[int, int, int, int]]]:
+    """Encode (tile, wall, liquid, count) runs; returns the bytes and the runs as the decoder reports them."""
+    out = bytearray()
+    decoded = []
+    for tile, wall, liquid, count in runs:
+        out += tile_run(tile, wall, liquid, count, important)
+        decoded.append((0xFFFF if tile < 0 else tile, wall, liquid, count))
+    return bytes(out), decoded
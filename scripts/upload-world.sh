@@ -16,6 +16,10 @@ SEED=""
 SERVER_PORT="7777"
 EXTRA_CREATE_ARGS=""
 WORLD_CREATE_TIMEOUT_SECONDS="900"
+ENCODING=""
+EXPECT_SIZE=""
+EXPECT_SHA256=""
+MAX_RAW_BYTES="${WORLD_MAX_RAW_BYTES:-1073741824}"
 
 ORIGINAL_REPLICAS="1"
 SCALED_BACK="0"
@@ -40,6 +44,10 @@ Options:
   --server-port N                 (default: 7777)
   --extra-create-args "..."      (raw args appended to world creation cmd)
   --world-create-timeout N        (seconds, default: 900)
+  --encoding none|gzip|zstd       (default: from .gz/.zst suffix of --world-file)
+  --expect-size N                 (bytes after decompression; checked on the PVC)
+  --expect-sha256 HEX             (sha256 after decompression; checked on the PVC)
+  --max-raw-bytes N               (bytes after decompression; default: \$WORLD_MAX_RAW_BYTES or 1 GiB)
 USAGE
 }
 
@@ -85,6 +93,14 @@ while [[ $# -gt 0 ]]; do
       EXTRA_CREATE_ARGS="$2"; shift 2 ;;
     --world-create-timeout)
       WORLD_CREATE_TIMEOUT_SECONDS="$2"; shift 2 ;;
+    --encoding)
+      ENCODING="$2"; shift 2 ;;
+    --expect-size)
+      EXPECT_SIZE="$2"; shift 2 ;;
+    --expect-sha256)
+      EXPECT_SHA256="$2"; shift 2 ;;
+    --max-raw-bytes)
+      MAX_RAW_BYTES="$2"; shift 2 ;;
     -h|--help)
       usage; exit 0 ;;
     *)
@@ -101,6 +117,10 @@ fi
 
 if [[ -n "$WORLD_FILE" ]]; then
   file_world_name="$(basename "$WORLD_FILE")"
+  case "$file_world_name" in
+    *.gz) file_world_name="${file_world_name%.gz}"; ENCODING="${ENCODING:-gzip}" ;;
+    *.zst) file_world_name="${file_world_name%.zst}"; ENCODING="${ENCODING:-zstd}" ;;
+  esac
   if [[ -n "$WORLD_NAME" && "$WORLD_NAME" != "$file_world_name" ]]; then
     echo "WorldName ($WORLD_NAME) difere do nome do arquivo enviado ($file_world_name)." >&2
     exit 1
@@ -113,6 +133,16 @@ if [[ -z "$WORLD_NAME" ]]; then
   exit 1
 fi
 
+if [[ ! "$MAX_RAW_BYTES" =~ ^[0-9]+$ ]]; then
+  echo "max-raw-bytes invalido: $MAX_RAW_BYTES" >&2
+  exit 1
+fi
+
+case "${ENCODING:=none}" in
+  none|gzip|zstd) ;;
+  *) echo "encoding invalido: $ENCODING" >&2; exit 1 ;;
+esac
+
 case "$WORLD_SIZE" in
   small) WORLD_SIZE_NUMBER=1 ;;
   medium) WORLD_SIZE_NUMBER=2 ;;
@@ -130,6 +160,63 @@ esac
 
 WORLD_BASE_NAME="${WORLD_NAME%.wld}"
 
+copy_world_file() {
+  local target="/config/$WORLD_NAME"
+  local partial="/config/.$WORLD_NAME.upload"
+  local remote_decompress="cat"
+  local local_decompress=""
+
+  # Compressed files cross kubectl exec as-is and are unpacked next to the PVC. Only when the
+  # manager image lacks the tool is the file unpacked here, while it streams.
+  if [[ "$ENCODING" != "none" ]]; then
+    if kubectl -n "$NAMESPACE" exec "$MANAGER_POD_NAME" -- sh -c "command -v $ENCODING" >/dev/null 2>&1; then
+      remote_decompress="$ENCODING -dc"
+    elif command -v "$ENCODING" >/dev/null 2>&1; then
+      echo "$ENCODING indisponivel no pod auxiliar; descompactando durante o envio..."
+      local_decompress="$ENCODING -dc"
+    else
+      echo "Nem o pod auxiliar nem esta maquina tem '$ENCODING' para descompactar $WORLD_FILE." >&2
+      return 1
+    fi
+  fi
+
+  # head stops writing one byte past the limit, so a decompression bomb cannot fill the PVC; the size
+  # check below then rejects it. Cutting the stream short also fails the pipe, hence the status is kept.
+  local limit=$((MAX_RAW_BYTES + 1))
+  local copied=0
+  if [[ -n "$local_decompress" ]]; then
+    $local_decompress "$WORLD_FILE" | kubectl -n "$NAMESPACE" exec -i "$MANAGER_POD_NAME" -- sh -c 'head -c "$2" > "$1"' sh "$partial" "$limit" || copied=$?
+  else
+    kubectl -n "$NAMESPACE" exec -i "$MANAGER_POD_NAME" -- sh -c 'rm -f "$1.err"; { $2 || echo failed > "$1.err"; } | head -c "$3" > "$1"; if [ -e "$1.err" ]; then rm -f "$1.err"; exit 1; fi' sh "$partial" "$remote_decompress" "$limit" < "$WORLD_FILE" || copied=$?
+  fi
+
+  local check actual_size actual_sha
+  check="$(kubectl -n "$NAMESPACE" exec "$MANAGER_POD_NAME" -- sh -c 'wc -c < "$1"; if command -v sha256sum >/dev/null 2>&1; then sha256sum "$1" | cut -d" " -f1; else echo -; fi' sh "$partial")" || return 1
+  actual_size="$(echo "$check" | sed -n 1p | tr -d ' ')"
+  actual_sha="$(echo "$check" | sed -n 2p)"
+  if (( actual_size > MAX_RAW_BYTES )); then
+    echo "Mundo descompactado passa de $MAX_RAW_BYTES bytes (WORLD_MAX_RAW_BYTES); envio cancelado." >&2
+    return 1
+  fi
+  if (( copied != 0 )); then
+    return 1
+  fi
+  if [[ -n "$EXPECT_SIZE" && "$actual_size" != "$EXPECT_SIZE" ]]; then
+    echo "Tamanho no PVC ($actual_size) difere do esperado ($EXPECT_SIZE)." >&2
+    return 1
+  fi
+  if [[ -n "$EXPECT_SHA256" ]]; then
+    if [[ "$actual_sha" == "-" ]]; then
+      echo "sha256sum indisponivel no pod auxiliar; hash nao verificado."
+    elif [[ "$actual_sha" != "$EXPECT_SHA256" ]]; then
+      echo "sha256 no PVC ($actual_sha) difere do esperado ($EXPECT_SHA256)." >&2
+      return 1
+    fi
+  fi
+  echo "Arquivo verificado no PVC: $actual_size bytes, sha256 $actual_sha"
+  kubectl -n "$NAMESPACE" exec "$MANAGER_POD_NAME" -- mv "$partial" "$target" || return 1
+}
+
 ORIGINAL_REPLICAS="$(kubectl -n "$NAMESPACE" get "deployment/$DEPLOYMENT" -o jsonpath='{.spec.replicas}' 2>/dev/null || true)"
 if [[ -z "$ORIGINAL_REPLICAS" ]]; then
   ORIGINAL_REPLICAS="1"
@@ -172,8 +259,11 @@ if [[ "$exists_output" == "exists" ]]; then
 fi
 
 if [[ -n "$WORLD_FILE" ]]; then
-  echo "Copiando arquivo '$WORLD_NAME' para o PVC..."
-  kubectl -n "$NAMESPACE" cp "$WORLD_FILE" "$MANAGER_POD_NAME:/config/$WORLD_NAME" >/dev/null
+  echo "Copiando arquivo '$WORLD_NAME' para o PVC ($ENCODING)..."
+  if ! copy_world_file; then
+    kubectl -n "$NAMESPACE" exec "$MANAGER_POD_NAME" -- rm -f "/config/.$WORLD_NAME.upload" >/dev/null 2>&1 || true
+    exit 1
+  fi
   world_exists="true"
 elif [[ "$world_exists" != "true" && "$AUTO_CREATE_IF_MISSING" == "true" ]]; then
   echo "Mundo '$WORLD_NAME' nao existe. Criando automaticamente (size=$WORLD_SIZE, difficulty=$DIFFICULTY, maxplayers=$MAX_PLAYERS)..."
@@ -413,7 +413,7 @@ resource "kubernetes_deployment" "terraria_exporter" {
 
           command = ["sh", "-c"]
           args = [
-            "pip install --no-cache-dir prometheus-client requests lihzahrd==3.1.0 >/tmp/pip.log 2>&1 && python /app/exporter.py"
+            "pip install --no-cache-dir prometheus-client requests numpy lihzahrd==3.1.0 >/tmp/pip.log 2>&1 && python /app/exporter.py"
           ]
 
           env {
@@ -481,6 +481,25 @@ resource "kubernetes_deployment" "terraria_exporter" {
             value = "9150"
           }
 
+          env {
+            name  = "TILE_STORE_DIR"
+            value = "/var/lib/terraria-tiles"
+          }
+
+          env {
+            name  = "HEATMAP_DIR"
+            value = var.terraria_backup_enabled ? "/backups/exporter/heatmaps" : "/var/lib/terraria-tiles/heatmaps"
+          }
+
+          dynamic "env" {
+            for_each = var.terraria_backup_enabled ? [1] : []
+
+            content {
+              name  = "HISTORY_DIR"
+              value = "/backups/exporter/history"
+            }
+          }
+
           port {
             container_port = 9150
             name           = "metrics"
@@ -498,6 +517,39 @@ resource "kubernetes_deployment" "terraria_exporter" {
             mount_path = "/config"
             read_only  = true
           }
+
+          volume_mount {
+            name       = "tile-store"
+            mount_path = "/var/lib/terraria-tiles"
+          }
+
+          dynamic "volume_mount" {
+            for_each = var.terraria_backup_enabled ? [1] : []
+
+            content {
+              name       = "terraria-backups"
+              mount_path = "/backups"
+            }
+          }
+        }
+
+        dynamic "volume" {
+          for_each = var.terraria_backup_enabled ? [1] : []
+
+          content {
+            name = "terraria-backups"
+
+            persistent_volume_claim {
+              claim_name = kubernetes_persistent_volume_claim.terraria_backups[0].metadata[0].name
+            }
+          }
+        }
+
+        volume {
+          name = "tile-store"
+          empty_dir {
+            size_limit = "1Gi"
+          }
         }
 
         volume {
@@ -573,8 +625,16 @@ resource "kubernetes_manifest" "terraria_exporter_service_monitor" {
       endpoints = [
         {
           port     = "metrics"
-          path     = "/metrics"
-          interval = "30s"
+          path     = "/metrics/runtime"
+          interval = "10s"
+        },
+        {
+          port          = "metrics"
+          path          = "/metrics/world"
+          # Under 5m on purpose: Prometheus drops a series from instant queries once its newest
+          # sample is 5m old (the default lookback), so a 5m interval plus scrape jitter leaves gaps.
+          interval      = "4m"
+          scrapeTimeout = "30s"
         }
       ]
     }
@@ -60,9 +60,9 @@ variable "terraria_exporter_scrape_interval_seconds" {
 }
 
 variable "terraria_world_parse_interval_seconds" {
-  description = "Intervalo de parsing do arquivo .wld no exporter"
+  description = "Intervalo de refresh das series de mundo (.wld, baus, casas) no exporter"
   type        = number
-  default     = 30
+  default     = 300
 }
 
 variable "terraria_chest_item_series_limit" {